@@ -0,0 +1,122 @@
+import argparse
+import os
+from modules.batch_runner import find_monthly_logs, run_batch
+from modules.report_backends import REPORT_FORMATS, available_formats
+from modules.utils import setup_logger, validate_file_exists, create_output_directory
+
+
+def parse_args():
+    """명령행 인자 파싱"""
+    arg_parser = argparse.ArgumentParser(description='근태 관리 시스템 - 여러 월 일괄 처리')
+    arg_parser.add_argument(
+        'pattern',
+        nargs='?',
+        default=os.path.join('data', '*년*월*.txt'),
+        help="월간 출퇴근 로그 glob 패턴 (예: 'data/2025년 *월.txt')"
+    )
+    arg_parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='월별 처리 프로세스 수 (기본: CPU 수)'
+    )
+    arg_parser.add_argument(
+        '--shard-by-department',
+        action='store_true',
+        help='일별 상세 리포트를 부서별 파일로 분할'
+    )
+    arg_parser.add_argument(
+        '--format',
+        choices=list(REPORT_FORMATS),
+        default='xlsx',
+        help='리포트 출력 형식 (xlsx, csv, parquet, jsonl)'
+    )
+    arg_parser.add_argument(
+        '--save-store',
+        action='store_true',
+        help='월별 계산 결과를 결과 저장소(cache/results.sqlite)에 저장'
+    )
+    args = arg_parser.parse_args()
+    
+    if args.format not in available_formats():
+        arg_parser.error(f'{args.format} 리포트를 만들려면 pyarrow가 필요합니다')
+    
+    return args
+
+
+def main():
+    """일괄 처리 실행 함수"""
+    
+    args = parse_args()
+    
+    # 로거 설정
+    logger = setup_logger()
+    logger.info("근태 일괄 처리 시작")
+    
+    try:
+        # 파일 경로 설정
+        data_dir = 'data'
+        output_dir = 'output'
+        config_dir = 'config'
+        cache_dir = 'cache'
+        
+        employee_info_file = os.path.join(data_dir, '사용자.xlsx')
+        overtime_leave_file = os.path.join(data_dir, '연장휴가정보.xlsx')
+        rules_file = os.path.join(config_dir, 'rules.json')
+        registry_file = os.path.join(config_dir, 'rulesets.json')
+        holidays_file = os.path.join(config_dir, 'holidays.json')
+        store_path = os.path.join(cache_dir, 'results.sqlite') if args.save_store else None
+        
+        # 파일 존재 여부 확인
+        validate_file_exists(employee_info_file)
+        validate_file_exists(rules_file)
+        
+        log_files, skipped = find_monthly_logs(args.pattern)
+        for path in skipped:
+            logger.warning(f"파일명에서 년월을 찾을 수 없어 제외: {path}")
+        
+        if not log_files:
+            raise FileNotFoundError(f"처리할 월간 로그가 없습니다: {args.pattern}")
+        
+        logger.info(f"월간 로그 {len(log_files)}개 처리 시작...")
+        
+        # 출력 디렉토리 생성
+        create_output_directory(output_dir)
+        create_output_directory(cache_dir)
+        
+        results, failures = run_batch(
+            log_files, rules_file, employee_info_file, output_dir,
+            overtime_leave_file=overtime_leave_file,
+            cache_dir=cache_dir,
+            workers=args.workers,
+            shard_by_department=args.shard_by_department,
+            store_path=store_path,
+            registry_file=registry_file,
+            holidays_file=holidays_file,
+            output_format=args.format,
+            logger=logger
+        )
+        
+        logger.info("근태 일괄 처리 완료")
+        print("\n" + "="*50)
+        for result in results:
+            rejected_text = f", 격리 {result['validation']['rejected']}줄" if result['validation']['rejected'] else ''
+            print(
+                f"✓ {result['period']}: 일별 {result['daily_records']}건, "
+                f"리포트 {len(result['manifest']['files'])}개{rejected_text}"
+            )
+        for log_path, error in failures.items():
+            print(f"✗ {log_path}: {error}")
+        print("="*50)
+        
+        if failures:
+            raise RuntimeError(f"{len(failures)}개 월간 로그 처리 실패")
+            
+    except Exception as e:
+        logger.error(f"오류 발생: {str(e)}", exc_info=True)
+        print(f"\n오류 발생: {str(e)}")
+        raise
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""
+단계별 성능 측정 (출퇴근 로그 파싱, 근태 계산, 월간 합산/일별 상세 리포트, CSV 일별 상세 리포트)
+
+사용법 (저장소 루트에서):
+    python -m benchmarks.run                              # 기본 규모 측정, 기준선과 비교
+    python -m benchmarks.run --scales 200x30 2000x31      # 카드 수 x 일수
+    python -m benchmarks.run --save-baseline              # 현재 결과를 기준선으로 저장
+
+기준선(benchmarks/baseline.json)은 기본 규모를 기준 장비에서 측정한 값이다.
+다른 장비에서 회귀를 확인하려면 변경 전 코드로 --save-baseline을 먼저 실행한다.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.workload import generate_employee_workbook, generate_punch_log
+from modules.calculator import AttendanceCalculator
+from modules.employee_directory import EmployeeDirectory
+from modules.parser import DataParser
+from modules.punch_archive import write_punch_archive
+from modules.punch_log import read_punch_file
+from modules.pipeline import finalize_daily_records
+from modules.report_generator import ReportGenerator
+
+
+DEFAULT_SCALES = ['100x30', '500x30']
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+RULES_FILE = os.path.join('config', 'rules.json')
+
+
+def parse_scale(scale):
+    """
+    '카드수x일수' 문자열을 (카드 수, 일수)로 변환
+    
+    Args:
+        scale: 규모 문자열 (예: '1000x30')
+        
+    Returns:
+        tuple: (카드 수, 일수)
+    """
+    cards, days = scale.lower().split('x')
+    return int(cards), int(days)
+
+
+def positive_int(value):
+    """1 이상의 정수 명령행 인자"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"1 이상의 정수여야 합니다: {value}")
+    return number
+
+
+def measure(func, repeat):
+    """
+    함수 실행 시간(최소값)과 최대 추적 메모리 측정
+    
+    시간은 tracemalloc 없이 repeat회 실행한 최소값, 메모리는 tracemalloc으로 한 번 더 실행한 최대값
+    
+    Args:
+        func: 인자 없는 함수
+        repeat: 시간 측정 반복 횟수 (1 이상)
+        
+    Returns:
+        tuple: (함수 결과, 실행 시간(초), 최대 메모리(바이트))
+    """
+    seconds = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        seconds = elapsed if seconds is None else min(seconds, elapsed)
+    
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    
+    return result, seconds, peak
+
+
+def run_scale(scale, work_dir, repeat):
+    """
+    한 규모의 작업량을 생성하고 단계별 성능 측정
+    
+    Args:
+        scale: 규모 문자열
+        work_dir: 작업 디렉토리 (입력/출력 파일)
+        repeat: 시간 측정 반복 횟수
+        
+    Returns:
+        dict: {단계: {rows, seconds, rows_per_sec, peak_bytes}}
+    """
+    cards, days = parse_scale(scale)
+    log_file = os.path.join(work_dir, f'{scale}_2025년 9월.txt')
+    archive_file = os.path.join(work_dir, f'{scale}_2025년 9월.punch')
+    employee_file = os.path.join(work_dir, f'{scale}_사용자.xlsx')
+    
+    punches = generate_punch_log(log_file, cards, days)
+    employee_df = generate_employee_workbook(employee_file, cards)
+    directory = EmployeeDirectory(employee_df)
+    calculator = AttendanceCalculator(RULES_FILE)
+    write_punch_archive(read_punch_file(log_file, min_length=18), archive_file)
+    
+    attendance_df, parse_seconds, parse_peak = measure(
+        lambda: DataParser.parse_attendance_log(log_file, streaming=True, compact=True), repeat
+    )
+    _, archive_seconds, archive_peak = measure(
+        lambda: DataParser.parse_attendance_log(archive_file, compact=True), repeat
+    )
+    daily_df, calculate_seconds, calculate_peak = measure(
+        lambda: calculator.calculate_all(attendance_df), repeat
+    )
+    daily_df = directory.enrich(finalize_daily_records(daily_df))
+    
+    summary_file = os.path.join(work_dir, f'{scale}_월간합산.xlsx')
+    detail_file = os.path.join(work_dir, f'{scale}_일별상세.xlsx')
+    _, summary_seconds, summary_peak = measure(
+        lambda: ReportGenerator.create_monthly_summary_report(daily_df, directory, summary_file), repeat
+    )
+    _, detail_seconds, detail_peak = measure(
+        lambda: ReportGenerator.create_daily_detail_report(daily_df, directory, detail_file), repeat
+    )
+    detail_csv_file = os.path.join(work_dir, f'{scale}_일별상세.csv')
+    _, detail_csv_seconds, detail_csv_peak = measure(
+        lambda: ReportGenerator.create_daily_detail_report(daily_df, directory, detail_csv_file, 'csv'), repeat
+    )
+    
+    stages = {
+        'parse_attendance_log': (punches, parse_seconds, parse_peak),
+        'parse_punch_archive': (punches, archive_seconds, archive_peak),
+        'calculate_all': (len(attendance_df), calculate_seconds, calculate_peak),
+        'monthly_summary_report': (len(daily_df), summary_seconds, summary_peak),
+        'daily_detail_report': (len(daily_df), detail_seconds, detail_peak),
+        'daily_detail_report_csv': (len(daily_df), detail_csv_seconds, detail_csv_peak)
+    }
+    
+    return {
+        stage: {
+            'rows': rows,
+            'seconds': round(seconds, 6),
+            'rows_per_sec': round(rows / seconds, 1) if seconds > 0 else 0.0,
+            'peak_bytes': peak
+        }
+        for stage, (rows, seconds, peak) in stages.items()
+    }
+
+
+def compare_to_baseline(results, baseline, threshold):
+    """
+    기준선 대비 처리량 감소/메모리 증가가 허용치를 넘는 항목 찾기
+    
+    Args:
+        results: {규모: {단계: 측정값}}
+        baseline: 같은 형식의 기준선
+        threshold: 허용 비율 (0.25면 처리량 25% 감소 또는 메모리 25% 증가까지 허용)
+        
+    Returns:
+        list: 회귀 항목 설명 문자열 리스트
+    """
+    regressions = []
+    
+    for scale, stages in results.items():
+        for stage, current in stages.items():
+            reference = baseline.get(scale, {}).get(stage)
+            if reference is None:
+                continue
+            
+            if current['rows_per_sec'] < reference['rows_per_sec'] * (1 - threshold):
+                regressions.append(
+                    f"{scale} {stage}: 처리량 {current['rows_per_sec']:,.0f} rows/s "
+                    f"(기준 {reference['rows_per_sec']:,.0f} rows/s)"
+                )
+            if current['peak_bytes'] > reference['peak_bytes'] * (1 + threshold):
+                regressions.append(
+                    f"{scale} {stage}: 최대 메모리 {current['peak_bytes'] / 2**20:,.1f} MiB "
+                    f"(기준 {reference['peak_bytes'] / 2**20:,.1f} MiB)"
+                )
+    
+    return regressions
+
+
+def parse_args():
+    """명령행 인자 파싱"""
+    arg_parser = argparse.ArgumentParser(description='근태 관리 시스템 단계별 성능 측정')
+    arg_parser.add_argument(
+        '--scales',
+        nargs='+',
+        default=DEFAULT_SCALES,
+        help="측정 규모 목록 (카드수x일수, 예: 1000x30)"
+    )
+    arg_parser.add_argument(
+        '--repeat',
+        type=positive_int,
+        default=3,
+        help='시간 측정 반복 횟수 (최소값 사용)'
+    )
+    arg_parser.add_argument(
+        '--baseline',
+        default=DEFAULT_BASELINE,
+        help='기준선 JSON 파일 경로'
+    )
+    arg_parser.add_argument(
+        '--threshold',
+        type=float,
+        default=0.25,
+        help='허용 회귀 비율 (기본 0.25)'
+    )
+    arg_parser.add_argument(
+        '--save-baseline',
+        action='store_true',
+        help='현재 측정 결과를 기준선으로 저장'
+    )
+    arg_parser.add_argument(
+        '--output',
+        help='측정 결과 JSON 저장 경로 (선택)'
+    )
+    return arg_parser.parse_args()
+
+
+def main():
+    """성능 측정 실행 함수 (회귀 발생 시 종료 코드 1)"""
+    
+    args = parse_args()
+    results = {}
+    
+    with tempfile.TemporaryDirectory() as work_dir:
+        for scale in args.scales:
+            results[scale] = run_scale(scale, work_dir, args.repeat)
+            
+            for stage, measured in results[scale].items():
+                print(
+                    f"{scale:>10} {stage:<24} {measured['rows']:>9,} rows "
+                    f"{measured['seconds']:>9.3f} s {measured['rows_per_sec']:>12,.0f} rows/s "
+                    f"{measured['peak_bytes'] / 2**20:>9.1f} MiB"
+                )
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"기준선 저장: {args.baseline}")
+        return 0
+    
+    if not os.path.exists(args.baseline):
+        print(f"기준선이 없어 비교하지 않음: {args.baseline} (--save-baseline으로 생성)")
+        return 0
+    
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    
+    regressions = compare_to_baseline(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n성능 회귀 {len(regressions)}건 (허용 {args.threshold:.0%}):")
+        for regression in regressions:
+            print(f"✗ {regression}")
+        return 1
+    
+    print(f"\n✓ 기준선 대비 회귀 없음 (허용 {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
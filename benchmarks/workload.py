@@ -0,0 +1,127 @@
+import calendar
+import os
+
+import numpy as np
+import pandas as pd
+
+
+# 부서명 (괄호 안은 위치)
+DEPARTMENTS = ['생산1팀', '생산2팀(평택)', '품질팀', '관리팀(아산)', '물류팀(평택)']
+
+
+def generate_punch_log(file_path, cards, days, year=2025, month=9, seed=0,
+                       night_ratio=0.1, missing_ratio=0.03, duplicate_ratio=0.02,
+                       absent_ratio=0.05, invalid_lines=10):
+    """
+    고정폭 출퇴근 로그 생성 (YYYYMMDD + HHMMSS + 코드 + 8자리 카드번호, 시간순)
+    
+    Args:
+        file_path: 출력 TXT 파일 경로
+        cards: 카드 수
+        days: 일수 (해당 월 일수를 넘으면 월말까지)
+        year: 년
+        month: 월
+        seed: 난수 시드
+        night_ratio: 야간 근무자 비율 (22시 전후 출근, 익일 6시 전후 퇴근)
+        missing_ratio: 출근 또는 퇴근 기록 누락 비율
+        duplicate_ratio: 같은 기록을 몇 초~몇 분 뒤 한 번 더 찍는 비율
+        absent_ratio: 기록이 없는 (카드, 날짜) 비율
+        invalid_lines: 형식이 잘못된 줄 수
+        
+    Returns:
+        int: 기록한 출퇴근 기록 수 (잘못된 줄 제외)
+    """
+    rng = np.random.default_rng(seed)
+    days = min(days, calendar.monthrange(year, month)[1])
+    
+    card_ids = np.repeat(np.arange(1, cards + 1), days)
+    day_offsets = np.tile(np.arange(days), cards)
+    is_night = np.repeat(rng.random(cards) < night_ratio, days)
+    
+    present = rng.random(len(card_ids)) >= absent_ratio
+    card_ids = card_ids[present]
+    day_offsets = day_offsets[present]
+    is_night = is_night[present]
+    count = len(card_ids)
+    
+    # 주간: 8시 전후 출근, 17시 이후 퇴근 (일부 연장) / 야간: 22시 전후 출근, 익일 6시 전후 퇴근
+    check_in = np.where(
+        is_night,
+        22 * 3600 + rng.normal(0, 1800, count),
+        8 * 3600 + rng.normal(0, 1800, count)
+    )
+    check_out = np.where(
+        is_night,
+        30 * 3600 + rng.normal(0, 1800, count),
+        17 * 3600 + rng.exponential(2 * 3600, count)
+    )
+    
+    month_start = np.datetime64(f'{year:04d}-{month:02d}-01', 's')
+    base = month_start + day_offsets.astype('timedelta64[D]')
+    in_times = base + check_in.astype('int64').astype('timedelta64[s]')
+    out_times = base + np.maximum(check_out, check_in + 3600).astype('int64').astype('timedelta64[s]')
+    
+    missing = rng.random(count)
+    has_in = missing >= missing_ratio / 2
+    has_out = (missing < missing_ratio / 2) | (missing >= missing_ratio)
+    
+    times = np.concatenate([in_times[has_in], out_times[has_out]])
+    codes = np.concatenate([np.full(has_in.sum(), 1), np.full(has_out.sum(), 2)])
+    punch_cards = np.concatenate([card_ids[has_in], card_ids[has_out]])
+    
+    duplicate = rng.random(len(times)) < duplicate_ratio
+    times = np.concatenate([times, times[duplicate] + rng.integers(1, 180, duplicate.sum()).astype('timedelta64[s]')])
+    codes = np.concatenate([codes, codes[duplicate]])
+    punch_cards = np.concatenate([punch_cards, punch_cards[duplicate]])
+    
+    order = np.argsort(times, kind='stable')
+    lines = (
+        pd.Series(times[order]).dt.strftime('%Y%m%d%H%M%S')
+        + pd.Series(codes[order]).astype(str)
+        + pd.Series(punch_cards[order]).astype(str).str.zfill(8)
+    ).tolist()
+    
+    # 형식이 잘못된 줄 (짧은 줄, 숫자가 아닌 헤더)
+    for i in range(invalid_lines):
+        position = int(rng.integers(0, len(lines) + 1))
+        lines.insert(position, 'ERROR' if i % 2 else f'{year:04d}{month:02d}XX' + '0' * 12)
+    
+    directory = os.path.dirname(file_path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    
+    with open(file_path, 'w', encoding='utf-8', newline='') as f:
+        f.write('\r\n'.join(lines) + '\r\n')
+    
+    return len(lines) - invalid_lines
+
+
+def generate_employee_workbook(file_path, cards, seed=0):
+    """
+    출퇴근 로그와 카드번호가 맞는 사원 정보 Excel 생성
+    
+    Args:
+        file_path: 출력 Excel 파일 경로
+        cards: 카드 수
+        seed: 난수 시드
+        
+    Returns:
+        DataFrame: 생성한 사원 정보
+    """
+    rng = np.random.default_rng(seed)
+    card_ids = np.arange(1, cards + 1)
+    departments = rng.integers(0, len(DEPARTMENTS), cards)
+    
+    employee_df = pd.DataFrame({
+        '카드번호': card_ids,
+        '사원명': [f'사원{card:05d}' for card in card_ids],
+        '부서명': [DEPARTMENTS[dept] for dept in departments],
+        '부서코드': [f'D{dept + 1:02d}' for dept in departments]
+    })
+    
+    directory = os.path.dirname(file_path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    
+    employee_df.to_excel(file_path, index=False)
+    return employee_df
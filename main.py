@@ -1,146 +1,673 @@
-import pandas as pd
+import argparse
 import os
-from datetime import datetime
-from modules.parser import DataParser
-from modules.calculator import AttendanceCalculator
-from modules.report_generator import ReportGenerator
-from modules.utils import setup_logger, validate_file_exists, create_output_directory
+import sys
+from modules.input_check import MIN_RECORD_LENGTH, check_punch_archive, check_punch_log, check_workbook, is_punch_archive
+from modules.metrics import StageMetrics
+from modules.report_backends import REPORT_FORMATS, available_formats
+from modules.rules_schema import validate_holidays_file, validate_registry_file, validate_rules_file
+from modules.utils import setup_logger, validate_file_exists, create_output_directory, prefix_year_month, report_prefix
 
+# pandas/openpyxl을 사용하는 모듈은 필요한 단계에서만 import (validate는 표준 라이브러리만 사용)
 
-def main():
+
+# 파일 경로 설정
+DATA_DIR = 'data'
+OUTPUT_DIR = 'output'
+CONFIG_DIR = 'config'
+CACHE_DIR = 'cache'
+
+ATTENDANCE_LOG_FILE = os.path.join(DATA_DIR, '2025년 9월.txt')
+EMPLOYEE_INFO_FILE = os.path.join(DATA_DIR, '사용자.xlsx')
+OVERTIME_LEAVE_FILE = os.path.join(DATA_DIR, '연장휴가정보.xlsx')
+RULES_FILE = os.path.join(CONFIG_DIR, 'rules.json')
+HOLIDAYS_FILE = os.path.join(CONFIG_DIR, 'holidays.json')  # 공휴일/회사 휴무일 (없으면 요일만으로 구분)
+RULESETS_FILE = os.path.join(CONFIG_DIR, 'rulesets.json')  # 위치/부서코드별 규칙 목록 (없으면 RULES_FILE만 사용)
+CHECKPOINT_DIR = os.path.join(CACHE_DIR, 'attendance_checkpoint')
+RESULT_STORE_FILE = os.path.join(CACHE_DIR, 'results.sqlite')
+
+COMMANDS = ['validate', 'parse', 'calculate', 'report', 'run', 'query', 'serve', 'archive']
+
+
+def _add_parse_args(arg_parser):
+    """parse 단계 인자"""
+    arg_parser.add_argument(
+        '--pair-shifts',
+        action='store_true',
+        help='날짜 대신 근무 단위로 출퇴근 짝짓기 (자정을 넘는 야간 근무)'
+    )
+    arg_parser.add_argument(
+        '--max-shift-hours',
+        type=float,
+        default=16,  # punch_log.DEFAULT_MAX_SHIFT_HOURS (지연 import를 위해 값으로 지정)
+        help='근무 짝짓기 최대 근무 시간 (24시간 미만)'
+    )
+    arg_parser.add_argument(
+        '--keep-duplicates',
+        action='store_true',
+        help='중복 전송된 출퇴근 기록을 제거하지 않음 (나머지 검증은 그대로 적용)'
+    )
+
+
+def _add_calculate_args(arg_parser):
+    """calculate 단계 인자"""
+    arg_parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='체크포인트 이후 추가된 출퇴근 기록만 파싱/계산'
+    )
+    arg_parser.add_argument(
+        '--save-store',
+        action='store_true',
+        help=f'계산 결과를 결과 저장소({RESULT_STORE_FILE})에 월 단위로 저장'
+    )
+
+
+def _add_report_args(arg_parser):
+    """report 단계 인자"""
+    arg_parser.add_argument(
+        '--workers',
+        type=int,
+        default=2,
+        help='리포트 생성 프로세스 수 (1이면 순차 생성)'
+    )
+    arg_parser.add_argument(
+        '--shard-by-department',
+        action='store_true',
+        help='일별 상세 리포트를 부서별 파일로 분할'
+    )
+    arg_parser.add_argument(
+        '--format',
+        choices=list(REPORT_FORMATS),
+        default='xlsx',
+        help='리포트 출력 형식 (xlsx: 스타일 적용 엑셀, csv/parquet/jsonl: 시트 대신 컬럼으로 구분한 단일 테이블)'
+    )
+
+
+def parse_args(argv=None):
+    """
+    명령행 인자 파싱 (하위 명령이 없으면 run)
+    
+    Args:
+        argv: 인자 리스트 (None이면 sys.argv[1:])
+        
+    Returns:
+        Namespace: 파싱된 인자
+    """
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or (argv[0] not in COMMANDS and argv[0] not in ('-h', '--help')):
+        argv.insert(0, 'run')
+    
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        '--log',
+        default=ATTENDANCE_LOG_FILE,
+        help='출퇴근 로그 TXT 파일 또는 보관 파일(.punch) 경로 (파일명의 년월로 출력 파일명 결정)'
+    )
+    
+    measured = argparse.ArgumentParser(add_help=False)
+    measured.add_argument(
+        '--profile',
+        action='store_true',
+        help='단계별 cProfile 결과(.prof)를 출력 디렉토리에 저장'
+    )
+    measured.add_argument(
+        '--trace-memory',
+        action='store_true',
+        help='단계별 최대 메모리 측정(tracemalloc) (할당이 많은 단계는 실행 시간이 크게 늘어남)'
+    )
+    
+    arg_parser = argparse.ArgumentParser(description='근태 관리 시스템')
+    subparsers = arg_parser.add_subparsers(dest='command')
+    
+    subparsers.add_parser('validate', parents=[common], help='입력 파일과 규칙 스키마만 검사 (pandas/openpyxl 미사용)')
+    
+    parse_parser = subparsers.add_parser('parse', parents=[common, measured], help='출퇴근 로그 파싱 결과 저장')
+    _add_parse_args(parse_parser)
+    
+    calculate_parser = subparsers.add_parser('calculate', parents=[common, measured], help='파싱 결과로 일별 근태 계산')
+    _add_calculate_args(calculate_parser)
+    
+    report_parser = subparsers.add_parser('report', parents=[common, measured], help='계산 결과로 리포트 생성')
+    _add_report_args(report_parser)
+    report_parser.add_argument(
+        '--from-store',
+        action='store_true',
+        help='중간 결과 파일 대신 결과 저장소에서 해당 월 결과를 읽어 리포트 생성'
+    )
+    
+    run_parser = subparsers.add_parser('run', parents=[common, measured], help='파싱부터 리포트까지 전체 실행 (기본)')
+    _add_parse_args(run_parser)
+    _add_calculate_args(run_parser)
+    _add_report_args(run_parser)
+    
+    query_parser = subparsers.add_parser('query', help='결과 저장소에서 사원/부서/기간별 일별 근태 조회')
+    query_parser.add_argument('--card', help='카드번호')
+    query_parser.add_argument('--department', help='부서명')
+    query_parser.add_argument('--start', help='시작일 (YYYY-MM-DD, 포함)')
+    query_parser.add_argument('--end', help='종료일 (YYYY-MM-DD, 포함)')
+    query_parser.add_argument(
+        '--months',
+        type=int,
+        default=None,
+        help='시작일 대신 저장된 최근 N개월 조회'
+    )
+    
+    serve_parser = subparsers.add_parser('serve', parents=[common], help='규칙/사원 정보/출퇴근 집계를 메모리에 유지하는 로컬 조회 서비스')
+    serve_parser.add_argument('--host', default='127.0.0.1', help='바인드 주소')
+    serve_parser.add_argument('--port', type=int, default=8765, help='포트')
+    serve_parser.add_argument('--socket', default=None, help='TCP 대신 사용할 Unix 소켓 경로')
+    
+    archive_parser = subparsers.add_parser('archive', parents=[common], help='마감된 월 출퇴근 로그를 바이너리 보관 파일로 변환')
+    archive_parser.add_argument(
+        '--output',
+        default=None,
+        help='보관 파일 경로 (기본: 로그 파일의 확장자를 .punch로 변경)'
+    )
+    archive_parser.add_argument(
+        '--keep-duplicates',
+        action='store_true',
+        help='중복 전송된 출퇴근 기록을 제거하지 않고 보관'
+    )
+    
+    args = arg_parser.parse_args(argv)
+    
+    if args.command == 'run' and args.incremental and args.pair_shifts:
+        arg_parser.error('--incremental과 --pair-shifts는 함께 사용할 수 없습니다')
+    
+    if args.command == 'query' and args.card is None and args.department is None:
+        arg_parser.error('--card 또는 --department를 지정하세요')
+    
+    if getattr(args, 'format', 'xlsx') not in available_formats():
+        arg_parser.error(f'{args.format} 리포트를 만들려면 pyarrow가 필요합니다')
+    
+    return args
+
+
+def _stage_file(year_month, name):
+    """단계 간 전달용 중간 결과 파일 경로"""
+    return os.path.join(CACHE_DIR, f'{year_month}_{name}.pkl')
+
+
+def command_validate(args, logger):
+    """
+    입력 파일 존재/형식과 규칙 스키마 검사 (표준 라이브러리만 사용)
+    
+    Returns:
+        int: 종료 코드 (문제 있으면 1)
+    """
+    errors = []
+    years = []
+    
+    if not os.path.exists(args.log):
+        errors.append(f"파일을 찾을 수 없습니다: {args.log}")
+    elif is_punch_archive(args.log):
+        archive_check = check_punch_archive(args.log)
+        logger.info(f"출퇴근 보관 파일: 기록 {archive_check['records']}건")
+        errors.extend(archive_check['errors'])
+        years = archive_check['years']
+    else:
+        log_check = check_punch_log(args.log)
+        years = log_check['years']
+        logger.info(
+            f"출퇴근 로그: 전체 {log_check['lines']}줄, 유효 {log_check['valid']}건, 무시 {log_check['invalid']}줄"
+        )
+        if log_check['valid'] == 0:
+            errors.append(f"유효한 출퇴근 기록이 없습니다: {args.log}")
+    
+    errors.extend(check_workbook(EMPLOYEE_INFO_FILE))
+    if os.path.exists(OVERTIME_LEAVE_FILE):
+        errors.extend(check_workbook(OVERTIME_LEAVE_FILE))
+    
+    if not os.path.exists(RULES_FILE):
+        errors.append(f"파일을 찾을 수 없습니다: {RULES_FILE}")
+    else:
+        errors.extend(f"{RULES_FILE}: {error}" for error in validate_rules_file(RULES_FILE))
+    if os.path.exists(RULESETS_FILE):
+        errors.extend(validate_registry_file(RULESETS_FILE))
+    if os.path.exists(HOLIDAYS_FILE):
+        errors.extend(validate_holidays_file(HOLIDAYS_FILE, years))
+    
+    for error in errors:
+        logger.error(error)
+    
+    print("\n" + "="*50)
+    print("✓ 입력 검사 통과" if not errors else f"✗ 입력 검사 실패: {len(errors)}건")
+    print("="*50)
+    
+    return 1 if errors else 0
+
+
+def parse_stage(args, year_month, metrics, logger):
+    """
+    출퇴근 로그 파싱 (검증에서 걸러진 줄은 사유 코드와 함께 격리 파일로 저장)
+    
+    Returns:
+        DataFrame: 날짜(또는 근무)별 출퇴근 데이터
+    """
+    from modules.parser import DataParser
+    from modules.punch_validation import PunchValidator
+    
+    validator = PunchValidator(deduplicate=not args.keep_duplicates)
+    
+    logger.info("출퇴근 로그 파싱 중...")
+    with metrics.stage('parse_attendance_log') as stage:
+        if args.pair_shifts:
+            attendance_df = DataParser.parse_attendance_shifts(
+                args.log, args.max_shift_hours, compact=True, validator=validator
+            )
+        else:
+            attendance_df = DataParser.parse_attendance_log(args.log, streaming=True, compact=True, validator=validator)
+        stage['rows'] = len(attendance_df)
+        stage['validation'] = validator.summary()
+    logger.info(f"출퇴근 데이터 {len(attendance_df)}건 로드 완료")
+    
+    write_quarantine(validator, year_month, logger)
+    
+    return attendance_df
+
+
+def write_quarantine(validator, year_month, logger, append=False):
+    """
+    검증에서 걸러진 줄이 있으면 격리 파일로 저장하고 사유별 건수 기록
+    
+    Args:
+        validator: PunchValidator
+        year_month: 출력 파일명 접두어 (예: '2025_09')
+        append: True면 기존 격리 파일에 덧붙임 (증분 모드)
+    """
+    if not validator.rejected:
+        return
+    
+    quarantine_file = os.path.join(OUTPUT_DIR, f'{year_month}_quarantine.txt')
+    validator.write_quarantine(quarantine_file, append=append)
+    reasons = ', '.join(f"{name} {count}건" for name, count in validator.summary()['reasons'].items())
+    logger.warning(f"검증에서 {validator.rejected}줄 격리 ({reasons}): {quarantine_file}")
+
+
+def load_employee_info(metrics, logger):
+    """
+    사원 정보 파싱 (캐시 사용)
+    
+    Returns:
+        DataFrame: 사원 정보
+    """
+    from modules.parser import DataParser
+    
+    logger.info("사원 정보 파싱 중...")
+    with metrics.stage('parse_employee_info') as stage:
+        employee_df = DataParser.parse_employee_info(EMPLOYEE_INFO_FILE, cache_dir=CACHE_DIR)
+        stage['rows'] = len(employee_df)
+    logger.info(f"사원 정보 {len(employee_df)}건 로드 완료")
+    
+    return employee_df
+
+
+def calculate_stage(args, year_month, attendance_df, employee_df, metrics, logger):
+    """
+    일별 근태 계산 및 연장/휴가 정보 매칭
+    
+    Args:
+        year_month: 출력 파일명 접두어 (증분 모드 격리 파일명)
+        attendance_df: 파싱된 출퇴근 데이터 (증분 모드면 None)
+        employee_df: 사원 정보 (위치별 규칙 목록을 사용할 때만 필요, 없으면 None)
+        
+    Returns:
+        DataFrame: 일별 근태 데이터
+    """
+    from modules.employee_directory import EmployeeDirectory
+    from modules.incremental import IncrementalAttendance
+    from modules.parser import DataParser
+    from modules.pipeline import finalize_daily_records
+    from modules.punch_validation import PunchValidator
+    from modules.ruleset_registry import create_calculator
+    
+    # 연장/휴가 정보 파싱 (선택적)
+    overtime_df = None
+    if os.path.exists(OVERTIME_LEAVE_FILE):
+        logger.info("연장/휴가 정보 파싱 중...")
+        with metrics.stage('parse_overtime_leave_info') as stage:
+            overtime_df = DataParser.parse_overtime_leave_info(OVERTIME_LEAVE_FILE, cache_dir=CACHE_DIR)
+            stage['rows'] = len(overtime_df)
+        logger.info(f"연장/휴가 정보 {len(overtime_df)}건 로드 완료")
+    
+    logger.info("근태 계산 시작...")
+    with metrics.stage('calculate') as stage:
+        # 규칙 목록이 있으면 사원 위치/부서코드별 규칙으로 나누어 계산
+        directory = EmployeeDirectory(employee_df) if employee_df is not None else None
+        calculator = create_calculator(
+            RULES_FILE, RULESETS_FILE, directory, holidays_file=HOLIDAYS_FILE
+        )
+        
+        # 일별 근태 데이터 일괄 계산
+        if args.incremental:
+            logger.info("증분 모드: 추가된 출퇴근 기록 반영 중...")
+            # calculate 명령에는 --keep-duplicates가 없으므로 기본값(중복 제거) 사용
+            validator = PunchValidator(deduplicate=not getattr(args, 'keep_duplicates', False))
+            incremental = IncrementalAttendance(args.log, calculator, CHECKPOINT_DIR, validator=validator)
+            daily_df = incremental.update()
+            stage['validation'] = validator.summary()
+        else:
+            daily_df = calculator.calculate_all(attendance_df)
+        
+        # 연장/기본급/연장내역 매칭 컬럼 추가
+        daily_df = finalize_daily_records(daily_df, overtime_df)
+        stage['rows'] = len(daily_df)
+    
+    logger.info(f"일별 근태 계산 완료: {len(daily_df)}건")
+    if args.incremental:
+        write_quarantine(validator, year_month, logger, append=incremental.resumed)
+    
+    return daily_df
+
+
+def store_stage(daily_df, employee_df, year_month, metrics, logger):
+    """
+    계산 결과를 결과 저장소에 저장 (부서 색인을 위해 사원 정보 결합)
+    
+    Args:
+        daily_df: 일별 근태 데이터
+        employee_df: 사원 정보
+        year_month: 저장할 월 (예: '2025_09')
+    """
+    from modules.employee_directory import EmployeeDirectory
+    from modules.result_store import ResultStore
+    from modules.ruleset_registry import current_ruleset_id
+    
+    with metrics.stage('save_result_store') as stage:
+        directory = EmployeeDirectory(employee_df)
+        enriched = directory.enrich(daily_df)
+        stage['rows'] = ResultStore(RESULT_STORE_FILE).save(
+            enriched, current_ruleset_id(RULES_FILE, RULESETS_FILE, HOLIDAYS_FILE, directory), year_month
+        )
+    logger.info(f"결과 저장소에 {year_month} 일별 {stage['rows']}건 저장: {RESULT_STORE_FILE}")
+
+
+def report_stage(args, daily_df, employee_df, year_month, metrics, logger):
+    """
+    월간 합산 / 일별 상세 리포트 생성
+    
+    Args:
+        daily_df: 일별 근태 데이터 (None이면 결과 저장소에서 해당 월 결과 사용)
+        
+    Returns:
+        dict: 리포트 매니페스트
+    """
+    from modules.employee_directory import EmployeeDirectory
+    from modules.report_generator import ReportGenerator
+    
+    # 사원 정보 색인 (정수 카드 키)
+    employee_directory = EmployeeDirectory(employee_df)
+    
+    logger.info("리포트 생성 시작...")
+    
+    # 월간 합산 / 일별 상세 리포트 (별도 프로세스에서 병렬 생성, 리포트별 측정값은 작업 프로세스에서 기록)
+    options = {
+        'workers': args.workers,
+        'shard_by_department': args.shard_by_department,
+        'output_format': args.format,
+        'profile_dir': metrics.profile_dir,
+        'trace_memory': metrics.trace_memory
+    }
+    if daily_df is None:
+        from modules.result_store import ResultStore
+        from modules.ruleset_registry import current_ruleset_id
+        
+        manifest = ReportGenerator.create_reports_from_store(
+            ResultStore(RESULT_STORE_FILE),
+            current_ruleset_id(RULES_FILE, RULESETS_FILE, HOLIDAYS_FILE, employee_directory), year_month,
+            employee_directory, OUTPUT_DIR, **options
+        )
+    else:
+        # 일별 데이터에 사원 정보 한 번만 결합
+        daily_df = employee_directory.enrich(daily_df)
+        manifest = ReportGenerator.create_reports(daily_df, employee_directory, OUTPUT_DIR, year_month, **options)
+    for report_file in manifest['files']:
+        metrics.add(report_file['metrics'])
+    
+    return manifest
+
+
+def command_query(args, logger):
+    """
+    결과 저장소에서 사원/부서/기간별 일별 근태 조회 (원본 로그 재계산 없음)
+    
+    Returns:
+        int: 종료 코드 (결과 없으면 1)
+    """
+    from modules.daily_records import to_display
+    from modules.employee_directory import EmployeeDirectory
+    from modules.result_store import ResultStore
+    from modules.ruleset_registry import current_ruleset_id
+    
+    validate_file_exists(RESULT_STORE_FILE)
+    validate_file_exists(RULES_FILE)
+    
+    # 위치별 규칙 목록을 사용하면 규칙 버전에 사원별 규칙 지정이 포함되므로 사원 정보 필요
+    directory = None
+    if os.path.exists(RULESETS_FILE):
+        validate_file_exists(EMPLOYEE_INFO_FILE)
+        directory = EmployeeDirectory(load_employee_info(StageMetrics(logger), logger))
+    
+    store = ResultStore(RESULT_STORE_FILE)
+    ruleset_id = current_ruleset_id(RULES_FILE, RULESETS_FILE, HOLIDAYS_FILE, directory)
+    
+    # 최근 N개월: 저장된 기간의 년월(사업장별 기간은 같은 달로 묶음) 중 마지막 N개의 첫 날부터
+    start = args.start
+    if args.months:
+        year_months = sorted({prefix_year_month(period) for period, _, _ in store.periods(ruleset_id)} - {None})
+        if year_months:
+            year, month = year_months[-args.months:][0]
+            start = f'{year}-{month:02d}-01'
+    
+    daily_df = store.query(ruleset_id, card=args.card, start=start, end=args.end, department=args.department)
+    logger.info(f"결과 저장소 조회: {len(daily_df)}건")
+    
+    if daily_df.empty:
+        print("조회 결과가 없습니다 (현재 규칙 버전으로 저장된 결과만 조회)")
+        return 1
+    
+    columns = [
+        'date', 'card_number', 'department', 'check_in', 'check_out', 'work_ot',
+        'late_early', 'approved_ot', 'night_work', 'holiday_bonus', 'meal_allowance', 'transport_allowance'
+    ]
+    print(to_display(daily_df)[columns].to_string(index=False))
+    return 0
+
+
+def command_serve(args, logger):
+    """
+    조회 서비스 실행 (중단할 때까지)
+    
+    규칙, 사원 정보, 연장/휴가 정보, 출퇴근 부분 집계를 한 번만 로드하여 메모리에 유지하고
+    새 출퇴근 기록 추가와 사원/부서별 조회를 로컬 HTTP(또는 Unix 소켓)로 처리한다.
+    
+    Returns:
+        int: 종료 코드
+    """
+    from modules.attendance_service import run_service
+    from modules.employee_directory import EmployeeDirectory
+    from modules.parser import DataParser
+    from modules.ruleset_registry import create_calculator
+    
+    validate_file_exists(args.log)
+    validate_file_exists(EMPLOYEE_INFO_FILE)
+    validate_file_exists(RULES_FILE)
+    create_output_directory(CACHE_DIR)
+    
+    metrics = StageMetrics(logger, trace_memory=False)
+    employee_df = load_employee_info(metrics, logger)
+    overtime_df = None
+    if os.path.exists(OVERTIME_LEAVE_FILE):
+        overtime_df = DataParser.parse_overtime_leave_info(OVERTIME_LEAVE_FILE, cache_dir=CACHE_DIR)
+    
+    employee_directory = EmployeeDirectory(employee_df)
+    
+    try:
+        run_service(
+            create_calculator(
+                RULES_FILE, RULESETS_FILE, employee_directory, holidays_file=HOLIDAYS_FILE
+            ),
+            employee_directory,
+            args.log,
+            overtime_df=overtime_df,
+            host=args.host,
+            port=args.port,
+            socket_path=args.socket,
+            logger=logger,
+            holidays_file=HOLIDAYS_FILE
+        )
+    except KeyboardInterrupt:
+        logger.info("조회 서비스 종료")
+    
+    return 0
+
+
+def command_archive(args, logger):
+    """
+    출퇴근 로그를 검증 후 바이너리 보관 파일로 변환 (이후 파싱은 텍스트 디코딩 없이 메모리 맵으로 읽음)
+    
+    Returns:
+        int: 종료 코드
+    """
+    from modules.punch_archive import archive_path_for, read_punch_archive, write_punch_archive
+    from modules.punch_log import read_punch_file
+    from modules.punch_validation import PunchValidator
+    
+    validate_file_exists(args.log)
+    if is_punch_archive(args.log):
+        raise ValueError(f"이미 보관 파일입니다: {args.log}")
+    create_output_directory(OUTPUT_DIR)
+    
+    archive_file = args.output or archive_path_for(args.log)
+    validator = PunchValidator(deduplicate=not args.keep_duplicates)
+    
+    logger.info(f"출퇴근 로그 보관 파일 변환 중: {args.log}")
+    columns = read_punch_file(args.log, min_length=MIN_RECORD_LENGTH, validator=validator)
+    archive_bytes = write_punch_archive(columns, archive_file)
+    
+    # 기록한 파일을 다시 읽어 체크섬과 기록 수 확인
+    if len(read_punch_archive(archive_file)['date']) != len(columns['date']):
+        raise ValueError(f"보관 파일 기록 수가 맞지 않습니다: {archive_file}")
+    
+    if validator.rejected:
+        quarantine_file = os.path.join(OUTPUT_DIR, f'{report_prefix(args.log)}_quarantine.txt')
+        validator.write_quarantine(quarantine_file)
+        logger.warning(f"검증에서 {validator.rejected}줄 격리: {quarantine_file}")
+    
+    log_bytes = os.path.getsize(args.log)
+    print("\n" + "="*50)
+    print(f"✓ 보관 파일: {archive_file}")
+    print(f"✓ 기록 {len(columns['date'])}건, {log_bytes:,} → {archive_bytes:,} 바이트 ({archive_bytes / log_bytes:.0%})")
+    print("="*50)
+    
+    return 0
+
+
+def _load_stage_file(path, previous_command):
+    """이전 단계 중간 결과 로드 (없으면 안내와 함께 오류)"""
+    import pandas as pd
+    
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"중간 결과가 없습니다: {path} (먼저 '{previous_command}' 실행)")
+    return pd.read_pickle(path)
+
+
+def main(argv=None):
     """메인 실행 함수"""
     
+    args = parse_args(argv)
+    
     # 로거 설정
     logger = setup_logger()
-    logger.info("근태 관리 시스템 시작")
+    logger.info(f"근태 관리 시스템 시작 ({args.command})")
     
     try:
-        # 파일 경로 설정
-        data_dir = 'data'
-        output_dir = 'output'
-        config_dir = 'config'
-        
-        attendance_log_file = os.path.join(data_dir, '2025년 9월.txt')
-        employee_info_file = os.path.join(data_dir, '사용자.xlsx')
-        overtime_leave_file = os.path.join(data_dir, '연장휴가정보.xlsx')
-        rules_file = os.path.join(config_dir, 'rules.json')
+        if args.command == 'validate':
+            return command_validate(args, logger)
+        if args.command == 'query':
+            return command_query(args, logger)
+        if args.command == 'serve':
+            return command_serve(args, logger)
+        if args.command == 'archive':
+            return command_archive(args, logger)
         
         # 파일 존재 여부 확인
         logger.info("입력 파일 확인 중...")
-        validate_file_exists(attendance_log_file)
-        validate_file_exists(employee_info_file)
-        validate_file_exists(rules_file)
+        validate_file_exists(args.log)
+        validate_file_exists(EMPLOYEE_INFO_FILE)
+        validate_file_exists(RULES_FILE)
         
         # 출력 디렉토리 생성
-        create_output_directory(output_dir)
+        create_output_directory(OUTPUT_DIR)
+        create_output_directory(CACHE_DIR)
         
-        # 1. 데이터 파싱
-        logger.info("데이터 파싱 시작...")
-        parser = DataParser()
+        # 로그 파일명에서 년월 추출 (없으면 현재 년월)
+        year_month = report_prefix(args.log)
         
-        # 출퇴근 로그 파싱
-        logger.info("출퇴근 로그 파싱 중...")
-        attendance_df = parser.parse_attendance_log(attendance_log_file)
-        logger.info(f"출퇴근 데이터 {len(attendance_df)}건 로드 완료")
+        # 단계별 실행 시간/메모리 측정 (--profile이면 단계별 cProfile 결과도 저장)
+        profile_dir = os.path.join(OUTPUT_DIR, f'{year_month}_profile') if args.profile else None
+        metrics = StageMetrics(logger, profile_dir=profile_dir, trace_memory=args.trace_memory)
         
-        # 사원 정보 파싱
-        logger.info("사원 정보 파싱 중...")
-        employee_df = parser.parse_employee_info(employee_info_file)
-        logger.info(f"사원 정보 {len(employee_df)}건 로드 완료")
+        attendance_file = _stage_file(year_month, 'attendance')
+        daily_file = _stage_file(year_month, 'daily')
+        employee_df = None
+        manifest = None
         
-        # 연장/휴가 정보 파싱 (선택적)
-        overtime_df = None
-        if os.path.exists(overtime_leave_file):
-            logger.info("연장/휴가 정보 파싱 중...")
-            overtime_df = parser.parse_overtime_leave_info(overtime_leave_file)
-            logger.info(f"연장/휴가 정보 {len(overtime_df)}건 로드 완료")
+        # 1. 데이터 파싱 (증분 모드는 계산 단계에서 추가분만 파싱)
+        if args.command == 'parse' or (args.command == 'run' and not args.incremental):
+            attendance_df = parse_stage(args, year_month, metrics, logger)
+            if args.command == 'parse':
+                attendance_df.to_pickle(attendance_file)
         
         # 2. 근태 계산
-        logger.info("근태 계산 시작...")
-        calculator = AttendanceCalculator(rules_file)
-        
-        # 일별 근태 데이터 계산
-        daily_records = []
-        
-        for _, row in attendance_df.iterrows():
-            date = row['date']
-            check_in = row['check_in']
-            check_out = row['check_out']
-            card_number = row['card_number']
-            
-            # 근무 OT 계산
-            work_ot = calculator.calculate_work_ot(check_in, check_out)
-            
-            # 지각/조퇴 계산
-            late_early = calculator.calculate_late_early(check_in, check_out)
+        if args.command in ('calculate', 'run'):
+            if args.incremental:
+                attendance_df = None
+            elif args.command == 'calculate':
+                attendance_df = _load_stage_file(attendance_file, 'parse')
             
-            # 인정 OT 계산
-            approved_ot = calculator.calculate_approved_ot(work_ot, late_early)
+            # 위치별 규칙 목록이나 결과 저장소를 사용하면 사원 정보를 계산 전에 로드
+            if os.path.exists(RULESETS_FILE) or args.save_store:
+                employee_df = load_employee_info(metrics, logger)
             
-            # 야간 근무 계산
-            night_work = calculator.calculate_night_work(check_in, check_out)
+            daily_df = calculate_stage(args, year_month, attendance_df, employee_df, metrics, logger)
+            if args.command == 'calculate':
+                daily_df.to_pickle(daily_file)
             
-            # 휴일 추가 계산
-            holiday_bonus = calculator.calculate_holiday_bonus(date, approved_ot)
-            
-            # 식대 계산
-            meal_allowance = calculator.calculate_meal_allowance(check_in, check_out, date)
-            
-            # 교통비 계산
-            transport_allowance = calculator.calculate_transport_allowance(check_in, check_out, date)
-            
-            # 연장내역 매칭 (선택적)
-            overtime_match = ""
-            if overtime_df is not None:
-                # 연장내역 데이터와 매칭 로직
-                # 여기서는 간단히 확인 필요 표시만 추가
-                overtime_match = "확인필요" if work_ot > 0 else ""
-            
-            daily_records.append({
-                'date': date,
-                'card_number': card_number,
-                'check_in': check_in,
-                'check_out': check_out,
-                'work_ot': work_ot,
-                'late_early': late_early,
-                'approved_ot': approved_ot,
-                'night_work': night_work,
-                'holiday_bonus': holiday_bonus,
-                'meal_allowance': meal_allowance,
-                'transport_allowance': transport_allowance,
-                'overtime': work_ot,  # 연장 (근무 OT와 동일)
-                'basic_pay': 0,  # 기본급은 별도 계산 필요
-                'overtime_match': overtime_match
-            })
-        
-        daily_df = pd.DataFrame(daily_records)
-        logger.info(f"일별 근태 계산 완료: {len(daily_df)}건")
-        
-        # 카드번호 형식 통일 (사원 정보와 매칭을 위해)
-        daily_df['카드번호'] = daily_df['card_number'].astype(str).str.zfill(4)
-        employee_df['카드번호'] = employee_df['카드번호'].astype(str).str.zfill(4)
+            if args.save_store:
+                store_stage(daily_df, employee_df, year_month, metrics, logger)
         
         # 3. 리포트 생성
-        logger.info("리포트 생성 시작...")
-        
-        # 현재 년월 추출
-        year_month = datetime.now().strftime('%Y_%m')
+        if args.command in ('report', 'run'):
+            if args.command == 'report':
+                daily_df = None if args.from_store else _load_stage_file(daily_file, 'calculate')
+            
+            if employee_df is None:
+                employee_df = load_employee_info(metrics, logger)
+            manifest = report_stage(args, daily_df, employee_df, year_month, metrics, logger)
         
-        # 월간 합산 리포트
-        monthly_report_path = os.path.join(output_dir, f'{year_month}_근태리포트_월간합산.xlsx')
-        ReportGenerator.create_monthly_summary_report(daily_df, employee_df, monthly_report_path)
+        # 단계별 측정값을 출력 파일 옆에 저장
+        metrics_name = 'metrics' if args.command == 'run' else f'{args.command}_metrics'
+        metrics_file = os.path.join(OUTPUT_DIR, f'{year_month}_{metrics_name}.json')
+        metrics.write(metrics_file)
         
-        # 일별 상세 리포트
-        daily_report_path = os.path.join(output_dir, f'{year_month}_근태리포트_일별상세.xlsx')
-        ReportGenerator.create_daily_detail_report(daily_df, employee_df, daily_report_path)
+        report_labels = {'monthly_summary': '월간 합산 리포트', 'daily_detail': '일별 상세 리포트'}
         
         logger.info("근태 관리 시스템 완료")
         print("\n" + "="*50)
-        print("✓ 근태 계산 완료")
-        print(f"✓ 월간 합산 리포트: {monthly_report_path}")
-        print(f"✓ 일별 상세 리포트: {daily_report_path}")
+        if args.command == 'parse':
+            print(f"✓ 파싱 결과: {attendance_file}")
+        elif args.command == 'calculate':
+            print(f"✓ 계산 결과: {daily_file}")
+        else:
+            print("✓ 근태 계산 완료")
+            for report_file in manifest['files']:
+                print(f"✓ {report_labels[report_file['report']]}: {report_file['path']}")
+        print(f"✓ 단계별 측정값: {metrics_file}")
         print("="*50)
         
+        return 0
+        
     except Exception as e:
         logger.error(f"오류 발생: {str(e)}", exc_info=True)
         print(f"\n오류 발생: {str(e)}")
@@ -148,4 +675,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,450 @@
+import asyncio
+import json
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import numpy as np
+
+from modules.daily_records import to_display
+from modules.employee_directory import card_keys
+from modules.input_check import is_punch_archive
+from modules.incremental import calculate_daily, empty_daily, merge_punch_columns, restore_daily
+from modules.pipeline import finalize_daily_records
+from modules.punch_archive import read_punch_archive
+from modules.punch_log import PunchAggregate, decode_punch_chunk, read_punch_file
+from modules.punch_validation import PunchValidator, record_hashes
+from modules.ruleset_registry import load_calendar
+
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# 조회 응답 컬럼
+RESPONSE_COLUMNS = [
+    'date', 'card_number', '사원명', '부서명', 'check_in', 'check_out', 'punch_count',
+    'work_ot', 'late_early', 'approved_ot', 'night_work', 'holiday_bonus',
+    'meal_allowance', 'transport_allowance', 'overtime_match'
+]
+
+# 요청 본문 최대 크기 (출퇴근 기록 추가용)
+MAX_BODY_BYTES = 16 * 2**20
+
+_STATUS_TEXT = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    500: 'Internal Server Error'
+}
+
+
+class ServiceError(Exception):
+    """HTTP 상태 코드를 가진 요청 오류"""
+    
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _parse_day(value):
+    """YYYY-MM-DD 문자열을 1970-01-01 기준 일수로 변환"""
+    try:
+        return int(np.datetime64(value, 'D').astype('int64'))
+    except ValueError:
+        raise ServiceError(400, f"날짜 형식 오류 (YYYY-MM-DD): {value}")
+
+
+class AttendanceService:
+    """
+    규칙/사원 정보/출퇴근 부분 집계를 메모리에 유지하는 근태 조회 서비스 상태
+    
+    조회는 이벤트 루프에서 현재 상태 스냅샷으로 바로 응답하고, 출퇴근 기록 추가나
+    규칙 재로드 같은 계산은 실행기(스레드)에서 새 상태를 만든 뒤 한 번에 교체한다.
+    기록 추가는 다시 계산된 (날짜, 카드번호) 행의 응답 행만 새로 만들어 스냅샷에 끼워 넣는다.
+    """
+    
+    def __init__(self, calculator, employee_directory, overtime_df=None, min_length=18, holidays_file=None):
+        """
+        초기화
+        
+        Args:
+            calculator: AttendanceCalculator
+            employee_directory: EmployeeDirectory
+            overtime_df: 연장/휴가 정보 DataFrame (선택)
+            min_length: 유효 레코드 최소 길이
+            holidays_file: 규칙 재로드 시 함께 다시 읽을 휴일 JSON 파일 경로 (선택)
+        """
+        self.calculator = calculator
+        self.directory = employee_directory
+        self.overtime_df = overtime_df
+        self.min_length = min_length
+        self.holidays_file = holidays_file
+        
+        self.aggregate = PunchAggregate.empty()
+        self.daily = empty_daily(calculator)
+        self._view = self._build_view(self.daily)
+        
+        # 지금까지 반영한 레코드 해시 (요청마다 새 검증기에 넘겨 이전 요청과의 중복 전송 제거)
+        self._seen = np.empty(0, dtype='uint64')
+        
+        # 계산 작업은 한 번에 하나씩 (조회는 잠금 없이 스냅샷 사용)
+        self._write_lock = asyncio.Lock()
+    
+    
+    def _build_view(self, daily):
+        """
+        색인된 일별 근태 데이터로 조회용 스냅샷 생성 (응답 행은 미리 문자열/기본 타입으로 변환)
+        
+        Returns:
+            tuple: (응답 행 딕셔너리 배열(object), 카드 키 배열, 날짜 배열, 부서명 배열)
+        """
+        view = finalize_daily_records(restore_daily(daily), self.overtime_df)
+        view = self.directory.enrich(view)
+        
+        rows = to_display(view)[RESPONSE_COLUMNS].astype(object)
+        records = np.empty(len(rows), dtype=object)
+        records[:] = rows.where(rows.notna(), None).to_dict('records')
+        return (
+            records,
+            view['card_key'].to_numpy(dtype='int64'),
+            view['date'].to_numpy(),
+            view['부서명'].astype(object).to_numpy()
+        )
+    
+    
+    def _patch_view(self, daily, indexer):
+        """
+        upsert_rows 위치 배열로 현재 스냅샷을 재배치하고 다시 계산된 행만 응답 행 생성
+        
+        Args:
+            daily: 갱신된 색인 일별 데이터
+            indexer: 결과 행별로 [기존 행, 다시 계산된 행]을 이어 붙인 배열에서 가져온 위치 배열
+            
+        Returns:
+            tuple: _build_view와 같은 형식의 스냅샷
+        """
+        changed = self._build_view(daily.iloc[np.flatnonzero(indexer >= len(self.daily))])
+        return tuple(np.concatenate([current, rows])[indexer] for current, rows in zip(self._view, changed))
+    
+    
+    async def _replace_state(self, compute):
+        """
+        실행기에서 새 (부분 집계, 일별 데이터)를 계산하고 조회용 스냅샷과 함께 교체
+        
+        Args:
+            compute: (PunchAggregate, 색인 일별 데이터, upsert_rows 위치 배열)을 반환하는 함수
+                     (위치 배열이 None이면 스냅샷 전체를 다시 생성)
+        """
+        def build():
+            aggregate, daily, indexer = compute()
+            view = self._build_view(daily) if indexer is None else self._patch_view(daily, indexer)
+            return aggregate, daily, view
+        
+        loop = asyncio.get_running_loop()
+        async with self._write_lock:
+            self.aggregate, self.daily, self._view = await loop.run_in_executor(None, build)
+    
+    
+    def _merge_validated(self, columns, validator):
+        """
+        검증을 통과한 컬럼을 부분 집계에 병합하고 통과 레코드 해시 갱신 (실행기에서 호출)
+        
+        Returns:
+            tuple: (PunchAggregate, 색인 일별 데이터, upsert_rows 위치 배열)
+        """
+        merged = merge_punch_columns(self.aggregate, self.daily, columns, self.calculator)
+        self._seen = validator.seen
+        return merged
+    
+    
+    def _validation_result(self, validator):
+        """검증 건수와 반영 후 일별 근태 건수 응답"""
+        summary = validator.summary()
+        return {
+            'accepted': summary['accepted'],
+            'rejected': summary['rejected'],
+            'reasons': summary['reasons'],
+            'rows': len(self.daily)
+        }
+    
+    
+    async def load_log(self, log_path):
+        """
+        출퇴근 로그 파일 전체를 읽어 상태에 반영 (TXT 파일은 파싱 단계와 같은 검증 적용)
+        
+        Args:
+            log_path: 출퇴근 로그 TXT 파일 또는 보관 파일 경로
+            
+        Returns:
+            dict: accepted(반영한 기록 수), rejected(격리한 줄 수), reasons(사유별 건수), rows(일별 근태 건수)
+        """
+        validator = PunchValidator()
+        
+        def merge():
+            # 잠금 안에서 현재 해시를 읽어 동시에 들어온 요청끼리도 중복을 거름
+            validator.restore(0, self._seen)
+            if is_punch_archive(log_path):
+                # 보관 파일은 저장 전에 검증된 기록이므로 이후 추가분과의 중복 판단용 해시만 기록
+                columns = read_punch_archive(log_path)
+                validator.accepted = len(columns['date'])
+                validator.restore(0, np.union1d(self._seen, record_hashes(columns)))
+            else:
+                columns = read_punch_file(log_path, self.min_length, validator=validator)
+            return self._merge_validated(columns, validator)
+        
+        await self._replace_state(merge)
+        return self._validation_result(validator)
+    
+    
+    async def add_punches(self, data):
+        """
+        출퇴근 로그 형식의 줄들을 검증 후 추가 반영 (해당 날짜/카드번호만 재계산)
+        
+        범위/코드/카드 형식 검사를 통과하지 못했거나 이미 반영된 기록과 같은 줄은 반영하지 않는다.
+        
+        Args:
+            data: 로그 줄 바이트 (여러 줄)
+            
+        Returns:
+            dict: accepted(반영한 기록 수), rejected(격리한 줄 수), reasons(사유별 건수), rows(일별 근태 건수)
+        """
+        validator = PunchValidator()
+        
+        def merge():
+            # 잠금 안에서 현재 해시를 읽어 동시에 들어온 요청끼리도 중복을 거름
+            validator.restore(0, self._seen)
+            columns = decode_punch_chunk(np.frombuffer(data, dtype=np.uint8), self.min_length, validator=validator)
+            return self._merge_validated(columns, validator)
+        
+        await self._replace_state(merge)
+        return self._validation_result(validator)
+    
+    
+    async def reload_rules(self):
+        """
+        규칙 파일과 휴일 파일을 다시 읽고 부분 집계 전체의 일별 근태 재계산
+        
+        Returns:
+            str: 새 규칙 버전
+        """
+        def recalculate():
+            calendar = load_calendar(self.holidays_file) if self.holidays_file else None
+            self.calculator.reload_rules(calendar)
+            return self.aggregate, calculate_daily(self.aggregate, self.calculator), None
+        
+        await self._replace_state(recalculate)
+        return self.calculator.ruleset_id
+    
+    
+    def query(self, card=None, department=None, start=None, end=None):
+        """
+        사원/부서/기간별 일별 근태 조회 (현재 스냅샷에서 배열 필터, 계산 없음)
+        
+        Args:
+            card: 카드번호 (선택)
+            department: 부서명 (선택)
+            start: 시작일 (YYYY-MM-DD, 포함, 선택)
+            end: 종료일 (YYYY-MM-DD, 포함, 선택)
+            
+        Returns:
+            list: 날짜/시간을 문자열로 변환한 행 딕셔너리 리스트
+        """
+        records, keys, dates, departments = self._view
+        mask = np.ones(len(records), dtype=bool)
+        
+        if card is not None:
+            mask &= keys == card_keys([card])[0]
+        if department is not None:
+            mask &= departments == department
+        if start is not None:
+            mask &= dates >= _parse_day(start)
+        if end is not None:
+            mask &= dates <= _parse_day(end)
+        
+        return records[mask].tolist()
+    
+    
+    def status(self):
+        """
+        서비스 상태
+        
+        Returns:
+            dict: 규칙 버전, 부분 집계/일별 근태 건수, 사원 수
+        """
+        return {
+            'ruleset_id': self.calculator.ruleset_id,
+            'aggregate_rows': len(self.aggregate),
+            'daily_rows': len(self.daily),
+            'employees': len(self.directory)
+        }
+
+
+async def handle_request(service, method, target, body):
+    """
+    요청 하나 처리
+    
+    GET  /status                       서비스 상태
+    GET  /employees/<카드번호>?start=&end=  사원별 일별 근태
+    GET  /departments/<부서명>?start=&end=  부서별 일별 근태
+    POST /punches                      출퇴근 로그 줄 추가 (본문: 로그 형식 텍스트)
+    POST /reload                       규칙 파일 재로드 및 재계산
+    
+    Args:
+        service: AttendanceService
+        method: HTTP 메서드
+        target: 요청 경로 (쿼리 문자열 포함)
+        body: 요청 본문 바이트
+        
+    Returns:
+        tuple: (상태 코드, JSON으로 직렬화할 응답)
+    """
+    url = urlsplit(target)
+    parts = [unquote(part) for part in url.path.split('/') if part]
+    params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+    route = parts[0] if parts else 'status'
+    
+    if route in ('status', 'employees', 'departments'):
+        if method != 'GET':
+            raise ServiceError(405, f"{route}는 GET만 지원합니다")
+        if route == 'status':
+            return 200, service.status()
+        if len(parts) != 2:
+            raise ServiceError(404, f"경로 오류: {url.path}")
+        
+        key = 'card' if route == 'employees' else 'department'
+        rows = service.query(start=params.get('start'), end=params.get('end'), **{key: parts[1]})
+        return 200, {key: parts[1], 'count': len(rows), 'rows': rows}
+    
+    if route in ('punches', 'reload'):
+        if method != 'POST':
+            raise ServiceError(405, f"{route}는 POST만 지원합니다")
+        if route == 'punches':
+            return 200, await service.add_punches(body)
+        return 200, {'ruleset_id': await service.reload_rules()}
+    
+    raise ServiceError(404, f"경로 오류: {url.path}")
+
+
+async def _read_request(reader):
+    """
+    HTTP/1.1 요청 하나 읽기
+    
+    Returns:
+        tuple: (메서드, 경로, 헤더 딕셔너리, 본문), 연결이 닫혔으면 None
+    """
+    request_line = await reader.readline()
+    if not request_line.strip():
+        return None
+    
+    try:
+        method, target, _ = request_line.decode('latin-1').split(' ', 2)
+    except ValueError:
+        raise ServiceError(400, "요청 줄 형식 오류")
+    
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    
+    length = int(headers.get('content-length') or 0)
+    if length > MAX_BODY_BYTES:
+        raise ServiceError(413, f"본문이 너무 큽니다 (최대 {MAX_BODY_BYTES}바이트)")
+    body = await reader.readexactly(length) if length else b''
+    
+    return method.upper(), target, headers, body
+
+
+async def _handle_connection(service, reader, writer, logger=None):
+    """연결 하나에서 keep-alive 요청들을 순서대로 처리"""
+    try:
+        while True:
+            keep_alive = False
+            try:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body = request
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                status, payload = await handle_request(service, method, target, body)
+            except ServiceError as e:
+                status, payload = e.status, {'error': str(e)}
+            except (asyncio.IncompleteReadError, ConnectionError):
+                break
+            except Exception as e:
+                if logger:
+                    logger.error(f"요청 처리 오류: {str(e)}", exc_info=True)
+                status, payload = 500, {'error': str(e)}
+            
+            content = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            writer.write(
+                f"HTTP/1.1 {status} {_STATUS_TEXT.get(status, '')}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(content)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + content
+            )
+            await writer.drain()
+            
+            if not keep_alive:
+                break
+    finally:
+        writer.close()
+
+
+async def serve(service, host=DEFAULT_HOST, port=DEFAULT_PORT, socket_path=None, logger=None):
+    """
+    로컬 HTTP 서버 실행 (socket_path 지정 시 TCP 대신 Unix 소켓)
+    
+    Args:
+        service: AttendanceService
+        host: 바인드 주소
+        port: 포트
+        socket_path: Unix 소켓 경로 (선택)
+        logger: 로거 (선택)
+    """
+    def handler(reader, writer):
+        return _handle_connection(service, reader, writer, logger)
+    
+    if socket_path:
+        server = await asyncio.start_unix_server(handler, path=socket_path)
+        address = socket_path
+    else:
+        server = await asyncio.start_server(handler, host, port)
+        address = f"http://{host}:{port}"
+    
+    if logger:
+        logger.info(f"근태 조회 서비스 시작: {address}")
+    
+    async with server:
+        await server.serve_forever()
+
+
+def run_service(calculator, employee_directory, log_path, overtime_df=None, host=DEFAULT_HOST, port=DEFAULT_PORT,
+                socket_path=None, logger=None, holidays_file=None):
+    """
+    출퇴근 로그를 한 번 읽어 상태를 만든 뒤 서비스 실행 (중단할 때까지)
+    
+    Args:
+        calculator: AttendanceCalculator
+        employee_directory: EmployeeDirectory
+        log_path: 초기 출퇴근 로그 TXT 파일 경로
+        overtime_df: 연장/휴가 정보 DataFrame (선택)
+        host: 바인드 주소
+        port: 포트
+        socket_path: Unix 소켓 경로 (선택)
+        logger: 로거 (선택)
+        holidays_file: 규칙 재로드 시 함께 다시 읽을 휴일 JSON 파일 경로 (선택)
+    """
+    async def main():
+        service = AttendanceService(calculator, employee_directory, overtime_df, holidays_file=holidays_file)
+        result = await service.load_log(log_path)
+        if logger:
+            logger.info(f"초기 출퇴근 로그 반영: 일별 {result['rows']}건 ({log_path})")
+            if result['rejected']:
+                reasons = ', '.join(f"{name} {count}건" for name, count in result['reasons'].items())
+                logger.warning(f"검증에서 {result['rejected']}줄 제외 ({reasons})")
+        await serve(service, host, port, socket_path, logger)
+    
+    asyncio.run(main())
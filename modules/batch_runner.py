@@ -0,0 +1,184 @@
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from modules.employee_directory import EmployeeDirectory
+from modules.parser import DataParser
+from modules.pipeline import finalize_daily_records
+from modules.punch_validation import PunchValidator
+from modules.report_generator import ReportGenerator
+from modules.result_store import ResultStore
+from modules.ruleset_registry import create_calculator
+from modules.utils import get_month_from_filename, report_prefix
+
+
+# 작업 프로세스마다 한 번만 로드하는 규칙/사원 정보
+_worker_state = {}
+
+
+def _init_worker(rules_file, employee_info_file, overtime_leave_file, cache_dir, store_path=None, registry_file=None,
+                 holidays_file=None):
+    """
+    작업 프로세스 초기화 (규칙, 사원 정보, 연장/휴가 정보를 한 번만 로드)
+    
+    Args:
+        rules_file: 규칙 JSON 파일 경로
+        employee_info_file: 사원 정보 Excel 파일 경로
+        overtime_leave_file: 연장/휴가 정보 Excel 파일 경로 (없으면 None)
+        cache_dir: Excel 파싱 캐시 디렉토리
+        store_path: 지정 시 월별 계산 결과를 저장할 결과 저장소(SQLite) 경로
+        registry_file: 위치/부서코드별 규칙 목록 파일 경로 (없으면 rules_file만 사용)
+        holidays_file: 공휴일/회사 휴무일 JSON 파일 경로 (없으면 요일만으로 구분)
+    """
+    _worker_state['directory'] = EmployeeDirectory(
+        DataParser.parse_employee_info(employee_info_file, cache_dir=cache_dir)
+    )
+    _worker_state['calculator'] = create_calculator(
+        rules_file, registry_file, _worker_state['directory'], holidays_file=holidays_file
+    )
+    _worker_state['overtime_df'] = None
+    if overtime_leave_file and os.path.exists(overtime_leave_file):
+        _worker_state['overtime_df'] = DataParser.parse_overtime_leave_info(overtime_leave_file, cache_dir=cache_dir)
+    _worker_state['store'] = ResultStore(store_path) if store_path else None
+
+
+def _process_month(log_path, output_dir, shard_by_department, output_format='xlsx'):
+    """
+    월간 출퇴근 로그 한 개를 파싱/계산하고 해당 월 이름으로 리포트 생성
+    
+    Args:
+        log_path: 출퇴근 로그 파일 경로
+        output_dir: 출력 디렉토리
+        shard_by_department: 일별 상세 리포트 부서별 분할 여부
+        output_format: 리포트 출력 형식
+        
+    Returns:
+        dict: 로그 경로, 년월, 일별 건수, 검증 결과 건수, 리포트 매니페스트
+    """
+    validator = PunchValidator()
+    attendance_df = DataParser.parse_attendance_log(log_path, streaming=True, compact=True, validator=validator)
+    daily_df = _worker_state['calculator'].calculate_all(attendance_df)
+    daily_df = finalize_daily_records(daily_df, _worker_state['overtime_df'])
+    daily_df = _worker_state['directory'].enrich(daily_df)
+    
+    prefix = report_prefix(log_path)
+    if validator.rejected:
+        validator.write_quarantine(os.path.join(output_dir, f'{prefix}_quarantine.txt'))
+    
+    if _worker_state['store'] is not None:
+        _worker_state['store'].save(daily_df, _worker_state['calculator'].ruleset_id, prefix)
+    
+    manifest = ReportGenerator.create_reports(
+        daily_df, _worker_state['directory'], output_dir, prefix,
+        workers=1,
+        shard_by_department=shard_by_department,
+        output_format=output_format
+    )
+    
+    return {
+        'log_path': log_path,
+        'period': prefix,
+        'daily_records': len(daily_df),
+        'validation': validator.summary(),
+        'manifest': manifest
+    }
+
+
+def find_monthly_logs(pattern):
+    """
+    glob 패턴에 맞는 월간 로그 중 파일명에서 년월을 알 수 있는 파일 목록
+    
+    Args:
+        pattern: glob 패턴 (예: 'data/*.txt')
+        
+    Returns:
+        tuple: (처리 대상 경로 리스트, 년월을 알 수 없어 제외한 경로 리스트)
+    """
+    logs = []
+    skipped = []
+    
+    for path in sorted(glob.glob(pattern)):
+        year, month = get_month_from_filename(os.path.basename(path))
+        if year is None:
+            skipped.append(path)
+        else:
+            logs.append(path)
+    
+    return logs, skipped
+
+
+def run_batch(log_paths, rules_file, employee_info_file, output_dir,
+              overtime_leave_file=None, cache_dir=None, workers=None,
+              shard_by_department=False, store_path=None, registry_file=None, holidays_file=None,
+              output_format='xlsx', logger=None):
+    """
+    여러 월간 로그를 프로세스 풀에서 병렬 처리
+    
+    Args:
+        log_paths: 월간 출퇴근 로그 경로 리스트
+        rules_file: 규칙 JSON 파일 경로
+        employee_info_file: 사원 정보 Excel 파일 경로
+        output_dir: 출력 디렉토리
+        overtime_leave_file: 연장/휴가 정보 Excel 파일 경로 (선택)
+        cache_dir: Excel 파싱 캐시 디렉토리 (선택)
+        workers: 프로세스 수 (None이면 CPU 수)
+        shard_by_department: 일별 상세 리포트 부서별 분할 여부
+        store_path: 지정 시 월별 계산 결과를 저장할 결과 저장소(SQLite) 경로
+        registry_file: 위치/부서코드별 규칙 목록 파일 경로 (선택)
+        holidays_file: 공휴일/회사 휴무일 JSON 파일 경로 (선택)
+        output_format: 리포트 출력 형식 (xlsx, csv, parquet, jsonl)
+        logger: 진행 상황 기록용 로거 (선택)
+        
+    Returns:
+        tuple: (성공 결과 리스트, {로그 경로: 오류 메시지} 딕셔너리)
+    """
+    results = []
+    failures = {}
+    
+    # 접두어가 같은 로그는 리포트/격리/매니페스트 파일을 서로 덮어쓰므로 시작 전에 중단
+    log_prefixes = {}
+    for log_path in log_paths:
+        log_prefixes.setdefault(report_prefix(log_path), []).append(log_path)
+    duplicates = {prefix: paths for prefix, paths in log_prefixes.items() if len(paths) > 1}
+    if duplicates:
+        raise ValueError("출력 파일명이 같은 월간 로그가 있습니다: " + '; '.join(
+            f"{prefix} ← {', '.join(paths)}" for prefix, paths in sorted(duplicates.items())
+        ))
+    
+    # 캐시를 미리 채워 두면 작업 프로세스는 Excel 대신 캐시를 읽음
+    if cache_dir is not None:
+        DataParser.parse_employee_info(employee_info_file, cache_dir=cache_dir)
+        if overtime_leave_file and os.path.exists(overtime_leave_file):
+            DataParser.parse_overtime_leave_info(overtime_leave_file, cache_dir=cache_dir)
+    
+    # 테이블/색인은 작업 프로세스 시작 전에 한 번만 생성
+    if store_path is not None:
+        ResultStore(store_path)
+    
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(rules_file, employee_info_file, overtime_leave_file, cache_dir, store_path, registry_file,
+                  holidays_file)
+    ) as executor:
+        futures = {
+            executor.submit(_process_month, log_path, output_dir, shard_by_department, output_format): log_path
+            for log_path in log_paths
+        }
+        
+        for future in as_completed(futures):
+            log_path = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                failures[log_path] = str(e)
+                if logger:
+                    logger.error(f"{log_path} 처리 실패: {str(e)}")
+                continue
+            
+            results.append(result)
+            if logger:
+                logger.info(f"{log_path} → {result['period']} 일별 {result['daily_records']}건 처리 완료")
+    
+    results.sort(key=lambda result: result['period'])
+    return results, failures
@@ -0,0 +1,186 @@
+import hashlib
+import json
+import logging
+
+import numpy as np
+
+from modules.rules_schema import holiday_years
+
+
+# 요일 구분 (calculate_all day_class 값)
+WEEKDAY = 0
+SATURDAY = 1
+HOLIDAY = 2  # 일요일, 공휴일, 회사 휴무일
+
+# 휴일 파일 해시별 달력 캐시
+_calendar_cache = {}
+
+logger = logging.getLogger('AttendanceSystem')
+
+
+def _to_day(date_str):
+    """YYYY-MM-DD 문자열을 1970-01-01 기준 일수로 변환"""
+    return int(np.datetime64(date_str, 'D').astype('int64'))
+
+
+def weekday_classes(days):
+    """
+    요일만으로 정한 요일 구분 (0=평일, 1=토요일, 2=일요일)
+    
+    Args:
+        days: 1970-01-01 기준 일수 배열
+        
+    Returns:
+        ndarray: int64 요일 구분 배열
+    """
+    weekday = (np.asarray(days, dtype='int64') + 3) % 7  # 1970-01-01은 목요일 (0=월요일)
+    return np.clip(weekday - 4, WEEKDAY, HOLIDAY)
+
+
+def _day_year(day):
+    """1970-01-01 기준 일수의 연도"""
+    return int(np.datetime64(int(day), 'D').astype('datetime64[Y]').astype('int64')) + 1970
+
+
+class BusinessCalendar:
+    """
+    공휴일/대체공휴일/회사 휴무일과 휴일 근무 지정일을 반영한 요일 구분 달력
+    
+    처리 기간 전체의 요일 구분 배열을 한 번 만들어 두고, 일별 데이터의 날짜는
+    (날짜 - 시작일) 위치로 한 번에 조회한다. 휴일은 일요일과 같이 취급한다.
+    """
+    
+    def __init__(self, holidays=None, workdays=None, calendar_id=None, years=None):
+        """
+        초기화
+        
+        Args:
+            holidays: {YYYY-MM-DD: 이름} 공휴일/회사 휴무일 (선택)
+            workdays: {YYYY-MM-DD: 이름} 주말이지만 평일로 계산할 날 (선택)
+            calendar_id: 휴일 파일 해시 (휴일 지정이 없으면 None)
+            years: 휴일을 지정한 연도 (선택, 없으면 지정된 날짜들의 연도)
+        """
+        self.holidays = {_to_day(date): name for date, name in (holidays or {}).items()}
+        self.workdays = {_to_day(date): name for date, name in (workdays or {}).items()}
+        self.calendar_id = calendar_id
+        if years is None:
+            years = holiday_years({'holidays': holidays or {}, 'workdays': workdays or {}})
+        self.years = frozenset(years)
+        
+        # 경고를 이미 남긴 지정 외 연도
+        self._warned_years = set()
+        
+        # (시작일, 요일 구분 배열): 함께 교체되도록 튜플로 보관
+        self._table = (0, np.empty(0, dtype='int64'))
+    
+    
+    @classmethod
+    def load(cls, holidays_path):
+        """
+        휴일 JSON 파일로 달력 생성 (파일 해시가 같으면 캐시된 달력 재사용)
+        
+        형식: {"years": [2025], "holidays": {"2025-01-01": "신정"}, "company_holidays": {...}, "workdays": {...}}
+        
+        Args:
+            holidays_path: 휴일 JSON 파일 경로
+            
+        Returns:
+            BusinessCalendar: 달력
+        """
+        with open(holidays_path, 'rb') as f:
+            content = f.read()
+        
+        calendar_id = hashlib.sha256(content).hexdigest()
+        
+        if calendar_id not in _calendar_cache:
+            config = json.loads(content.decode('utf-8'))
+            holidays = dict(config.get('holidays', {}), **config.get('company_holidays', {}))
+            _calendar_cache[calendar_id] = cls(holidays, config.get('workdays', {}), calendar_id, holiday_years(config))
+        
+        return _calendar_cache[calendar_id]
+    
+    
+    def _build_table(self, first_day, last_day):
+        """first_day~last_day 기간의 요일 구분 배열 생성 (휴일/근무 지정 반영) 후 (시작일, 배열) 반환"""
+        table = weekday_classes(np.arange(first_day, last_day + 1))
+        
+        for overrides, day_class in ((self.holidays, HOLIDAY), (self.workdays, WEEKDAY)):
+            days = np.fromiter(overrides, dtype='int64', count=len(overrides))
+            days = days[(days >= first_day) & (days <= last_day)]
+            table[days - first_day] = day_class
+        
+        self._table = (first_day, table)
+        self._warn_uncovered(first_day, last_day)
+        return self._table
+    
+    
+    def _warn_uncovered(self, first_day, last_day):
+        """휴일 파일을 쓰는 달력에서 휴일이 지정되지 않은 연도를 처리하면 연도별로 한 번 경고"""
+        if self.calendar_id is None:
+            return
+        
+        uncovered = [
+            year for year in range(_day_year(first_day), _day_year(last_day) + 1)
+            if year not in self.years and year not in self._warned_years
+        ]
+        if uncovered:
+            self._warned_years.update(uncovered)
+            logger.warning(
+                f"휴일 파일에 {', '.join(map(str, uncovered))}년 휴일이 없어 요일만으로 평일/휴일을 구분합니다"
+            )
+    
+    
+    def day_classes(self, days):
+        """
+        일수 배열의 요일 구분 (기간 배열 한 번 조회, 기간을 벗어나면 배열을 넓혀 다시 생성)
+        
+        Args:
+            days: 1970-01-01 기준 일수 배열
+            
+        Returns:
+            ndarray: int64 요일 구분 배열 (0=평일, 1=토요일, 2=일요일/휴일)
+        """
+        days = np.asarray(days, dtype='int64')
+        if not len(days):
+            return np.empty(0, dtype='int64')
+        
+        first_day = int(days.min())
+        last_day = int(days.max())
+        table_start, table = self._table
+        table_end = table_start + len(table) - 1
+        
+        if not len(table) or first_day < table_start or last_day > table_end:
+            if len(table):
+                first_day = min(first_day, table_start)
+                last_day = max(last_day, table_end)
+            table_start, table = self._build_table(first_day, last_day)
+        
+        return table[days - table_start]
+    
+    
+    def day_class(self, date):
+        """
+        날짜 하나의 요일 구분
+        
+        Args:
+            date: 날짜 (YYYY-MM-DD)
+            
+        Returns:
+            int: 요일 구분 (0=평일, 1=토요일, 2=일요일/휴일)
+        """
+        return int(self.day_classes([_to_day(date)])[0])
+    
+    
+    def versioned_id(self, ruleset_id):
+        """
+        규칙 버전에 휴일 파일 버전을 합친 계산 결과 버전
+        
+        Args:
+            ruleset_id: 규칙 버전
+            
+        Returns:
+            str: 휴일 지정이 없으면 ruleset_id 그대로, 있으면 두 해시의 해시
+        """
+        if self.calendar_id is None:
+            return ruleset_id
+        return hashlib.sha256(f'{ruleset_id}:{self.calendar_id}'.encode('utf-8')).hexdigest()
@@ -1,19 +1,96 @@
-from datetime import datetime, timedelta
-import json
+import numpy as np
+import pandas as pd
+
+from modules.business_calendar import HOLIDAY, WEEKDAY, BusinessCalendar
+from modules.compiled_rules import SECONDS_PER_DAY, load_compiled_rules, period_time_to_seconds
+from modules.daily_records import COMPACT_METRIC_DTYPES, is_compact
+
+
+# calculate_all이 추가하는 근태/수당 컬럼
+METRIC_COLUMNS = [
+    'work_ot', 'late_early', 'approved_ot', 'night_work',
+    'holiday_bonus', 'meal_allowance', 'transport_allowance'
+]
 
 
 class AttendanceCalculator:
     """근태 및 수당 계산을 담당하는 클래스"""
     
-    def __init__(self, rules_path):
+    def __init__(self, rules_path, calendar=None):
         """
         초기화
         
         Args:
             rules_path: 규칙 JSON 파일 경로
+            calendar: 공휴일을 반영할 BusinessCalendar (없으면 요일만으로 평일/토요일/일요일 구분)
+        """
+        # 규칙을 분 단위 조회 테이블로 컴파일 (같은 규칙 파일은 캐시 재사용)
+        self.rules_path = rules_path
+        self.compiled = load_compiled_rules(rules_path)
+        self.rules = self.compiled.rules
+        self.calendar = calendar if calendar is not None else BusinessCalendar()
+    
+    
+    @property
+    def ruleset_id(self):
+        """현재 규칙 버전 (규칙 파일 해시, 휴일 파일이 있으면 휴일 파일 해시 포함)"""
+        return self.calendar.versioned_id(self.compiled.ruleset_id)
+    
+    
+    def reload_rules(self, calendar=None):
+        """
+        규칙 파일을 다시 읽어 내용이 바뀌었으면 다시 컴파일
+        
+        Args:
+            calendar: 새로 읽은 BusinessCalendar (선택, 지정하면 달력도 교체)
+            
+        Returns:
+            bool: 규칙 버전(휴일 파일 포함)이 바뀌었으면 True
+        """
+        previous = self.ruleset_id
+        if calendar is not None:
+            self.calendar = calendar
+        
+        compiled = load_compiled_rules(self.rules_path)
+        if compiled.ruleset_id != self.compiled.ruleset_id:
+            self.compiled = compiled
+            self.rules = compiled.rules
+        return self.ruleset_id != previous
+    
+    
+    @staticmethod
+    def _clock_to_seconds(time_str):
+        """
+        HH:MM:SS 문자열을 자정 기준 초 단위로 변환
+        
+        Args:
+            time_str: 시간 (HH:MM:SS)
+            
+        Returns:
+            int: 초 단위 시간
+        """
+        hours, minutes, seconds = time_str.split(':')
+        return int(hours) * 3600 + int(minutes) * 60 + int(seconds)
+    
+    
+    def _work_interval(self, check_in, check_out):
         """
-        with open(rules_path, 'r', encoding='utf-8') as f:
-            self.rules = json.load(f)
+        출퇴근 시간을 초 단위 근무 구간으로 변환 (자정 넘김 보정)
+        
+        Args:
+            check_in: 출근 시간
+            check_out: 퇴근 시간
+            
+        Returns:
+            tuple: (시작 초, 종료 초)
+        """
+        start = self._clock_to_seconds(check_in)
+        end = self._clock_to_seconds(check_out)
+        
+        if end < start:
+            end += SECONDS_PER_DAY
+        
+        return start, end
     
     
     def calculate_time_difference(self, start_time, end_time):
@@ -30,15 +107,10 @@ class AttendanceCalculator:
         if not start_time or not end_time:
             return 0
         
-        fmt = '%H:%M:%S'
-        start = datetime.strptime(start_time, fmt)
-        end = datetime.strptime(end_time, fmt)
-        
         # 자정을 넘어가는 경우 처리
-        if end < start:
-            end += timedelta(days=1)
+        start, end = self._work_interval(start_time, end_time)
         
-        diff = (end - start).total_seconds() / 3600
+        diff = (end - start) / 3600
         return diff
     
     
@@ -82,12 +154,9 @@ class AttendanceCalculator:
         Returns:
             bool: 포함 여부
         """
-        fmt_check = '%H:%M:%S'
-        fmt_period = '%H:%M'
-        
-        check = datetime.strptime(check_time, fmt_check)
-        start = datetime.strptime(period_start, fmt_period)
-        end = datetime.strptime(period_end, fmt_period)
+        check = self._clock_to_seconds(check_time)
+        start = period_time_to_seconds(period_start)
+        end = period_time_to_seconds(period_end)
         
         # 자정을 넘어가는 경우 처리
         if end <= start:
@@ -137,20 +206,13 @@ class AttendanceCalculator:
         Returns:
             bool: 겹침 여부
         """
-        fmt_work = '%H:%M:%S'
-        fmt_period = '%H:%M'
-        
-        work_s = datetime.strptime(work_start, fmt_work)
-        work_e = datetime.strptime(work_end, fmt_work)
-        period_s = datetime.strptime(period_start, fmt_period)
-        period_e = datetime.strptime(period_end, fmt_period)
-        
         # 자정을 넘어가는 경우 처리
-        if work_e < work_s:
-            work_e += timedelta(days=1)
+        work_s, work_e = self._work_interval(work_start, work_end)
+        period_s = period_time_to_seconds(period_start)
+        period_e = period_time_to_seconds(period_end)
         
         if period_e <= period_s:
-            period_e += timedelta(days=1)
+            period_e += SECONDS_PER_DAY
         
         # 겹침 여부 확인
         return not (work_e <= period_s or work_s >= period_e)
@@ -173,14 +235,13 @@ class AttendanceCalculator:
         # 총 근무 시간 계산
         total_hours = self.calculate_time_difference(check_in, check_out)
         
-        # 제외 기간 시간 계산
-        excluded_hours = self.calculate_excluded_time(
-            check_in, check_out, 
-            self.rules['overtime_exclusion_periods']
+        # 제외 기간 시간 계산 (각 제외 기간은 1시간)
+        excluded_hours = self.compiled.overtime_exclusion.count_overlaps(
+            *self._work_interval(check_in, check_out)
         )
         
         # 근무 OT = 총 근무시간 - 제외시간 - 기본 8시간
-        work_ot = total_hours - excluded_hours - self.rules['work_hours']['standard_hours']
+        work_ot = total_hours - excluded_hours - self.compiled.standard_hours
         
         # 30분 단위로 반올림
         return self.round_to_half_hour(max(0, work_ot))
@@ -199,18 +260,20 @@ class AttendanceCalculator:
         """
         late_early = 0
         
-        standard_start = self.rules['work_hours']['standard_start'] + ':00'
-        standard_end = self.rules['work_hours']['standard_end'] + ':00'
+        standard_start = self.compiled.standard_start
+        standard_end = self.compiled.standard_end
         
         # 지각 계산
-        if check_in and check_in > standard_start:
-            late_hours = self.calculate_time_difference(standard_start, check_in)
-            late_early += late_hours
+        if check_in:
+            check_in_seconds = self._clock_to_seconds(check_in)
+            if check_in_seconds > standard_start:
+                late_early += (check_in_seconds - standard_start) / 3600
         
         # 조퇴 계산
-        if check_out and check_out < standard_end:
-            early_hours = self.calculate_time_difference(check_out, standard_end)
-            late_early += early_hours
+        if check_out:
+            check_out_seconds = self._clock_to_seconds(check_out)
+            if check_out_seconds < standard_end:
+                late_early += (standard_end - check_out_seconds) / 3600
         
         # 30분 단위로 반올림
         return self.round_to_half_hour(late_early)
@@ -250,33 +313,19 @@ class AttendanceCalculator:
             return 0
         
         night_hours = 0
-        night_config = self.rules['night_work_period']
-        
-        # 야간 시간대와 근무 시간이 겹치는 부분 계산
-        # 간단한 구현: 22:00 이후 또는 06:00 이전 근무 확인
-        fmt = '%H:%M:%S'
-        check_in_time = datetime.strptime(check_in, fmt)
-        check_out_time = datetime.strptime(check_out, fmt)
-        
-        # 자정을 넘어가는 경우 처리
-        if check_out_time < check_in_time:
-            check_out_time += timedelta(days=1)
         
-        night_start = datetime.strptime('22:00:00', fmt)
-        night_end = datetime.strptime('06:00:00', fmt) + timedelta(days=1)
+        # 야간 시간대와 근무 시간이 겹치는 부분 계산 (자정 넘김 보정)
+        check_in_time, check_out_time = self._work_interval(check_in, check_out)
         
         # 야간 시간대와 겹치는 부분 계산
-        overlap_start = max(check_in_time, night_start)
-        overlap_end = min(check_out_time, night_end)
+        overlap_start = max(check_in_time, self.compiled.night_start)
+        overlap_end = min(check_out_time, self.compiled.night_end)
         
         if overlap_start < overlap_end:
-            night_hours = (overlap_end - overlap_start).total_seconds() / 3600
+            night_hours = (overlap_end - overlap_start) / 3600
             
             # 제외 기간 차감
-            excluded_hours = self.calculate_excluded_time(
-                check_in, check_out,
-                night_config['exclusion_periods']
-            )
+            excluded_hours = self.compiled.night_exclusion.count_overlaps(check_in_time, check_out_time)
             night_hours = max(0, night_hours - excluded_hours)
         
         # 30분 단위로 반올림
@@ -285,7 +334,7 @@ class AttendanceCalculator:
     
     def calculate_holiday_bonus(self, date, approved_ot):
         """
-        휴일 추가 계산 (일요일이고 인정 OT가 8시간 이상인 경우)
+        휴일 추가 계산 (일요일/공휴일이고 인정 OT가 8시간 이상인 경우)
         
         Args:
             date: 날짜 (YYYY-MM-DD)
@@ -294,11 +343,9 @@ class AttendanceCalculator:
         Returns:
             float: 휴일 추가 (8시간 또는 0)
         """
-        date_obj = datetime.strptime(date, '%Y-%m-%d')
-        
-        # 일요일(6)인지 확인
-        if date_obj.weekday() == 6:  # 0=월요일, 6=일요일
-            if approved_ot >= self.rules['holiday_bonus']['min_approved_ot_hours']:
+        # 일요일 또는 공휴일/회사 휴무일인지 확인
+        if self.calendar.day_class(date) == HOLIDAY:
+            if approved_ot >= self.compiled.holiday_min_ot:
                 return 8.0
         
         return 0
@@ -319,18 +366,12 @@ class AttendanceCalculator:
         if not check_in or not check_out:
             return 0
         
-        date_obj = datetime.strptime(date, '%Y-%m-%d')
-        is_weekend = date_obj.weekday() >= 5  # 5=토요일, 6=일요일
-        
-        meal_config = self.rules['meal_allowance']
-        periods = meal_config['weekend_periods'] if is_weekend else meal_config['weekday_periods']
+        is_weekend = self.calendar.day_class(date) != WEEKDAY  # 토요일, 일요일, 휴일
         
-        count = 0
-        for period in periods:
-            if self.is_work_overlap_period(check_in, check_out, period['start'], period['end']):
-                count += 1
+        table = self.compiled.meal_weekend if is_weekend else self.compiled.meal_weekday
+        count = table.count_overlaps(*self._work_interval(check_in, check_out))
         
-        return count * meal_config['amount_per_period']
+        return int(count) * self.compiled.meal_amount
     
     
     def calculate_transport_allowance(self, check_in, check_out, date):
@@ -348,17 +389,167 @@ class AttendanceCalculator:
         if not check_in:
             return 0
         
-        date_obj = datetime.strptime(date, '%Y-%m-%d')
-        is_weekend = date_obj.weekday() >= 5
-        
-        transport_config = self.rules['transport_allowance']
+        is_weekend = self.calendar.day_class(date) != WEEKDAY
         
         if is_weekend:
             # 주말: 출근만 하면 5000원
-            return transport_config['weekend_amount']
+            return self.compiled.transport_weekend_amount
         else:
-            # 평일: 퇴근 시간이 22:00 이후면 5000원
-            if check_out and check_out >= '22:00:00':
-                return transport_config['weekday_amount']
+            # 평일: 퇴근 시간이 기준 시간(22:00) 이후면 5000원
+            if check_out and self._clock_to_seconds(check_out) >= self.compiled.transport_cutoff:
+                return self.compiled.transport_weekday_amount
         
         return 0
+    
+    
+    def calculate_all(self, attendance_df):
+        """
+        일별 출퇴근 데이터 전체의 근태/수당 항목을 컬럼 단위로 일괄 계산
+        (개별 calculate_* 메서드와 동일한 결과)
+        
+        Args:
+            attendance_df: date, check_in, check_out, card_number 컬럼을 가진 DataFrame
+                           (문자열 컬럼 또는 daily_records의 컴팩트 정수 컬럼)
+            
+        Returns:
+            DataFrame: 입력 컬럼에 work_ot, late_early, approved_ot, night_work,
+                       holiday_bonus, meal_allowance, transport_allowance 컬럼을 추가한 데이터프레임
+                       (컴팩트 입력이면 COMPACT_METRIC_DTYPES 타입)
+        """
+        result = attendance_df.copy()
+        compact = is_compact(result)
+        
+        # 출퇴근 시간을 초 단위 정수 배열로 변환 (누락은 -1), 날짜는 1970-01-01 기준 일수
+        if compact:
+            check_in = result['check_in'].to_numpy(dtype='int64')
+            check_out = result['check_out'].to_numpy(dtype='int64')
+            days = result['date'].to_numpy(dtype='int64')
+        else:
+            check_in = self._time_to_seconds(result['check_in'])
+            check_out = self._time_to_seconds(result['check_out'])
+            days = pd.to_datetime(result['date'], format='%Y-%m-%d').to_numpy().astype('datetime64[D]').astype('int64')
+        
+        # 요일 구분 (0=평일, 1=토요일, 2=일요일/휴일): 기간 달력 배열에서 한 번에 조회
+        day_class = self.calendar.day_classes(days)
+        
+        metrics = self._calculate_metrics(check_in, check_out, day_class)
+        for column, values in zip(METRIC_COLUMNS, metrics):
+            result[column] = values
+        
+        if compact:
+            return result.astype(COMPACT_METRIC_DTYPES)
+        
+        result['meal_allowance'] = result['meal_allowance'].astype('int64')
+        result['transport_allowance'] = result['transport_allowance'].astype('int64')
+        
+        return result
+    
+    
+    def _calculate_metrics(self, check_in, check_out, day_class):
+        """
+        출퇴근 초 배열과 요일 구분 배열로 근태/수당 항목 계산
+        
+        Args:
+            check_in: 출근 시간 배열 (자정 기준 초, 누락은 -1)
+            check_out: 퇴근 시간 배열 (자정 기준 초, 누락은 -1)
+            day_class: 요일 구분 배열 (0=평일, 1=토요일, 2=일요일/휴일)
+            
+        Returns:
+            tuple: METRIC_COLUMNS 순서의 배열
+        """
+        has_in = check_in >= 0
+        has_out = check_out >= 0
+        has_both = has_in & has_out
+        is_weekend = day_class != WEEKDAY
+        
+        # 자정을 넘어가는 경우 처리
+        check_out_wrapped = np.where(check_out < check_in, check_out + SECONDS_PER_DAY, check_out)
+        
+        # 근무 OT
+        total_hours = (check_out_wrapped - check_in) / 3600
+        excluded_hours = self.compiled.overtime_exclusion.count_overlaps(check_in, check_out_wrapped)
+        work_ot = total_hours - excluded_hours - self.compiled.standard_hours
+        work_ot = np.where(has_both, self._round_to_half_hour_array(np.maximum(0, work_ot)), 0.0)
+        
+        # 지각/조퇴
+        standard_start = self.compiled.standard_start
+        standard_end = self.compiled.standard_end
+        late_hours = np.where(has_in & (check_in > standard_start), (check_in - standard_start) / 3600, 0.0)
+        early_hours = np.where(has_out & (check_out < standard_end), (standard_end - check_out) / 3600, 0.0)
+        late_early = self._round_to_half_hour_array(late_hours + early_hours)
+        
+        # 인정 OT
+        approved_ot = np.where(work_ot > 0, np.maximum(0, work_ot - late_early), 0.0)
+        
+        # 야간 근무 (22:00~익일 06:00, 제외 기간 제외)
+        overlap_start = np.maximum(check_in, self.compiled.night_start)
+        overlap_end = np.minimum(check_out_wrapped, self.compiled.night_end)
+        night_excluded = self.compiled.night_exclusion.count_overlaps(check_in, check_out_wrapped)
+        night_hours = np.maximum(0, (overlap_end - overlap_start) / 3600 - night_excluded)
+        night_work = np.where(
+            has_both & (overlap_start < overlap_end),
+            self._round_to_half_hour_array(night_hours),
+            0.0
+        )
+        
+        # 휴일 추가 (일요일/공휴일이고 인정 OT가 기준 이상)
+        holiday_bonus = np.where((day_class == HOLIDAY) & (approved_ot >= self.compiled.holiday_min_ot), 8.0, 0.0)
+        
+        # 식대
+        meal_count = np.where(
+            is_weekend,
+            self.compiled.meal_weekend.count_overlaps(check_in, check_out_wrapped),
+            self.compiled.meal_weekday.count_overlaps(check_in, check_out_wrapped)
+        )
+        meal_allowance = np.where(has_both, meal_count * self.compiled.meal_amount, 0)
+        
+        # 교통비 (주말: 출근만 하면 지급, 평일: 기준 시간 이후 퇴근 시 지급)
+        transport_allowance = np.where(
+            has_in & is_weekend,
+            self.compiled.transport_weekend_amount,
+            np.where(
+                has_in & has_out & (check_out >= self.compiled.transport_cutoff),
+                self.compiled.transport_weekday_amount,
+                0
+            )
+        )
+        
+        return work_ot, late_early, approved_ot, night_work, holiday_bonus, meal_allowance, transport_allowance
+    
+    
+    @staticmethod
+    def _time_to_seconds(times):
+        """
+        HH:MM:SS 문자열 Series를 자정 기준 초 단위 정수 배열로 변환
+        
+        Args:
+            times: 시간 문자열 Series (누락값은 None/NaN/빈 문자열)
+            
+        Returns:
+            ndarray: 초 단위 정수 배열 (누락은 -1)
+        """
+        valid = (times.notna() & (times.astype(str) != '')).to_numpy()
+        filled = times.where(valid, '00:00:00').astype(str)
+        
+        hours = filled.str.slice(0, 2).astype('int64').to_numpy()
+        minutes = filled.str.slice(3, 5).astype('int64').to_numpy()
+        seconds = filled.str.slice(6, 8).astype('int64').to_numpy()
+        
+        return np.where(valid, hours * 3600 + minutes * 60 + seconds, -1)
+    
+    
+    @staticmethod
+    def _round_to_half_hour_array(hours):
+        """
+        round_to_half_hour의 배열 버전 (30분 이상이면 0.5, 미만이면 0)
+        
+        Args:
+            hours: 시간 배열
+            
+        Returns:
+            ndarray: 반올림된 시간 배열
+        """
+        integer_part = np.trunc(hours)
+        minutes = (hours - integer_part) * 60
+        rounded = np.where(minutes >= 30, integer_part + 0.5, integer_part)
+        return np.where(hours <= 0, 0.0, rounded)
@@ -0,0 +1,177 @@
+import io
+import json
+import os
+import pickle
+
+import numpy as np
+
+
+# 저장소 디렉토리 안의 상태 파일 / 적용 중인 변경 기록 파일
+_STATE_FILE = 'state.json'
+_PENDING_FILE = 'pending.pkl'
+
+
+class ColumnStore:
+    """
+    1차원 배열 컬럼을 컬럼별 .npy 파일로 보관하는 디렉토리 저장소
+    
+    컬럼은 읽기 전용 memory map으로 열어 필요한 부분만 읽는다. 갱신할 때는 바뀐 위치의 값과
+    꼬리(처음 달라지는 위치부터 끝까지)만 기존 파일에 덮어쓰고, 길이가 늘면 .npy 헤더의 여유 공간을
+    제자리에서 고친다. 갱신 내용과 새 상태는 먼저 변경 기록 파일에 저장한 뒤 적용하므로,
+    적용 중에 중단되어도 다음에 상태를 읽을 때 같은 변경을 다시 적용해 컬럼과 상태가 어긋나지 않는다.
+    """
+    
+    def __init__(self, directory):
+        """
+        초기화
+        
+        Args:
+            directory: 저장소 디렉토리 경로
+        """
+        self.directory = directory
+        self.state_path = os.path.join(directory, _STATE_FILE)
+        self.pending_path = os.path.join(directory, _PENDING_FILE)
+    
+    
+    def _column_path(self, name):
+        """컬럼 파일 경로"""
+        return os.path.join(self.directory, f'{name}.npy')
+    
+    
+    def read_state(self):
+        """
+        저장된 상태 조회 (적용이 끝나지 않은 변경 기록이 있으면 먼저 마저 적용)
+        
+        Returns:
+            dict: 상태 (저장소가 없거나 읽을 수 없으면 None)
+        """
+        try:
+            if os.path.exists(self.pending_path):
+                with open(self.pending_path, 'rb') as f:
+                    self._apply(pickle.load(f))
+            
+            with open(self.state_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError, pickle.UnpicklingError, EOFError):
+            return None
+    
+    
+    def column(self, name):
+        """
+        컬럼 배열 조회
+        
+        Args:
+            name: 컬럼 이름
+            
+        Returns:
+            ndarray: 읽기 전용 memory map (빈 컬럼이면 빈 배열)
+        """
+        path = self._column_path(name)
+        
+        # 길이 0인 파일은 memory map으로 열 수 없음
+        with open(path, 'rb') as f:
+            version = np.lib.format.read_magic(f)
+            shape, _, dtype = _read_header(f, version)
+        if shape[0] == 0:
+            return np.zeros(0, dtype=dtype)
+        
+        return np.load(path, mmap_mode='r')
+    
+    
+    def commit(self, state, updates):
+        """
+        컬럼 갱신과 새 상태를 함께 저장
+        
+        Args:
+            state: JSON으로 저장할 상태 딕셔너리
+            updates: {컬럼 이름: (바뀐 위치 배열, 그 위치의 새 값 배열, 꼬리 시작 위치, 꼬리 값 배열)}
+                     (갱신 후 컬럼 길이는 꼬리 시작 위치 + 꼬리 길이, 없는 컬럼은 꼬리 시작 위치가 0)
+        """
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+        
+        # 변경 기록을 임시 파일에 끝까지 쓴 뒤 교체 (변경 기록이 있으면 항상 완전한 기록)
+        temp_path = self.pending_path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            pickle.dump({'state': state, 'updates': updates}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, self.pending_path)
+        
+        self._apply({'state': state, 'updates': updates})
+    
+    
+    def _apply(self, pending):
+        """변경 기록을 컬럼 파일과 상태 파일에 반영한 뒤 변경 기록 삭제 (여러 번 적용해도 결과가 같음)"""
+        for name, (positions, values, start, tail) in pending['updates'].items():
+            _write_column(self._column_path(name), positions, values, start, tail)
+        
+        temp_path = self.state_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(pending['state'], f, ensure_ascii=False)
+        os.replace(temp_path, self.state_path)
+        
+        os.remove(self.pending_path)
+
+
+def _read_header(f, version):
+    """.npy 헤더 (shape, fortran_order, dtype) 읽기"""
+    if version == (1, 0):
+        return np.lib.format.read_array_header_1_0(f)
+    return np.lib.format.read_array_header_2_0(f)
+
+
+def _header_bytes(dtype, length):
+    """길이가 length인 1차원 배열의 .npy 1.0 헤더 바이트 (길이 자릿수 여유 공간 포함)"""
+    buffer = io.BytesIO()
+    np.lib.format.write_array_header_1_0(buffer, {
+        'descr': np.lib.format.dtype_to_descr(dtype),
+        'fortran_order': False,
+        'shape': (length,)
+    })
+    return buffer.getvalue()
+
+
+def _write_column(path, positions, values, start, tail):
+    """
+    컬럼 파일의 지정 위치 값과 꼬리를 덮어씀
+    
+    기존 파일의 타입에 꼬리를 그대로 담을 수 있고 헤더를 같은 크기로 고칠 수 있으면 제자리에서 고치고,
+    아니면(처음부터 다시 쓰거나 카드번호 폭이 넓어진 경우) 전체를 임시 파일에 쓴 뒤 교체한다.
+    """
+    length = start + len(tail)
+    
+    # 앞부분을 유지하는 갱신은 제자리에서 고칠 수 있는지 먼저 확인 (처음부터 다시 쓰면 기존 파일은 읽지 않음)
+    if start > 0:
+        with open(path, 'r+b') as f:
+            version = np.lib.format.read_magic(f)
+            _, _, dtype = _read_header(f, version)
+            data_offset = f.tell()
+            
+            header = _header_bytes(dtype, length)
+            in_place = np.promote_types(dtype, tail.dtype) == dtype and len(header) == data_offset
+            if in_place:
+                f.seek(0)
+                f.write(header)
+                f.truncate(data_offset + length * dtype.itemsize)
+        
+        if in_place:
+            column = np.lib.format.open_memmap(path, mode='r+')
+            column[positions] = values
+            column[start:] = tail
+            column.flush()
+            del column
+            return
+        
+        previous = np.load(path, mmap_mode='r')
+        column = np.empty(length, dtype=np.promote_types(previous.dtype, tail.dtype))
+        column[:start] = previous[:start]
+        del previous
+    else:
+        column = np.empty(length, dtype=tail.dtype)
+    
+    column[positions] = values
+    column[start:] = tail
+    
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        np.save(f, column)
+    os.replace(temp_path, path)
@@ -0,0 +1,149 @@
+import hashlib
+import json
+
+import numpy as np
+
+
+SECONDS_PER_DAY = 24 * 3600
+MINUTES_PER_DAY = 24 * 60
+
+# 48시간 분 단위 축 (자정을 넘는 근무/기간 포함)
+AXIS_MINUTES = 2 * MINUTES_PER_DAY
+
+# 규칙 파일 해시별 컴파일 결과 캐시
+_compiled_cache = {}
+
+
+def period_time_to_seconds(period_time):
+    """
+    HH:MM 형식의 규칙 시간을 자정 기준 초 단위로 변환
+    
+    Args:
+        period_time: 시간 (HH:MM)
+        
+    Returns:
+        int: 초 단위 시간
+    """
+    hours, minutes = period_time.split(':')
+    return int(hours) * 3600 + int(minutes) * 60
+
+
+class IntervalTable:
+    """
+    기간 리스트를 48시간 분 단위 누적 배열로 컴파일한 조회 테이블
+    
+    근무 구간 [start, end)와 겹치는 기간 수 = (end 이전에 시작한 기간 수) - (start 이전에 끝난 기간 수)
+    """
+    
+    def __init__(self, periods):
+        """
+        초기화
+        
+        Args:
+            periods: {'start': 'HH:MM', 'end': 'HH:MM'} 리스트
+        """
+        starts = []
+        ends = []
+        
+        for period in periods:
+            start = period_time_to_seconds(period['start']) // 60
+            end = period_time_to_seconds(period['end']) // 60
+            
+            # 자정을 넘어가는 경우 처리
+            if end <= start:
+                end += MINUTES_PER_DAY
+            
+            starts.append(start)
+            ends.append(end)
+        
+        # index m+1 = 분 m 이하에 시작(종료)한 기간 수
+        self.starts_upto = self._prefix_counts(starts)
+        self.ends_upto = self._prefix_counts(ends)
+        self.size = len(starts)
+    
+    
+    @staticmethod
+    def _prefix_counts(minutes):
+        """분 단위 시각 리스트를 누적 개수 배열로 변환 (읽기 전용)"""
+        counts = np.bincount(np.asarray(minutes, dtype='int64'), minlength=AXIS_MINUTES)
+        prefix = np.concatenate(([0], np.cumsum(counts[:AXIS_MINUTES]))).astype('int64')
+        prefix.setflags(write=False)
+        return prefix
+    
+    
+    def count_overlaps(self, work_start, work_end):
+        """
+        근무 구간과 겹치는 기간 개수 (스칼라/배열 모두 지원)
+        
+        Args:
+            work_start: 근무 시작 (자정 기준 초)
+            work_end: 근무 종료 (자정 기준 초, 자정 넘김 보정 완료)
+            
+        Returns:
+            int 또는 ndarray: 겹치는 기간 개수
+        """
+        started_before_end = self.starts_upto[(work_end - 1) // 60 + 1]
+        ended_before_start = self.ends_upto[work_start // 60 + 1]
+        return started_before_end - ended_before_start
+
+
+class CompiledRules:
+    """규칙 JSON을 계산용 정수 시간/조회 테이블로 컴파일한 불변 객체"""
+    
+    def __init__(self, rules, ruleset_id):
+        """
+        초기화
+        
+        Args:
+            rules: 규칙 딕셔너리
+            ruleset_id: 규칙 파일 해시
+        """
+        self.rules = rules
+        self.ruleset_id = ruleset_id
+        
+        work_hours = rules['work_hours']
+        self.standard_start = period_time_to_seconds(work_hours['standard_start'])
+        self.standard_end = period_time_to_seconds(work_hours['standard_end'])
+        self.standard_hours = work_hours['standard_hours']
+        
+        night_config = rules['night_work_period']
+        self.night_start = period_time_to_seconds(night_config['start'])
+        self.night_end = period_time_to_seconds(night_config['end'])
+        if self.night_end <= self.night_start:
+            self.night_end += SECONDS_PER_DAY
+        
+        meal_config = rules['meal_allowance']
+        self.overtime_exclusion = IntervalTable(rules['overtime_exclusion_periods'])
+        self.night_exclusion = IntervalTable(night_config['exclusion_periods'])
+        self.meal_weekday = IntervalTable(meal_config['weekday_periods'])
+        self.meal_weekend = IntervalTable(meal_config['weekend_periods'])
+        self.meal_amount = meal_config['amount_per_period']
+        
+        transport_config = rules['transport_allowance']
+        self.transport_cutoff = period_time_to_seconds(transport_config['weekday_cutoff_time'])
+        self.transport_weekday_amount = transport_config['weekday_amount']
+        self.transport_weekend_amount = transport_config['weekend_amount']
+        
+        self.holiday_min_ot = rules['holiday_bonus']['min_approved_ot_hours']
+
+
+def load_compiled_rules(rules_path):
+    """
+    규칙 파일을 컴파일 (파일 해시가 같으면 캐시된 결과 재사용)
+    
+    Args:
+        rules_path: 규칙 JSON 파일 경로
+        
+    Returns:
+        CompiledRules: 컴파일된 규칙
+    """
+    with open(rules_path, 'rb') as f:
+        content = f.read()
+    
+    ruleset_id = hashlib.sha256(content).hexdigest()
+    
+    if ruleset_id not in _compiled_cache:
+        rules = json.loads(content.decode('utf-8'))
+        _compiled_cache[ruleset_id] = CompiledRules(rules, ruleset_id)
+    
+    return _compiled_cache[ruleset_id]
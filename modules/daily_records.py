@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+
+
+# 컴팩트 일별 데이터 컬럼 타입
+#   date: 1970-01-01 기준 일수, check_in/check_out: 자정 기준 초 (누락은 -1),
+#   card_number: 범주형 (정수 코드 + 카드번호 문자열 목록)
+COMPACT_KEY_DTYPES = {
+    'date': 'int32',
+    'check_in': 'int32',
+    'check_out': 'int32',
+    'punch_count': 'int32'
+}
+
+# calculate_all 결과 컬럼 타입 (컴팩트 입력일 때)
+COMPACT_METRIC_DTYPES = {
+    'work_ot': 'float32',
+    'late_early': 'float32',
+    'approved_ot': 'float32',
+    'night_work': 'float32',
+    'holiday_bonus': 'float32',
+    'meal_allowance': 'int32',
+    'transport_allowance': 'int32'
+}
+
+
+def is_compact(daily_df):
+    """
+    일별 데이터가 컴팩트 표현(정수 날짜/시간)인지 여부
+    
+    Args:
+        daily_df: date 컬럼을 가진 DataFrame
+        
+    Returns:
+        bool: date 컬럼이 정수형이면 True
+    """
+    return pd.api.types.is_integer_dtype(daily_df['date'])
+
+
+def card_categorical(cards):
+    """
+    카드번호 배열(바이트/문자열)을 범주형으로 변환
+    
+    Args:
+        cards: 카드번호 배열
+        
+    Returns:
+        Categorical: 정수 코드 + 정렬된 카드번호 문자열 범주
+    """
+    codes, categories = pd.factorize(np.asarray(cards), sort=True)
+    categories = np.asarray(categories)
+    if categories.dtype.kind == 'S':
+        categories = categories.astype(str)
+    return pd.Categorical.from_codes(codes, categories=pd.Index(categories.astype(object)))
+
+
+def compact_frame(date, check_in, check_out, card, punch_count):
+    """
+    컴팩트 일별 출퇴근 데이터프레임 생성
+    
+    Args:
+        date: 1970-01-01 기준 일수 배열
+        check_in: 출근 시간 배열 (자정 기준 초, 누락은 -1)
+        check_out: 퇴근 시간 배열 (자정 기준 초, 누락은 -1)
+        card: 카드번호 배열
+        punch_count: 기록 수 배열
+        
+    Returns:
+        DataFrame: date, check_in, check_out, card_number, punch_count 컬럼
+    """
+    return pd.DataFrame({
+        'date': np.asarray(date, dtype='int32'),
+        'check_in': np.asarray(check_in, dtype='int32'),
+        'check_out': np.asarray(check_out, dtype='int32'),
+        'card_number': card_categorical(card),
+        'punch_count': np.asarray(punch_count, dtype='int32')
+    })
+
+
+def to_display(daily_df):
+    """
+    리포트 출력용으로 날짜/시간을 문자열로 변환 (컴팩트 표현이 아니면 그대로 반환)
+    
+    Args:
+        daily_df: 일별 근태 데이터 DataFrame
+        
+    Returns:
+        DataFrame: date(YYYY-MM-DD), check_in/check_out(HH:MM:SS 또는 None) 문자열 컬럼
+    """
+    if not is_compact(daily_df):
+        return daily_df
+    
+    display = daily_df.copy()
+    display['date'] = format_dates(daily_df['date'].to_numpy())
+    for column in ('check_in', 'check_out'):
+        if column in display.columns:
+            display[column] = format_seconds(daily_df[column].to_numpy())
+    return display
+
+
+def format_dates(days):
+    """
+    일수 배열을 YYYY-MM-DD 문자열 배열로 변환
+    
+    Args:
+        days: 1970-01-01 기준 일수 배열
+        
+    Returns:
+        ndarray: 날짜 문자열 배열
+    """
+    return np.asarray(days, dtype='int64').astype('datetime64[D]').astype(str).astype(object)
+
+
+def format_seconds(seconds):
+    """
+    자정 기준 초 배열을 HH:MM:SS 문자열 배열로 변환 (음수는 None)
+    
+    Args:
+        seconds: 초 배열
+        
+    Returns:
+        ndarray: 시간 문자열 배열
+    """
+    seconds = pd.Series(np.asarray(seconds, dtype='int64'))
+    missing = seconds < 0
+    clipped = seconds.clip(lower=0)
+    
+    text = (
+        (clipped // 3600).astype(str).str.zfill(2) + ':'
+        + (clipped // 60 % 60).astype(str).str.zfill(2) + ':'
+        + (clipped % 60).astype(str).str.zfill(2)
+    )
+    return text.astype(object).where(~missing, None).to_numpy()
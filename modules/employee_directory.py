@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+
+
+# 일별 데이터에 붙이는 사원 정보 컬럼
+DIRECTORY_COLUMNS = ['사원명', '부서명', '부서코드', 'location']
+
+# 카드번호가 비어 있는 행의 키
+MISSING_CARD_KEY = -1
+
+# 숫자가 아닌 카드번호의 문자열 해시 키 비트 수 ((카드 키, 일수) 결합 키가 int64 범위를 넘지 않도록 제한)
+_TEXT_KEY_BITS = 40
+
+
+def card_keys(cards):
+    """
+    카드번호(문자열/숫자)를 정수 키로 변환 ('0002', '2', 2 → 2, 빈 값은 MISSING_CARD_KEY)
+    
+    숫자가 아닌 카드번호(영문/기호 포함)는 앞의 0을 뗀 문자열의 고정 해시로 -2 이하의 키를 만들어
+    숫자 카드번호 키와 겹치지 않게 구분한다 ('0A12'와 'A12'는 같은 키, 실행/프로세스가 달라도 같은 값).
+    
+    Args:
+        cards: 카드번호 Series 또는 배열 (범주형이면 범주별로 한 번만 변환)
+        
+    Returns:
+        ndarray: int64 카드 키 배열
+    """
+    cards = pd.Series(cards)
+    if isinstance(cards.dtype, pd.CategoricalDtype):
+        category_keys = np.append(card_keys(cards.cat.categories), MISSING_CARD_KEY)
+        return category_keys[cards.cat.codes.to_numpy()]
+    
+    missing = cards.isna().to_numpy()
+    if cards.dtype == object or pd.api.types.is_string_dtype(cards):
+        cards = cards.astype(str).str.strip()
+        missing = missing | (cards == '').to_numpy()
+    numbers = pd.to_numeric(cards, errors='coerce')
+    keys = numbers.fillna(MISSING_CARD_KEY).astype('int64').to_numpy(copy=True)
+    
+    # 숫자로 변환되지 않는 카드번호는 문자열 해시 키
+    text = numbers.isna().to_numpy() & ~missing
+    if text.any():
+        normalized = cards[text].astype(str).str.lstrip('0').to_numpy(dtype=object)
+        hashes = pd.util.hash_array(normalized) >> np.uint64(64 - _TEXT_KEY_BITS)
+        keys[text] = -2 - hashes.astype('int64')
+    
+    return keys
+
+
+class EmployeeDirectory:
+    """
+    카드번호 정수 키로 색인한 사원 정보
+    
+    사원명/부서명/위치는 범주형(categorical)으로 보관하며, 카드 키 조회는 해시 색인으로 O(1)
+    """
+    
+    def __init__(self, employee_df):
+        """
+        초기화
+        
+        Args:
+            employee_df: DataParser.parse_employee_info 결과 DataFrame
+        """
+        frame = pd.DataFrame({'card_key': card_keys(employee_df['카드번호'])})
+        
+        for column in DIRECTORY_COLUMNS:
+            if column in employee_df.columns:
+                frame[column] = pd.Categorical(employee_df[column].astype(str).to_numpy())
+            else:
+                frame[column] = pd.Categorical([None] * len(frame))
+        
+        # 같은 카드번호가 여러 번 있으면 첫 번째 사원 정보 사용
+        frame = frame[frame['card_key'] != MISSING_CARD_KEY].drop_duplicates('card_key')
+        self.frame = frame.set_index('card_key')
+    
+    
+    @staticmethod
+    def coerce(employee_info):
+        """
+        사원 정보 DataFrame 또는 EmployeeDirectory를 EmployeeDirectory로 변환
+        
+        Args:
+            employee_info: DataFrame 또는 EmployeeDirectory
+            
+        Returns:
+            EmployeeDirectory: 사원 디렉토리
+        """
+        if isinstance(employee_info, EmployeeDirectory):
+            return employee_info
+        return EmployeeDirectory(employee_info)
+    
+    
+    def __len__(self):
+        return len(self.frame)
+    
+    
+    def lookup(self, card):
+        """
+        카드번호로 사원 정보 조회
+        
+        Args:
+            card: 카드번호 (문자열 또는 정수)
+            
+        Returns:
+            dict: 사원 정보 (없으면 None)
+        """
+        key = int(card_keys([card])[0])
+        if key not in self.frame.index:
+            return None
+        return self.frame.loc[key].to_dict()
+    
+    
+    def enrich(self, daily_data):
+        """
+        일별 데이터에 카드 키와 사원 정보 컬럼을 한 번에 추가 (이미 추가된 경우 그대로 반환)
+        
+        Args:
+            daily_data: card_number 컬럼을 가진 일별 근태 DataFrame
+            
+        Returns:
+            DataFrame: card_key, 사원명, 부서명, 부서코드, location 컬럼이 추가된 DataFrame
+        """
+        if 'card_key' in daily_data.columns and all(column in daily_data.columns for column in DIRECTORY_COLUMNS):
+            return daily_data
+        
+        enriched = daily_data.drop(columns=[c for c in DIRECTORY_COLUMNS if c in daily_data.columns])
+        enriched['card_key'] = card_keys(enriched['card_number'])
+        
+        # 해시 색인으로 위치 조회 (없으면 -1 → 끝에 붙인 결측 코드 선택)
+        positions = self.frame.index.get_indexer(enriched['card_key'])
+        
+        for column in DIRECTORY_COLUMNS:
+            source = self.frame[column]
+            codes = np.append(source.cat.codes.to_numpy(), -1)[positions]
+            enriched[column] = pd.Categorical.from_codes(codes, dtype=source.dtype)
+        
+        return enriched
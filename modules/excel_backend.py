@@ -0,0 +1,160 @@
+import re
+
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Alignment, Border, Side, PatternFill, NamedStyle
+from openpyxl.utils import get_column_letter
+
+from modules.report_backends import REPORT_FORMATS, ReportBackend
+
+
+# 공용 셀 스타일 (워크북마다 한 번만 등록)
+HEADER_STYLE = 'report_header'
+BODY_STYLE = 'report_body'
+
+# 엑셀에서 두 칸 폭으로 표시되는 문자 (한글, 한자, 전각 문자)
+# (raw 문자열이 아니어야 pyarrow 문자열 컬럼의 정규식 엔진에서도 같은 범위로 해석됨)
+WIDE_CHAR_PATTERN = '[\u1100-\u115f\u2e80-\u303e\u3041-\u33ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7a3\uf900-\ufaff\ufe30-\ufe4f\uff00-\uff60\uffe0-\uffe6]'
+
+
+class ExcelBackend(ReportBackend):
+    """스타일이 적용된 엑셀 리포트 (sheet_by 값마다 시트 하나, write_only 스트리밍 기록)"""
+    
+    extension = REPORT_FORMATS['xlsx']
+    
+    def write(self, data, output_path, sheet_by, drop_sheet_column=False):
+        """
+        리포트 기록
+        
+        Args:
+            data: 리포트 레이아웃 DataFrame
+            output_path: 출력 파일 경로
+            sheet_by: 시트를 나눌 컬럼 (값이 시트명)
+            drop_sheet_column: 시트에서 sheet_by 컬럼 제외 여부
+        """
+        wb = ExcelBackend._create_workbook()
+        
+        # 셀 표시 폭은 전체 레이아웃에서 한 번 계산하고 시트별 컬럼 최대값만 집계
+        max_lengths = ExcelBackend._display_lengths(data).groupby(data[sheet_by], sort=False, observed=True).max()
+        
+        # 시트별로 미리 그룹화된 파티션 순회
+        for key, sheet_data in data.groupby(sheet_by, sort=False, observed=True):
+            # 값을 문자열로 변환하고 유효한 시트명 생성
+            title = str(key).strip()[:31]
+            if drop_sheet_column:
+                sheet_data = sheet_data.drop(columns=[sheet_by])
+            
+            # 데이터 작성 (헤더/본문 공용 스타일, 행 단위 스트리밍)
+            widths = ExcelBackend._column_widths(sheet_data.columns, max_lengths.loc[key])
+            ExcelBackend._write_sheet(wb, title, sheet_data, widths)
+        
+        # 데이터가 없어도 빈 시트 하나는 유지
+        if not wb.worksheets:
+            wb.create_sheet()
+        
+        wb.save(output_path)
+    
+    
+    @staticmethod
+    def _create_workbook():
+        """
+        스트리밍(write_only) 워크북 생성 및 헤더/본문 스타일 등록
+        
+        Returns:
+            Workbook: write_only 워크북
+        """
+        wb = Workbook(write_only=True)
+        
+        border = Border(
+            left=Side(style='thin'),
+            right=Side(style='thin'),
+            top=Side(style='thin'),
+            bottom=Side(style='thin')
+        )
+        alignment = Alignment(horizontal='center', vertical='center')
+        
+        wb.add_named_style(NamedStyle(
+            name=HEADER_STYLE,
+            font=Font(bold=True, size=11),
+            fill=PatternFill(start_color='D3D3D3', end_color='D3D3D3', fill_type='solid'),
+            alignment=alignment,
+            border=border
+        ))
+        wb.add_named_style(NamedStyle(
+            name=BODY_STYLE,
+            alignment=alignment,
+            border=border
+        ))
+        
+        return wb
+    
+    
+    @staticmethod
+    def _display_lengths(data):
+        """
+        셀별 표시 폭 (전각 문자는 2칸, 컬럼마다 문자열 연산 한 번)
+        
+        Args:
+            data: 리포트 레이아웃 DataFrame
+            
+        Returns:
+            DataFrame: data와 같은 행/컬럼의 정수 표시 폭
+        """
+        lengths = {}
+        for column in data.columns:
+            values = data[column].astype(str)
+            lengths[column] = (values.str.len() + values.str.count(WIDE_CHAR_PATTERN)).to_numpy(dtype='int64')
+        return pd.DataFrame(lengths, index=data.index, columns=data.columns)
+    
+    
+    @staticmethod
+    def _column_widths(columns, max_lengths):
+        """
+        컬럼별 표시 폭으로 열 너비 계산 (헤더와 본문 최대 표시 폭 중 큰 값)
+        
+        Args:
+            columns: 기록할 컬럼 목록
+            max_lengths: 컬럼별 본문 최대 표시 폭 Series
+            
+        Returns:
+            list: 열 너비 리스트
+        """
+        widths = []
+        
+        for column in columns:
+            header = str(column)
+            max_length = max(len(header) + len(re.findall(WIDE_CHAR_PATTERN, header)), int(max_lengths[column]))
+            widths.append(min(max_length + 2, 50))
+        
+        return widths
+    
+    
+    @staticmethod
+    def _write_sheet(wb, title, data, widths):
+        """
+        DataFrame을 시트에 행 단위로 스트리밍 기록
+        
+        Args:
+            wb: write_only 워크북
+            title: 시트명
+            data: 기록할 DataFrame (헤더 포함)
+            widths: 열 너비 리스트
+        """
+        ws = wb.create_sheet(title=title)
+        
+        # 열 너비 자동 조정 (write_only 시트는 행 기록 전에 설정해야 함)
+        for c_idx, width in enumerate(widths, 1):
+            ws.column_dimensions[get_column_letter(c_idx)].width = width
+        
+        def styled_row(values, style):
+            cells = []
+            for value in values:
+                cell = WriteOnlyCell(ws, value=value)
+                cell.style = style
+                cells.append(cell)
+            return cells
+        
+        ws.append(styled_row([str(column) for column in data.columns], HEADER_STYLE))
+        for row in data.itertuples(index=False, name=None):
+            ws.append(styled_row(row, BODY_STYLE))
@@ -0,0 +1,142 @@
+import hashlib
+import os
+import pickle
+
+import pandas as pd
+
+
+# 파싱 로직이 바뀌면 올려서 기존 캐시 무효화
+CACHE_VERSION = 1
+
+
+class FrameCache:
+    """
+    입력 파일에서 파싱한 DataFrame을 바이너리(pickle, 컬럼 블록 단위)로 저장하는 캐시
+    
+    파일 경로 + 수정 시각 + 크기를 키로 사용하며, 원본 파일이 바뀌면 자동으로 다시 파싱한다.
+    pickle은 pandas 내부 구조에 의존하므로 저장할 때의 pandas 버전이 다르면 다시 파싱한다.
+    """
+    
+    def __init__(self, cache_dir):
+        """
+        초기화
+        
+        Args:
+            cache_dir: 캐시 저장 디렉토리
+        """
+        self.cache_dir = cache_dir
+    
+    
+    @staticmethod
+    def fingerprint(file_path):
+        """
+        원본 파일 식별값
+        
+        Args:
+            file_path: 원본 파일 경로
+            
+        Returns:
+            tuple: (절대 경로, 수정 시각(ns), 크기)
+        """
+        stat = os.stat(file_path)
+        return os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size
+    
+    
+    def _cache_path(self, file_path, namespace):
+        """캐시 파일 경로 (원본 경로와 용도별)"""
+        key = f'{namespace}:{os.path.abspath(file_path)}'.encode('utf-8')
+        return os.path.join(self.cache_dir, f'{namespace}_{hashlib.sha1(key).hexdigest()[:16]}.pkl')
+    
+    
+    def get(self, file_path, namespace):
+        """
+        캐시된 DataFrame 조회
+        
+        Args:
+            file_path: 원본 파일 경로
+            namespace: 용도 구분 (예: 'employee_info')
+            
+        Returns:
+            DataFrame: 캐시가 유효하면 DataFrame, 아니면 None
+        """
+        cache_path = self._cache_path(file_path, namespace)
+        if not os.path.exists(cache_path):
+            return None
+        
+        # 손상되었거나 다른 pandas 버전으로 저장되어 읽을 수 없는 캐시는 지우고 다시 파싱
+        try:
+            with open(cache_path, 'rb') as f:
+                entry = pickle.load(f)
+        except Exception:
+            self._discard(cache_path)
+            return None
+        
+        stale = (
+            not isinstance(entry, dict)
+            or entry.get('version') != CACHE_VERSION
+            or entry.get('pandas_version') != pd.__version__
+        )
+        if stale:
+            self._discard(cache_path)
+            return None
+        
+        if entry.get('fingerprint') != self.fingerprint(file_path):
+            return None
+        
+        return entry['frame']
+    
+    
+    @staticmethod
+    def _discard(cache_path):
+        """사용할 수 없는 캐시 파일 삭제 (이미 없거나 지울 수 없으면 무시)"""
+        try:
+            os.remove(cache_path)
+        except OSError:
+            pass
+    
+    
+    def put(self, file_path, namespace, frame):
+        """
+        DataFrame을 캐시에 저장
+        
+        Args:
+            file_path: 원본 파일 경로
+            namespace: 용도 구분
+            frame: 저장할 DataFrame
+        """
+        if not os.path.exists(self.cache_dir):
+            os.makedirs(self.cache_dir)
+        
+        entry = {
+            'version': CACHE_VERSION,
+            'pandas_version': pd.__version__,
+            'fingerprint': self.fingerprint(file_path),
+            'frame': frame
+        }
+        
+        cache_path = self._cache_path(file_path, namespace)
+        temp_path = cache_path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+    
+    
+    def load(self, file_path, namespace, loader):
+        """
+        캐시가 유효하면 캐시에서, 아니면 loader로 파싱 후 캐시에 저장
+        
+        Args:
+            file_path: 원본 파일 경로
+            namespace: 용도 구분
+            loader: file_path를 받아 DataFrame을 반환하는 함수
+            
+        Returns:
+            DataFrame: 파싱 결과
+        """
+        frame = self.get(file_path, namespace)
+        
+        if frame is None:
+            frame = loader(file_path)
+            self.put(file_path, namespace, frame)
+        
+        return frame
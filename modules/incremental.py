@@ -0,0 +1,412 @@
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from modules.column_store import ColumnStore
+from modules.daily_records import COMPACT_METRIC_DTYPES, card_categorical, compact_frame
+from modules.input_check import is_punch_archive
+from modules.punch_log import PunchAggregate, decode_punch_chunk
+from modules.punch_validation import PunchValidator, record_hashes
+
+
+CHECKPOINT_VERSION = 5
+
+# 체크포인트 상태 파일에 저장하는 항목 (나머지는 컬럼 파일)
+_STATE_KEYS = ('version', 'ruleset_id', 'log_path', 'fingerprint', 'offset', 'deduplicate', 'lines')
+
+# 컬럼 파일로 저장하는 부분 집계 컬럼 (PunchAggregate 생성자 순서)
+_AGGREGATE_COLUMNS = ('date', 'card', 'first_in', 'last_out', 'punch_count')
+
+_NO_ROWS = np.zeros(0, dtype='int64')
+
+# 로그 파일 교체 여부 판단용 앞부분 크기
+_HEAD_BYTES = 4096
+_UTF8_BOM = b'\xef\xbb\xbf'
+
+
+class IncrementalAttendance:
+    """
+    계속 추가되는 월간 출퇴근 로그를 증분 처리
+    
+    마지막으로 처리한 바이트 위치, (날짜, 카드번호)별 부분 집계, 계산된 일별 근태를
+    체크포인트로 저장하고, 다음 실행에서는 새로 추가된 줄만 파싱하여
+    해당 줄이 속한 (날짜, 카드번호)만 다시 계산한다.
+    마지막 줄바꿈 이후의 미완성 줄은 다음 실행으로 미룬다.
+    추가된 줄도 전체 처리와 같은 검증을 거치도록 검증한 줄 수와 통과 레코드 해시를 함께 보관한다.
+    
+    체크포인트는 디렉토리에 컬럼별 .npy 파일(ColumnStore)로 저장한다. 실행마다 추가된 기록의 첫 날짜 이후
+    구간만 memory map에서 읽어 합치고, 다시 계산된 행과 처음 삽입된 위치 이후의 꼬리만 덮어쓰므로
+    체크포인트 읽기/쓰기 비용은 월 전체가 아니라 추가된 기록이 속한 구간에 비례한다.
+    """
+    
+    def __init__(self, log_path, calculator, checkpoint_dir, min_length=18, validator=None):
+        """
+        초기화
+        
+        Args:
+            log_path: 출퇴근 로그 TXT 파일 경로
+            calculator: AttendanceCalculator
+            checkpoint_dir: 체크포인트 디렉토리 경로
+            min_length: 유효 레코드 최소 길이
+            validator: 추가된 줄에 적용할 PunchValidator (없으면 기본 검증기, 실행 후 격리 줄 조회에 사용)
+        """
+        if is_punch_archive(log_path):
+            raise ValueError(f"보관 파일은 추가 기록이 없으므로 증분 처리할 수 없습니다: {log_path}")
+        
+        self.log_path = log_path
+        self.calculator = calculator
+        self.store = ColumnStore(checkpoint_dir)
+        self.min_length = min_length
+        self.validator = validator if validator is not None else PunchValidator()
+        
+        # 이번 실행이 이전 체크포인트에서 이어서 처리했는지 여부 (격리 파일을 덧붙일지 판단)
+        self.resumed = False
+        
+        # 체크포인트 없이 처음부터 처리하는지 여부 (모든 컬럼 파일을 새로 씀)
+        self._rewrite = True
+    
+    
+    def update(self):
+        """
+        새로 추가된 출퇴근 기록을 반영하여 일별 근태 데이터 갱신
+        
+        Returns:
+            DataFrame: 월 전체 일별 근태 데이터 (컴팩트 표현의 calculate_all 결과 형식)
+        """
+        state = self._load_checkpoint()
+        self.resumed = state['offset'] > 0
+        new_bytes, end_offset = self._read_appended(state['offset'])
+        updates = {}
+        
+        if new_bytes:
+            self.validator.restore(state['lines'], state['seen'])
+            columns = decode_punch_chunk(
+                np.frombuffer(new_bytes, dtype=np.uint8), self.min_length, validator=self.validator
+            )
+            state['lines'] = self.validator.lines
+            if len(columns['date']):
+                updates = self._merge_updates(state, columns)
+        
+        # 처음부터 처리하면 추가된 기록이 없어도 모든 컬럼 파일을 새로 씀
+        if self._rewrite:
+            for name, values in _state_columns(state).items():
+                updates.setdefault(name, (_NO_ROWS, values[:0], 0, values))
+        
+        if not updates and end_offset == state['offset']:
+            return daily_frame(state['aggregate'], state['metrics'])
+        
+        # 컬럼 파일을 고치기 전에 memory map 해제
+        del state['aggregate'], state['metrics'], state['seen']
+        
+        state['offset'] = end_offset
+        state['fingerprint'] = self._log_fingerprint(end_offset)
+        self.store.commit({key: state[key] for key in _STATE_KEYS}, updates)
+        
+        aggregate, metrics, _ = self._open_columns()
+        return daily_frame(aggregate, metrics)
+    
+    
+    def _merge_updates(self, state, columns):
+        """
+        새 기록을 첫 날짜 이후 구간에만 합치고 컬럼 파일 갱신 내용 생성
+        
+        Args:
+            state: 처리 상태 (memory map 컬럼)
+            columns: 검증을 통과한 decode_punch_chunk 결과 컬럼
+            
+        Returns:
+            dict: ColumnStore.commit의 컬럼별 갱신 내용
+        """
+        aggregate = state['aggregate']
+        start_row = int(np.searchsorted(aggregate.date, columns['date'].min()))
+        window = aggregate.take(slice(start_row, None))
+        window_daily = _index_daily(daily_frame(
+            window, {name: values[start_row:] for name, values in state['metrics'].items()}
+        ))
+        
+        merged, merged_daily, indexer = merge_punch_columns(window, window_daily, columns, self.calculator)
+        
+        # 처음 삽입된 위치 전까지는 키가 그대로이고 같은 키의 행만 다시 계산됨, 그 뒤는 꼬리로 다시 씀
+        previous_rows = len(window)
+        card_width = max(window.card.dtype.itemsize, merged.card.dtype.itemsize)
+        moved = np.flatnonzero(window.sort_keys(card_width) != merged.sort_keys(card_width)[:previous_rows])
+        tail_start = int(moved[0]) if len(moved) else previous_rows
+        replaced = np.flatnonzero(indexer[:tail_start] >= previous_rows)
+        
+        merged_columns = {name: getattr(merged, name) for name in _AGGREGATE_COLUMNS}
+        merged_columns.update({
+            name: merged_daily[name].to_numpy(dtype=dtype) for name, dtype in COMPACT_METRIC_DTYPES.items()
+        })
+        updates = {
+            name: (start_row + replaced, values[replaced], start_row + tail_start, values[tail_start:])
+            for name, values in merged_columns.items()
+        }
+        
+        # 통과 레코드 해시는 날짜 순으로 정렬되므로 새 해시 중 가장 작은 값 위치부터 꼬리로 다시 씀
+        if self.validator.deduplicate:
+            seen = self.validator.seen
+            tail_start = int(np.searchsorted(seen, record_hashes(columns).min()))
+            updates['seen'] = (_NO_ROWS, seen[:0], tail_start, seen[tail_start:])
+        
+        return updates
+    
+    
+    def _read_appended(self, offset):
+        """
+        체크포인트 이후 추가된 완전한 줄들을 읽음
+        
+        Args:
+            offset: 마지막으로 처리한 바이트 위치
+            
+        Returns:
+            tuple: (새 바이트, 새 처리 위치)
+        """
+        with open(self.log_path, 'rb') as f:
+            f.seek(offset)
+            data = f.read()
+        
+        if offset == 0 and data.startswith(_UTF8_BOM):
+            data = data[len(_UTF8_BOM):]
+            offset = len(_UTF8_BOM)
+        
+        last_newline = data.rfind(b'\n')
+        if last_newline == -1:
+            return b'', offset
+        
+        return data[:last_newline + 1], offset + last_newline + 1
+    
+    
+    def _log_fingerprint(self, offset):
+        """
+        로그 파일 앞부분 해시 (파일 교체 감지용)
+        
+        Args:
+            offset: 처리한 바이트 위치 (이 위치까지만 해시)
+            
+        Returns:
+            str: 해시 문자열
+        """
+        with open(self.log_path, 'rb') as f:
+            return hashlib.sha256(f.read(min(offset, _HEAD_BYTES))).hexdigest()
+    
+    
+    def _empty_state(self):
+        """처음부터 처리하기 위한 빈 상태"""
+        self._rewrite = True
+        return {
+            'version': CHECKPOINT_VERSION,
+            'ruleset_id': self.calculator.ruleset_id,
+            'log_path': os.path.abspath(self.log_path),
+            'fingerprint': self._log_fingerprint(0),
+            'offset': 0,
+            'deduplicate': self.validator.deduplicate,
+            'lines': 0,
+            'aggregate': PunchAggregate.empty(),
+            'metrics': {name: np.zeros(0, dtype=dtype) for name, dtype in COMPACT_METRIC_DTYPES.items()},
+            'seen': np.empty(0, dtype='uint64')
+        }
+    
+    
+    def _open_columns(self):
+        """
+        체크포인트 컬럼 파일을 읽기 전용 memory map으로 열기
+        
+        Returns:
+            tuple: (PunchAggregate, {근태/수당 컬럼: 배열}, 통과 레코드 해시 정렬 배열)
+        """
+        aggregate = PunchAggregate(*(self.store.column(name) for name in _AGGREGATE_COLUMNS))
+        metrics = {name: self.store.column(name) for name in COMPACT_METRIC_DTYPES}
+        return aggregate, metrics, self.store.column('seen')
+    
+    
+    def _load_checkpoint(self):
+        """
+        체크포인트 상태를 읽고 컬럼 파일을 memory map으로 열기
+        (규칙/중복 제거 설정 변경, 로그 파일 교체/축소 시 처음부터 다시 처리)
+        
+        Returns:
+            dict: 처리 상태
+        """
+        state = self.store.read_state()
+        
+        valid = (
+            state is not None
+            and state.get('version') == CHECKPOINT_VERSION
+            and state['ruleset_id'] == self.calculator.ruleset_id
+            and state['log_path'] == os.path.abspath(self.log_path)
+            and state['deduplicate'] == self.validator.deduplicate
+        )
+        if not valid:
+            return self._empty_state()
+        
+        log_changed = (
+            state['offset'] > os.path.getsize(self.log_path)
+            or state['fingerprint'] != self._log_fingerprint(state['offset'])
+        )
+        if log_changed:
+            return self._empty_state()
+        
+        try:
+            state['aggregate'], state['metrics'], state['seen'] = self._open_columns()
+        except (OSError, ValueError):
+            return self._empty_state()
+        
+        self._rewrite = False
+        return state
+
+
+def _state_columns(state):
+    """처리 상태의 컬럼 파일별 배열"""
+    columns = {name: getattr(state['aggregate'], name) for name in _AGGREGATE_COLUMNS}
+    columns.update(state['metrics'])
+    columns['seen'] = state['seen']
+    return columns
+
+
+def daily_frame(aggregate, metrics):
+    """
+    정렬된 부분 집계와 행 순서가 같은 근태/수당 컬럼으로 일별 근태 데이터 생성
+    
+    Args:
+        aggregate: 날짜, 카드번호 순으로 정렬된 PunchAggregate
+        metrics: {근태/수당 컬럼: aggregate와 행 순서가 같은 배열}
+        
+    Returns:
+        DataFrame: 컴팩트 표현의 calculate_all 결과 형식
+    """
+    daily = compact_frame(aggregate.date, aggregate.first_in, aggregate.last_out, aggregate.card, aggregate.punch_count)
+    for name, dtype in COMPACT_METRIC_DTYPES.items():
+        daily[name] = np.array(metrics[name], dtype=dtype)
+    return daily
+
+
+def _index_daily(daily):
+    """
+    일별 근태 데이터를 (날짜, 카드번호) 색인으로 변환
+    
+    실행마다 카드번호 범주 목록이 달라지므로 체크포인트에는 문자열로 보관한다.
+    """
+    return daily.astype({'card_number': object}).set_index(['date', 'card_number'])
+
+
+def empty_daily(calculator):
+    """
+    (날짜, 카드번호) 색인의 빈 일별 근태 데이터
+    
+    Args:
+        calculator: AttendanceCalculator
+        
+    Returns:
+        DataFrame: 컬럼만 있는 색인된 calculate_all 결과
+    """
+    return calculate_daily(PunchAggregate.empty(), calculator)
+
+
+def calculate_daily(aggregate, calculator):
+    """
+    부분 집계 전체의 일별 근태 계산
+    
+    Args:
+        aggregate: PunchAggregate
+        calculator: AttendanceCalculator
+        
+    Returns:
+        DataFrame: (날짜, 카드번호) 색인의 일별 근태 데이터
+    """
+    return _index_daily(calculator.calculate_all(aggregate.to_frame(compact=True)))
+
+
+def locate_rows(aggregate, rows):
+    """
+    정렬된 부분 집계에서 행들의 (날짜, 카드번호) 위치를 이진 탐색
+    
+    Args:
+        aggregate: 날짜, 카드번호 순으로 정렬된 PunchAggregate
+        rows: 날짜, 카드번호 순으로 정렬된 PunchAggregate
+        
+    Returns:
+        tuple: (aggregate 안의 삽입 위치 배열, 같은 키가 이미 있는지 여부 배열)
+    """
+    card_width = max(aggregate.card.dtype.itemsize, rows.card.dtype.itemsize)
+    keys = aggregate.sort_keys(card_width)
+    row_keys = rows.sort_keys(card_width)
+    
+    positions = np.searchsorted(keys, row_keys)
+    found = np.zeros(len(rows), dtype=bool)
+    inside = positions < len(keys)
+    found[inside] = keys[positions[inside]] == row_keys[inside]
+    
+    return positions, found
+
+
+def upsert_rows(aggregate, daily, rows, rows_daily):
+    """
+    정렬된 부분 집계/일별 데이터의 같은 키 행은 교체하고 새 키 행은 삽입 위치에 끼워 넣음
+    (이진 탐색 위치로 한 번에 재배치, 전체 재집계/재정렬 없음)
+    
+    Args:
+        aggregate: 날짜, 카드번호 순으로 정렬된 PunchAggregate
+        daily: aggregate와 행 순서가 같은 색인 일별 근태 데이터
+        rows: 날짜, 카드번호 순으로 정렬된 교체/삽입할 PunchAggregate
+        rows_daily: rows와 행 순서가 같은 색인 일별 근태 데이터
+        
+    Returns:
+        tuple: (PunchAggregate, 색인 일별 근태 데이터, 결과 행별로 [기존 행, rows]를 이어 붙인 배열에서
+               가져온 위치 배열 (기존 행 수 이상이면 rows의 행))
+    """
+    positions, found = locate_rows(aggregate, rows)
+    inserted = ~found
+    
+    # 기존 행 뒤에 새 행을 이어 붙인 배열에서 결과 순서로 가져올 위치
+    touched = positions + np.cumsum(inserted) - inserted
+    appended = len(aggregate) + np.arange(len(rows))
+    indexer = np.insert(np.arange(len(aggregate)), positions[inserted], appended[inserted])
+    indexer[touched[found]] = appended[found]
+    
+    merged = PunchAggregate.concat_rows([aggregate, rows]).take(indexer)
+    return merged, pd.concat([daily, rows_daily]).iloc[indexer], indexer
+
+
+def merge_punch_columns(aggregate, daily, columns, calculator):
+    """
+    새 출퇴근 기록을 부분 집계에 합치고, 기록이 속한 (날짜, 카드번호)만 다시 계산
+    
+    새 기록과 기존 집계 중 같은 키의 행만 다시 축약/계산하므로 집계와 계산 비용은
+    새 기록 수에 비례하고, 월 전체는 upsert_rows로 한 번 재배치만 한다.
+    
+    Args:
+        aggregate: 날짜, 카드번호 순으로 정렬된 PunchAggregate
+        daily: aggregate와 행 순서가 같은 (날짜, 카드번호) 색인의 일별 근태 데이터
+        columns: decode_punch_chunk 결과 컬럼
+        calculator: AttendanceCalculator
+        
+    Returns:
+        tuple: (갱신된 PunchAggregate, 갱신된 색인 일별 근태 데이터, upsert_rows의 위치 배열
+               (기존 행 수 이상인 위치의 행이 다시 계산된 행))
+    """
+    appended = PunchAggregate.from_columns(columns)
+    if not len(appended):
+        return aggregate, daily, np.arange(len(aggregate))
+    
+    appended = appended.sorted()
+    positions, found = locate_rows(aggregate, appended)
+    rows = PunchAggregate.concat([aggregate.take(positions[found]), appended]).sorted()
+    
+    return upsert_rows(aggregate, daily, rows, calculate_daily(rows, calculator))
+
+
+def restore_daily(daily):
+    """
+    색인된 일별 근태 데이터를 calculate_all 결과 형식(컴팩트, 범주형 카드번호)으로 변환
+    
+    Args:
+        daily: (날짜, 카드번호) 색인의 일별 근태 데이터
+        
+    Returns:
+        DataFrame: 날짜, 카드번호 순의 일별 근태 데이터
+    """
+    daily = daily.reset_index()
+    daily['card_number'] = card_categorical(daily['card_number'].to_numpy())
+    return daily
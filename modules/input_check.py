@@ -0,0 +1,142 @@
+import os
+import struct
+import sys
+import zipfile
+import zlib
+from array import array
+from datetime import datetime, timedelta
+
+
+# 날짜+시간+코드(15자리) + 카드번호, 18자 미만 라인은 무시
+HEADER_WIDTH = 15
+MIN_RECORD_LENGTH = 18
+
+# 출퇴근 보관 파일 형식 (punch_archive에서 사용, validate가 numpy 없이 검사할 수 있도록 여기에 정의)
+#   헤더 64바이트(리틀 엔디언): magic, 형식 버전, 예약, 기록 수, 기준 시각(1970-01-01 기준 초),
+#   카드 수, 카드번호 폭, 본문 CRC32
+#   본문: 기준 시각부터의 초(uint32), 카드 테이블 위치(uint32), 코드(int8) 컬럼 + 카드 테이블
+ARCHIVE_MAGIC = b'PUNCHARC'
+ARCHIVE_VERSION = 1
+ARCHIVE_HEADER = struct.Struct('<8sHHQqIII24x')
+ARCHIVE_RECORD_BYTES = 9
+
+
+def check_punch_log(file_path, min_length=MIN_RECORD_LENGTH):
+    """
+    출퇴근 로그 형식 검사 (표준 라이브러리만 사용, 줄 단위 스캔)
+    
+    Args:
+        file_path: TXT 파일 경로
+        min_length: 유효 레코드 최소 길이
+        
+    Returns:
+        dict: lines(전체 줄 수), valid(유효 레코드 수), invalid(무시될 줄 수, 빈 줄 제외),
+              years(유효 레코드의 연도 리스트)
+    """
+    lines = 0
+    valid = 0
+    invalid = 0
+    years = set()
+    
+    with open(file_path, 'rb') as f:
+        for raw in f:
+            lines += 1
+            if lines == 1 and raw.startswith(b'\xef\xbb\xbf'):
+                raw = raw[3:]
+            
+            line = raw.rstrip(b'\r\n \t')
+            if not line:
+                continue
+            
+            if len(line) >= min_length and line[:HEADER_WIDTH].isdigit():
+                valid += 1
+                years.add(int(line[:4]))
+            else:
+                invalid += 1
+    
+    return {'lines': lines, 'valid': valid, 'invalid': invalid, 'years': sorted(years)}
+
+
+def is_punch_archive(file_path):
+    """
+    파일이 출퇴근 보관 파일인지 여부 (앞 8바이트 확인)
+    
+    Args:
+        file_path: 파일 경로
+        
+    Returns:
+        bool: 보관 파일이면 True
+    """
+    with open(file_path, 'rb') as f:
+        return f.read(len(ARCHIVE_MAGIC)) == ARCHIVE_MAGIC
+
+
+def check_punch_archive(file_path):
+    """
+    출퇴근 보관 파일 헤더/크기/체크섬 검사 (표준 라이브러리만 사용)
+    
+    Args:
+        file_path: 보관 파일 경로
+        
+    Returns:
+        dict: records(기록 수), errors(오류 메시지 리스트), years(기록의 연도 리스트, 오류가 있으면 빈 리스트)
+    """
+    size = os.path.getsize(file_path)
+    
+    with open(file_path, 'rb') as f:
+        header = f.read(ARCHIVE_HEADER.size)
+        if len(header) < ARCHIVE_HEADER.size or not header.startswith(ARCHIVE_MAGIC):
+            return {'records': 0, 'errors': [f"출퇴근 보관 파일 헤더가 올바르지 않습니다: {file_path}"], 'years': []}
+        
+        _, version, _, records, base_seconds, cards, card_width, checksum = ARCHIVE_HEADER.unpack(header)
+        if version != ARCHIVE_VERSION:
+            return {'records': 0, 'errors': [f"지원하지 않는 보관 파일 버전입니다 ({version}): {file_path}"], 'years': []}
+        
+        expected = ARCHIVE_HEADER.size + records * ARCHIVE_RECORD_BYTES + cards * card_width
+        if size != expected:
+            return {
+                'records': records,
+                'errors': [f"보관 파일 크기가 헤더와 다릅니다 ({size} != {expected}): {file_path}"],
+                'years': []
+            }
+        
+        crc = 0
+        for block in iter(lambda: f.read(1 << 20), b''):
+            crc = zlib.crc32(block, crc)
+        
+        if crc != checksum:
+            return {'records': records, 'errors': [f"보관 파일 체크섬이 맞지 않습니다: {file_path}"], 'years': []}
+        
+        # 본문 첫 컬럼: 기준 시각부터의 초(uint32, 리틀 엔디언)
+        f.seek(ARCHIVE_HEADER.size)
+        offsets = array('I')
+        offsets.fromfile(f, records)
+        if sys.byteorder != 'little':
+            offsets.byteswap()
+    
+    years = []
+    if records:
+        first = datetime(1970, 1, 1) + timedelta(seconds=base_seconds + min(offsets))
+        last = datetime(1970, 1, 1) + timedelta(seconds=base_seconds + max(offsets))
+        years = list(range(first.year, last.year + 1))
+    
+    return {'records': records, 'errors': [], 'years': years}
+
+
+def check_workbook(file_path):
+    """
+    Excel(xlsx) 파일 형식 검사 (zip 컨테이너 여부만 확인)
+    
+    Args:
+        file_path: Excel 파일 경로
+        
+    Returns:
+        list: 오류 메시지 리스트 (문제 없으면 빈 리스트)
+    """
+    if not os.path.exists(file_path):
+        return [f"파일을 찾을 수 없습니다: {file_path}"]
+    
+    if not zipfile.is_zipfile(file_path):
+        return [f"xlsx 형식이 아닙니다: {file_path}"]
+    
+    return []
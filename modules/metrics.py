@@ -0,0 +1,139 @@
+import cProfile
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+
+# 진행 중인 측정 구간별 최대 메모리 (tracemalloc의 peak는 프로세스 전체에서 하나이므로
+# 중첩 구간이 reset_peak()로 지우기 전의 바깥 구간 값을 보관)
+_enclosing_peaks = []
+
+
+class StageMetrics:
+    """
+    파이프라인 단계별 실행 시간/CPU 시간/최대 추적 메모리/처리 건수 기록
+    
+    사용 예:
+        with metrics.stage('parse_attendance_log') as stage:
+            attendance_df = ...
+            stage['rows'] = len(attendance_df)
+    """
+    
+    def __init__(self, logger=None, profile_dir=None, trace_memory=False):
+        """
+        초기화
+        
+        Args:
+            logger: 단계별 측정값을 기록할 로거 (선택)
+            profile_dir: 지정 시 단계별 cProfile 결과(.prof) 저장 디렉토리
+            trace_memory: True면 tracemalloc으로 단계별 최대 메모리 측정 (할당이 많은 단계는 실행 시간이 크게 늘어남, False면 peak_bytes는 None)
+        """
+        self.logger = logger
+        self.profile_dir = profile_dir
+        self.trace_memory = trace_memory
+        self.records = []
+    
+    
+    @contextmanager
+    def stage(self, name, rows=None):
+        """
+        한 단계의 측정 구간
+        
+        Args:
+            name: 단계 이름
+            rows: 처리 건수 (구간 안에서 stage['rows']로 지정 가능)
+            
+        Yields:
+            dict: 측정 기록 (rows 등을 추가로 기록)
+        """
+        record = {'stage': name, 'rows': rows}
+        
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        elif self.trace_memory:
+            if _enclosing_peaks:
+                _enclosing_peaks[-1] = max(_enclosing_peaks[-1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        if self.trace_memory:
+            _enclosing_peaks.append(0)
+        
+        profiler = None
+        if self.profile_dir:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        status = 'error'
+        
+        try:
+            yield record
+            status = 'ok'
+        finally:
+            wall_seconds = time.perf_counter() - wall_start
+            cpu_seconds = time.process_time() - cpu_start
+            peak_bytes = None
+            if self.trace_memory:
+                peak_bytes = max(_enclosing_peaks.pop(), tracemalloc.get_traced_memory()[1])
+            if started_tracing:
+                tracemalloc.stop()
+            
+            if profiler is not None:
+                profiler.disable()
+                record['profile'] = self._dump_profile(profiler, name)
+            
+            record.update({
+                'status': status,
+                'wall_seconds': round(wall_seconds, 6),
+                'cpu_seconds': round(cpu_seconds, 6),
+                'peak_bytes': peak_bytes
+            })
+            self.add(record)
+    
+    
+    def add(self, record):
+        """
+        측정 기록 추가 (다른 프로세스에서 측정한 기록 포함) 및 로거 출력
+        
+        Args:
+            record: stage, wall_seconds, cpu_seconds, peak_bytes, rows 키를 가진 딕셔너리
+        """
+        self.records.append(record)
+        
+        if self.logger:
+            rows = record.get('rows')
+            peak_bytes = record.get('peak_bytes')
+            memory_text = f", 최대 메모리 {peak_bytes / 2**20:.1f}MiB" if peak_bytes is not None else ''
+            rows_text = f", {rows}건" if rows is not None else ''
+            self.logger.info(
+                f"[metrics] {record['stage']}: 실행 {record['wall_seconds']:.3f}초, "
+                f"CPU {record['cpu_seconds']:.3f}초{memory_text}{rows_text}"
+            )
+    
+    
+    def _dump_profile(self, profiler, name):
+        """cProfile 결과를 profile_dir/<단계>.prof로 저장하고 경로 반환"""
+        if not os.path.exists(self.profile_dir):
+            os.makedirs(self.profile_dir, exist_ok=True)
+        
+        profile_path = os.path.join(self.profile_dir, f'{name}.prof')
+        profiler.dump_stats(profile_path)
+        return profile_path
+    
+    
+    def write(self, output_path):
+        """
+        측정 기록을 JSON 파일로 저장
+        
+        Args:
+            output_path: 출력 JSON 파일 경로
+        """
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'generated_at': datetime.now().isoformat(timespec='seconds'),
+                'stages': self.records
+            }, f, ensure_ascii=False, indent=2)
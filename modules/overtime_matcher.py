@@ -0,0 +1,157 @@
+import numpy as np
+import pandas as pd
+
+from modules.employee_directory import MISSING_CARD_KEY, card_keys
+
+
+# 연장/휴가 정보 Excel 컬럼 후보 (앞쪽 우선)
+CARD_COLUMNS = ['카드번호', 'card_number', 'card_no']
+DATE_COLUMNS = ['date', '날짜', '일자']
+START_COLUMNS = ['시작일', 'start_date']
+END_COLUMNS = ['종료일', 'end_date']
+TYPE_COLUMNS = ['구분', '유형', '종류', 'type']
+HOURS_COLUMNS = ['승인시간', '연장시간', '시간', 'hours']
+
+# 구분 값에 포함되면 연장 근무 승인으로 보는 문자열
+OVERTIME_KEYWORD = '연장'
+
+# (카드 키, 일수) 결합 키 배수 (일수 < 100000)
+_DAY_SPAN = 100000
+
+
+def _find_column(df, candidates):
+    """후보 중 데이터프레임에 있는 첫 번째 컬럼명 (없으면 None)"""
+    return next((column for column in candidates if column in df.columns), None)
+
+
+def _to_days(dates):
+    """날짜 Series를 1970-01-01 기준 일수 배열로 변환 (변환 불가는 -1, 정수 일수는 그대로)"""
+    if pd.api.types.is_integer_dtype(dates):
+        return np.asarray(dates, dtype='int64')
+    
+    parsed = pd.to_datetime(pd.Series(dates), errors='coerce')
+    days = parsed.to_numpy().astype('datetime64[D]').astype('int64')
+    return np.where(parsed.notna().to_numpy(), days, -1)
+
+
+class OvertimeLeaveIndex:
+    """
+    연장 승인 / 휴가 기록 색인
+    
+    연장 승인은 (카드 키, 날짜) 결합 정수 키의 해시 색인으로, 휴가는 카드별 시작일 순으로
+    정렬한 구간 배열(누적 최대 종료일 포함)로 보관하여 일별 데이터 전체를 한 번에 조인한다.
+    """
+    
+    def __init__(self, overtime_df):
+        """
+        초기화
+        
+        Args:
+            overtime_df: DataParser.parse_overtime_leave_info 결과 DataFrame
+        """
+        card_column = _find_column(overtime_df, CARD_COLUMNS)
+        date_column = _find_column(overtime_df, DATE_COLUMNS)
+        start_column = _find_column(overtime_df, START_COLUMNS)
+        end_column = _find_column(overtime_df, END_COLUMNS)
+        
+        if card_column is None or (date_column is None and start_column is None):
+            raise ValueError(
+                f"연장/휴가 정보에 카드번호({'/'.join(CARD_COLUMNS)})와 "
+                f"날짜({'/'.join(DATE_COLUMNS + START_COLUMNS)}) 컬럼이 필요합니다"
+            )
+        
+        type_column = _find_column(overtime_df, TYPE_COLUMNS)
+        hours_column = _find_column(overtime_df, HOURS_COLUMNS)
+        
+        cards = card_keys(overtime_df[card_column])
+        missing_days = np.full(len(overtime_df), -1, dtype='int64')
+        
+        # 기간 휴가는 시작일~종료일, 하루 단위 기록은 날짜 (종료일이 없으면 시작일과 같음)
+        dates = _to_days(overtime_df[date_column]) if date_column else missing_days
+        start_days = _to_days(overtime_df[start_column]) if start_column else missing_days
+        start_days = np.where(start_days >= 0, start_days, dates)
+        end_days = _to_days(overtime_df[end_column]) if end_column else missing_days
+        end_days = np.where(end_days >= 0, end_days, start_days)
+        
+        kinds = (
+            overtime_df[type_column].fillna('').astype(str).str.strip()
+            if type_column else pd.Series([OVERTIME_KEYWORD] * len(overtime_df), index=overtime_df.index)
+        )
+        hours = (
+            pd.to_numeric(overtime_df[hours_column], errors='coerce').fillna(0).to_numpy(dtype='float64')
+            if hours_column else np.zeros(len(overtime_df))
+        )
+        
+        valid = (cards != MISSING_CARD_KEY) & (start_days >= 0) & (end_days >= start_days)
+        is_overtime = kinds.str.contains(OVERTIME_KEYWORD, regex=False).to_numpy() & valid
+        is_leave = ~is_overtime & valid & (kinds != '').to_numpy()
+        
+        # 연장 승인: (카드 키, 날짜)별 승인 시간 합계 (해시 색인)
+        overtime_keys = cards[is_overtime] * _DAY_SPAN + start_days[is_overtime]
+        overtime_hours = pd.Series(hours[is_overtime]).groupby(overtime_keys).sum()
+        self.overtime_index = pd.Index(overtime_hours.index.to_numpy(dtype='int64'))
+        self.overtime_hours = overtime_hours.to_numpy(dtype='float64')
+        
+        # 휴가: (카드 키, 시작일) 순 정렬 구간과 누적 최대 종료일
+        leave_starts = cards[is_leave] * _DAY_SPAN + start_days[is_leave]
+        leave_ends = cards[is_leave] * _DAY_SPAN + end_days[is_leave]
+        leave_types = kinds[is_leave].to_numpy(dtype=object)
+        
+        order = np.argsort(leave_starts, kind='stable')
+        self.leave_starts = leave_starts[order]
+        leave_ends = leave_ends[order]
+        self.leave_types = leave_types[order]
+        
+        # 앞선 구간 중 가장 늦게 끝나는 구간 (겹치는 휴가도 포함되도록)
+        self.leave_reach = np.maximum.accumulate(leave_ends) if len(leave_ends) else leave_ends
+        positions = np.where(leave_ends == self.leave_reach, np.arange(len(leave_ends)), 0)
+        self.leave_reach_position = np.maximum.accumulate(positions) if len(positions) else positions
+    
+    
+    def lookup(self, cards, days):
+        """
+        (카드 키, 날짜) 배열별 승인 연장 시간과 휴가 구분 조회
+        
+        Args:
+            cards: 카드 키 배열 (int64)
+            days: 1970-01-01 기준 일수 배열
+            
+        Returns:
+            tuple: (승인 시간 배열, 휴가 구분 배열 (없으면 ''))
+        """
+        keys = np.asarray(cards, dtype='int64') * _DAY_SPAN + np.asarray(days, dtype='int64')
+        valid = (np.asarray(cards) != MISSING_CARD_KEY) & (np.asarray(days) >= 0)
+        
+        positions = self.overtime_index.get_indexer(keys)
+        found = valid & (positions >= 0)
+        approved_hours = np.zeros(len(keys), dtype='float64')
+        approved_hours[found] = self.overtime_hours[positions[found]]
+        
+        leave_types = np.full(len(keys), '', dtype=object)
+        if len(self.leave_starts):
+            candidates = np.searchsorted(self.leave_starts, keys, side='right') - 1
+            safe = np.maximum(candidates, 0)
+            covered = valid & (candidates >= 0) & (self.leave_reach[safe] >= keys)
+            leave_types[covered] = self.leave_types[self.leave_reach_position[safe[covered]]]
+        
+        return approved_hours, leave_types
+    
+    
+    def match(self, daily_df):
+        """
+        일별 근태 데이터에 승인 연장 시간, 휴가 구분, 불일치 여부 컬럼 추가
+        
+        Args:
+            daily_df: date, card_number, work_ot 컬럼을 가진 DataFrame
+            
+        Returns:
+            DataFrame: approved_hours, leave_type, overtime_mismatch 컬럼이 추가된 DataFrame
+        """
+        approved_hours, leave_types = self.lookup(card_keys(daily_df['card_number']), _to_days(daily_df['date']))
+        
+        daily_df['approved_hours'] = approved_hours
+        daily_df['leave_type'] = leave_types
+        # 근무 OT와 승인 연장 시간이 다르면 불일치 (미승인 연장 또는 승인 시간 미달)
+        daily_df['overtime_mismatch'] = ~np.isclose(daily_df['work_ot'].to_numpy(dtype='float64'), approved_hours)
+        
+        return daily_df
@@ -1,92 +1,88 @@
 import pandas as pd
 import re
 
+from modules.frame_cache import FrameCache
+from modules.input_check import is_punch_archive
+from modules.punch_archive import read_punch_archive
+from modules.punch_log import (
+    DEFAULT_CHUNK_BYTES, DEFAULT_MAX_SHIFT_HOURS, PunchAggregate, ShiftRecords,
+    concat_punch_columns, iter_punch_chunks, read_punch_file
+)
+
 
 class DataParser:
     """데이터 파싱을 담당하는 클래스"""
     
     @staticmethod
-    def parse_attendance_log(file_path):
+    def parse_attendance_log(file_path, streaming=False, chunk_bytes=DEFAULT_CHUNK_BYTES, compact=False,
+                             validator=None):
         """
-        출퇴근 로그 TXT 파일을 파싱
+        출퇴근 로그 TXT 파일(또는 보관 파일)을 파싱
         
         Args:
-            file_path: TXT 파일 경로
+            file_path: TXT 파일 경로 (보관 파일이면 텍스트 디코딩 없이 메모리 맵으로 읽음)
+            streaming: True면 메모리 맵 + 청크 단위 고정폭 디코딩 사용
+            chunk_bytes: 스트리밍 모드 청크 크기 (바이트)
+            compact: True면 정수 날짜/시간 + 범주형 카드번호로 반환 (리포트 출력 시 to_display로 변환)
+            validator: 지정 시 범위/코드/카드 형식 검사와 중복 제거를 적용할 PunchValidator
+                       (걸러진 줄과 사유별 건수는 validator에 누적, 보관 파일은 보관 시 검증되어 미적용)
             
         Returns:
-            DataFrame: 날짜, 출근, 퇴근, 카드번호 컬럼을 가진 데이터프레임
+            DataFrame: 날짜, 출근, 퇴근, 카드번호, 기록 수 컬럼을 가진 데이터프레임
         """
-        attendance_records = []
-        
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+        # 날짜+시간+코드(15자리) + 카드번호, 18자 미만 라인은 무시
+        if is_punch_archive(file_path):
+            aggregate = PunchAggregate.from_columns(read_punch_archive(file_path))
+        elif streaming:
+            aggregate = PunchAggregate.concat([
+                PunchAggregate.from_columns(chunk)
+                for chunk in iter_punch_chunks(file_path, chunk_bytes, min_length=18, validator=validator)
+            ])
+        else:
+            aggregate = PunchAggregate.from_columns(read_punch_file(file_path, min_length=18, validator=validator))
         
-        # 각 라인을 파싱
-        for line in lines:
-            line = line.strip()
-            if len(line) < 18:
-                continue
-                
-            # 날짜 추출 (YYYYMMDD)
-            date_str = line[0:8]
-            date = f"{date_str[0:4]}-{date_str[4:6]}-{date_str[6:8]}"
-            
-            # 시간 추출 (HHMMSS)
-            time_str = line[8:14]
-            time = f"{time_str[0:2]}:{time_str[2:4]}:{time_str[4:6]}"
-            
-            # 코드 추출 (1: 출근, 2: 퇴근)
-            code = line[14:15]
-            
-            # 카드번호 추출
-            card_number = line[15:]
-            
-            attendance_records.append({
-                'date': date,
-                'time': time,
-                'code': code,
-                'card_number': card_number
-            })
-        
-        df = pd.DataFrame(attendance_records)
+        # 날짜와 카드번호별 출근(가장 빠른 시간)/퇴근(가장 늦은 시간)
+        return aggregate.to_frame(compact)
+    
+    
+    @staticmethod
+    def parse_attendance_shifts(file_path, max_shift_hours=DEFAULT_MAX_SHIFT_HOURS, chunk_bytes=DEFAULT_CHUNK_BYTES,
+                                compact=False, validator=None):
+        """
+        출퇴근 로그 TXT 파일(또는 보관 파일)을 날짜 대신 근무(shift) 단위로 파싱 (자정을 넘는 야간 근무 포함)
         
-        # 날짜와 카드번호로 그룹화하여 출근/퇴근 시간 분리
-        result = []
-        for (date, card_number), group in df.groupby(['date', 'card_number']):
-            check_in = None
-            check_out = None
-            
-            for _, row in group.iterrows():
-                if row['code'] == '1':
-                    # 출근 시간 (가장 빠른 시간)
-                    if check_in is None or row['time'] < check_in:
-                        check_in = row['time']
-                elif row['code'] == '2':
-                    # 퇴근 시간 (가장 늦은 시간)
-                    if check_out is None or row['time'] > check_out:
-                        check_out = row['time']
+        Args:
+            file_path: TXT 파일 경로 (보관 파일이면 메모리 맵으로 읽음)
+            max_shift_hours: 출근부터 한 근무로 묶을 최대 시간
+            chunk_bytes: 청크 크기 (바이트)
+            compact: True면 정수 날짜/시간 + 범주형 카드번호로 반환
+            validator: 지정 시 적용할 PunchValidator
             
-            result.append({
-                'date': date,
-                'check_in': check_in,
-                'check_out': check_out,
-                'card_number': card_number
-            })
-        
-        return pd.DataFrame(result)
+        Returns:
+            DataFrame: 근무 시작일, 출근, 퇴근, 카드번호, 기록 수, 시작/종료 일시 컬럼을 가진 데이터프레임
+        """
+        if is_punch_archive(file_path):
+            columns = read_punch_archive(file_path)
+        else:
+            columns = concat_punch_columns(iter_punch_chunks(file_path, chunk_bytes, min_length=18, validator=validator))
+        return ShiftRecords.from_columns(columns, max_shift_hours).to_frame(compact)
     
     
     @staticmethod
-    def parse_employee_info(file_path):
+    def parse_employee_info(file_path, cache_dir=None):
         """
         사원 정보 Excel 파일을 파싱
         
         Args:
             file_path: Excel 파일 경로
+            cache_dir: 지정 시 파싱 결과를 캐시 (파일 변경 시 자동 무효화)
             
         Returns:
             DataFrame: 사원 정보 데이터프레임 (위치 필드 추가)
         """
+        if cache_dir is not None:
+            return FrameCache(cache_dir).load(file_path, 'employee_info', DataParser.parse_employee_info)
+        
         df = pd.read_excel(file_path)
         
         # 위치 필드 추가
@@ -107,16 +103,20 @@ class DataParser:
     
     
     @staticmethod
-    def parse_overtime_leave_info(file_path):
+    def parse_overtime_leave_info(file_path, cache_dir=None):
         """
         연장/휴가 정보 Excel 파일을 파싱
         
         Args:
             file_path: Excel 파일 경로
+            cache_dir: 지정 시 파싱 결과를 캐시 (파일 변경 시 자동 무효화)
             
         Returns:
             DataFrame: 연장/휴가 정보 데이터프레임
         """
+        if cache_dir is not None:
+            return FrameCache(cache_dir).load(file_path, 'overtime_leave_info', DataParser.parse_overtime_leave_info)
+        
         df = pd.read_excel(file_path)
         
         # 날짜 형식 통일
@@ -0,0 +1,26 @@
+from modules.overtime_matcher import OvertimeLeaveIndex
+
+
+def finalize_daily_records(daily_df, overtime_df=None):
+    """
+    계산된 일별 근태 데이터에 리포트용 부가 컬럼 추가
+    
+    Args:
+        daily_df: AttendanceCalculator.calculate_all 결과 DataFrame
+        overtime_df: 연장/휴가 정보 DataFrame (선택)
+        
+    Returns:
+        DataFrame: overtime, basic_pay, overtime_match 컬럼이 추가된 DataFrame
+                   (연장/휴가 정보가 있으면 approved_hours, leave_type, overtime_mismatch 컬럼도 추가)
+    """
+    daily_df['overtime'] = daily_df['work_ot']  # 연장 (근무 OT와 동일)
+    daily_df['basic_pay'] = 0  # 기본급은 별도 계산 필요
+    
+    # 연장내역 매칭 (선택적, 근무 OT와 승인 연장 시간이 다르면 확인 필요)
+    daily_df['overtime_match'] = ''
+    if overtime_df is not None:
+        daily_df = OvertimeLeaveIndex(overtime_df).match(daily_df)
+        daily_df.loc[daily_df['overtime_mismatch'], 'overtime_match'] = '확인필요'
+    
+    return daily_df
+
@@ -0,0 +1,150 @@
+import mmap
+import os
+import zlib
+
+import numpy as np
+
+from modules.compiled_rules import SECONDS_PER_DAY
+from modules.input_check import (
+    ARCHIVE_HEADER, ARCHIVE_MAGIC, ARCHIVE_RECORD_BYTES, ARCHIVE_VERSION
+)
+
+
+ARCHIVE_SUFFIX = '.punch'
+
+# 본문 컬럼 (헤더 바로 뒤에 순서대로, 모두 기록 수 길이)
+#   offset: 기준 시각부터의 초, card_index: 카드 테이블 위치, code: 출퇴근 코드
+#   이어서 카드 테이블 (카드 수 x 카드번호 폭 고정폭 바이트 문자열, 정렬)
+_COLUMN_DTYPES = (('offset', '<u4'), ('card_index', '<u4'), ('code', 'i1'))
+
+
+def archive_path_for(log_path):
+    """
+    출퇴근 로그 경로에 대응하는 보관 파일 경로 (확장자만 변경, 파일명의 년월 유지)
+    
+    Args:
+        log_path: 출퇴근 로그 TXT 파일 경로
+        
+    Returns:
+        str: 보관 파일 경로
+    """
+    return os.path.splitext(log_path)[0] + ARCHIVE_SUFFIX
+
+
+def write_punch_archive(columns, archive_path):
+    """
+    디코딩된 출퇴근 기록 컬럼을 보관 파일로 저장 (기록 순서 유지)
+    
+    Args:
+        columns: decode_punch_chunk 결과 컬럼 (date, seconds, code, card)
+        archive_path: 보관 파일 경로
+        
+    Returns:
+        int: 저장한 파일 크기 (바이트)
+    """
+    date = np.asarray(columns['date'], dtype='int64')
+    base_seconds = int(date.min()) * SECONDS_PER_DAY if len(date) else 0
+    offsets = date * SECONDS_PER_DAY + columns['seconds'] - base_seconds
+    
+    if len(offsets) and int(offsets.max()) > np.iinfo('uint32').max:
+        raise ValueError("보관 파일 하나의 기록 기간은 136년을 넘을 수 없습니다")
+    
+    cards, card_index = np.unique(columns['card'], return_inverse=True)
+    card_width = cards.dtype.itemsize if len(cards) else 1
+    
+    body = b''.join([
+        offsets.astype('<u4').tobytes(),
+        card_index.astype('<u4').tobytes(),
+        np.asarray(columns['code'], dtype='i1').tobytes(),
+        cards.astype(f'S{card_width}').tobytes()
+    ])
+    header = ARCHIVE_HEADER.pack(
+        ARCHIVE_MAGIC, ARCHIVE_VERSION, 0, len(offsets), base_seconds, len(cards), card_width, zlib.crc32(body)
+    )
+    
+    # 임시 파일에 기록 후 교체 (중간에 실패해도 기존 보관 파일 유지)
+    temp_path = archive_path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(header)
+        f.write(body)
+    os.replace(temp_path, archive_path)
+    
+    return len(header) + len(body)
+
+
+def read_archive_header(buf, archive_path=''):
+    """
+    보관 파일 헤더 해석
+    
+    Args:
+        buf: 파일 내용 (bytes/mmap)
+        archive_path: 오류 메시지용 경로
+        
+    Returns:
+        dict: records, base_seconds, cards, card_width, checksum
+    """
+    if len(buf) < ARCHIVE_HEADER.size:
+        raise ValueError(f"보관 파일 헤더가 잘렸습니다: {archive_path}")
+    
+    magic, version, _, records, base_seconds, cards, card_width, checksum = ARCHIVE_HEADER.unpack_from(buf)
+    
+    if magic != ARCHIVE_MAGIC:
+        raise ValueError(f"출퇴근 보관 파일이 아닙니다: {archive_path}")
+    if version != ARCHIVE_VERSION:
+        raise ValueError(f"지원하지 않는 보관 파일 버전입니다 ({version}): {archive_path}")
+    
+    expected = ARCHIVE_HEADER.size + records * ARCHIVE_RECORD_BYTES + cards * card_width
+    if len(buf) != expected:
+        raise ValueError(f"보관 파일 크기가 헤더와 다릅니다 ({len(buf)} != {expected}): {archive_path}")
+    
+    return {
+        'records': records,
+        'base_seconds': base_seconds,
+        'cards': cards,
+        'card_width': card_width,
+        'checksum': checksum
+    }
+
+
+def read_punch_archive(archive_path, verify=True):
+    """
+    보관 파일을 메모리 맵으로 열어 출퇴근 기록 컬럼으로 반환 (텍스트 디코딩 없음)
+    
+    본문 컬럼은 메모리 맵 위의 NumPy 뷰로 복사 없이 읽고, 날짜/시각 분리와
+    카드 테이블 조회만 배열 연산으로 한 번씩 수행한다.
+    반환된 배열이 남아 있는 동안 메모리 맵이 유지된다.
+    
+    Args:
+        archive_path: 보관 파일 경로
+        verify: 본문 CRC32 확인 여부
+        
+    Returns:
+        dict: decode_punch_chunk 결과와 같은 date, seconds, code, card 컬럼
+    """
+    with open(archive_path, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    header = read_archive_header(mm, archive_path)
+    records = header['records']
+    
+    if verify:
+        with memoryview(mm) as view, view[ARCHIVE_HEADER.size:] as body:
+            if zlib.crc32(body) != header['checksum']:
+                raise ValueError(f"보관 파일 체크섬이 맞지 않습니다: {archive_path}")
+    
+    views = {}
+    offset = ARCHIVE_HEADER.size
+    for name, dtype in _COLUMN_DTYPES:
+        views[name] = np.frombuffer(mm, dtype=dtype, count=records, offset=offset)
+        offset += views[name].nbytes
+    cards = np.frombuffer(mm, dtype=f"S{header['card_width']}", count=header['cards'], offset=offset)
+    
+    base_day, base_rest = divmod(header['base_seconds'], SECONDS_PER_DAY)
+    days, seconds = np.divmod(views['offset'].astype('int64') + base_rest, SECONDS_PER_DAY)
+    
+    return {
+        'date': (days + base_day).astype('int32'),
+        'seconds': seconds.astype('int32'),
+        'code': views['code'],
+        'card': cards[views['card_index']],
+    }
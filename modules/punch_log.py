@@ -0,0 +1,630 @@
+import mmap
+import os
+
+import numpy as np
+import pandas as pd
+
+from modules.compiled_rules import SECONDS_PER_DAY
+from modules.daily_records import compact_frame, format_dates, format_seconds
+from modules.punch_validation import BAD_HEADER, SHORT_LINE, date_time_errors
+
+
+# 고정폭 레코드: YYYYMMDD(8) + HHMMSS(6) + 코드(1) + 카드번호(나머지)
+HEADER_WIDTH = 15
+DEFAULT_CHUNK_BYTES = 16 * 1024 * 1024
+
+# 근무 짝짓기 기본 최대 근무 시간 (시간)
+DEFAULT_MAX_SHIFT_HOURS = 16
+
+_NEWLINE = ord('\n')
+_TRAILING_BLANKS = (ord('\r'), ord(' '), ord('\t'))
+_ZERO = ord('0')
+_UTF8_BOM = b'\xef\xbb\xbf'
+
+
+def days_from_civil(year, month, day):
+    """
+    년/월/일 정수 배열을 1970-01-01 기준 일수로 변환 (그레고리력)
+    
+    Args:
+        year: 년 배열
+        month: 월 배열
+        day: 일 배열
+        
+    Returns:
+        ndarray: 일수 배열 (int32)
+    """
+    year = year - (month <= 2)
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * ((month + 9) % 12) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return (era * 146097 + day_of_era - 719468).astype('int32')
+
+
+def decode_punch_chunk(buf, min_length=HEADER_WIDTH, rejected=None, validator=None):
+    """
+    줄 단위로 끝나는 바이트 버퍼를 타입이 지정된 NumPy 컬럼으로 디코딩
+    
+    Args:
+        buf: uint8 배열 (완전한 줄들로 구성)
+        min_length: 유효 레코드 최소 길이 (미만은 무시)
+        rejected: 지정 시 무시된 줄(빈 줄 제외)의 원본 바이트를 추가할 리스트
+        validator: 지정 시 범위/코드/카드 형식 검사와 중복 제거를 적용할 PunchValidator
+                   (없어도 존재하지 않는 날짜/시간 줄은 무시)
+        
+    Returns:
+        dict: date(1970-01-01 기준 일수, int32), seconds(자정 기준 초, int32),
+              code(int8), card(카드번호 바이트 문자열) 컬럼
+    """
+    newlines = np.flatnonzero(buf == _NEWLINE)
+    starts = np.concatenate(([0], newlines + 1))
+    ends = np.concatenate((newlines, [len(buf)]))
+    
+    # 줄 끝 공백/CR 제거
+    while True:
+        trailing = (ends > starts) & np.isin(buf[np.maximum(ends - 1, 0)], _TRAILING_BLANKS)
+        if not trailing.any():
+            break
+        ends = ends - trailing
+    
+    lengths = ends - starts
+    keep = lengths >= max(min_length, HEADER_WIDTH)
+    short = ~keep & (lengths > 0)
+    
+    # 날짜/시간/코드 영역 숫자 추출
+    header = buf[starts[keep, None] + np.arange(HEADER_WIDTH)].astype('int32') - _ZERO
+    numeric = ((header >= 0) & (header <= 9)).all(axis=1)
+    keep[keep] = numeric
+    header = header[numeric]
+    
+    fields = (
+        header[:, 0] * 1000 + header[:, 1] * 100 + header[:, 2] * 10 + header[:, 3],
+        header[:, 4] * 10 + header[:, 5],
+        header[:, 6] * 10 + header[:, 7],
+        header[:, 8] * 10 + header[:, 9],
+        header[:, 10] * 10 + header[:, 11],
+        header[:, 12] * 10 + header[:, 13]
+    )
+    
+    # 검증기가 없어도 존재하지 않는 날짜/시간은 제외 (32일이 다음 달 1일로 넘어가는 등의 오계산 방지,
+    # 검증기가 있으면 사유와 함께 격리)
+    if validator is None:
+        bad_date, bad_time = date_time_errors(*fields)
+        in_range = ~(bad_date | bad_time)
+        if not in_range.all():
+            keep[keep] = in_range
+            header = header[in_range]
+            fields = tuple(field[in_range] for field in fields)
+    
+    if rejected is not None:
+        for row in np.flatnonzero(~keep & (lengths > 0)):
+            rejected.append(buf[starts[row]:ends[row]].tobytes())
+    
+    line_starts, line_ends = starts, ends
+    record_lines = np.flatnonzero(keep)
+    starts = starts[keep]
+    lengths = lengths[keep]
+    year, month, day, hours, minutes, seconds = fields
+    
+    # 카드번호 (가변 길이는 길이별로 묶어서 추출)
+    card_width = int(lengths.max()) - HEADER_WIDTH if len(lengths) else 0
+    card = np.zeros(len(starts), dtype=f'S{max(card_width, 1)}')
+    for length in np.unique(lengths):
+        rows = np.flatnonzero(lengths == length)
+        width = int(length) - HEADER_WIDTH
+        if width == 0:
+            continue
+        raw = buf[starts[rows, None] + HEADER_WIDTH + np.arange(width)]
+        card[rows] = np.ascontiguousarray(raw).view(f'S{width}').ravel()
+    
+    columns = {
+        'date': days_from_civil(year, month, day),
+        'seconds': (hours * 3600 + minutes * 60 + seconds).astype('int32'),
+        'code': header[:, 14].astype('int8'),
+        'card': card,
+    }
+    
+    if validator is None:
+        return columns
+    
+    # 디코딩 전에 걸러진 줄의 사유 (빈 줄은 사유 없음)
+    line_reasons = np.where(short, SHORT_LINE, 0).astype('int8')
+    line_reasons[~keep & (line_ends > line_starts) & ~short] = BAD_HEADER
+    
+    return validator.apply(
+        buf, line_starts, line_ends, line_reasons, record_lines, (year, month, day, hours, minutes, seconds), columns
+    )
+
+
+def iter_punch_chunks(file_path, chunk_bytes=DEFAULT_CHUNK_BYTES, min_length=HEADER_WIDTH, validator=None):
+    """
+    출퇴근 로그 파일을 메모리 맵으로 열어 청크 단위로 디코딩
+    
+    Args:
+        file_path: TXT 파일 경로
+        chunk_bytes: 청크 크기 (바이트, 줄 경계에 맞춰 조정)
+        min_length: 유효 레코드 최소 길이
+        validator: 지정 시 청크마다 적용할 PunchValidator
+        
+    Yields:
+        dict: decode_punch_chunk 결과 컬럼
+    """
+    if os.path.getsize(file_path) == 0:
+        return
+    
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        size = len(mm)
+        pos = len(_UTF8_BOM) if mm[:len(_UTF8_BOM)] == _UTF8_BOM else 0
+        
+        while pos < size:
+            end = min(pos + chunk_bytes, size)
+            
+            # 청크를 마지막 줄바꿈 위치에 맞춤
+            if end < size:
+                last_newline = mm.rfind(b'\n', pos, end)
+                if last_newline == -1:
+                    last_newline = mm.find(b'\n', end)
+                end = size if last_newline == -1 else last_newline + 1
+            
+            buf = np.frombuffer(mm, dtype=np.uint8, count=end - pos, offset=pos)
+            columns = decode_punch_chunk(buf, min_length, validator=validator)
+            del buf
+            
+            yield columns
+            pos = end
+
+
+def read_punch_file(file_path, min_length=HEADER_WIDTH, rejected=None, validator=None):
+    """
+    출퇴근 로그 파일 전체를 한 번에 읽어 디코딩
+    
+    Args:
+        file_path: TXT 파일 경로
+        min_length: 유효 레코드 최소 길이
+        rejected: 지정 시 무시된 줄의 원본 바이트를 추가할 리스트
+        validator: 지정 시 적용할 PunchValidator
+        
+    Returns:
+        dict: decode_punch_chunk 결과 컬럼
+    """
+    with open(file_path, 'rb') as f:
+        content = f.read()
+    
+    if content.startswith(_UTF8_BOM):
+        content = content[len(_UTF8_BOM):]
+    
+    return decode_punch_chunk(np.frombuffer(content, dtype=np.uint8), min_length, rejected, validator)
+
+
+class PunchAggregate:
+    """
+    출퇴근 기록을 (날짜, 카드번호)별 첫 출근/마지막 퇴근/기록 수로 축약한 결과
+    
+    (날짜, 카드번호)를 정수 키로 만들어 해시 그룹화(factorize)로 한 번에 집계하며,
+    부분 집계끼리 병합할 수 있음
+    """
+    
+    def __init__(self, date, card, first_in, last_out, punch_count):
+        """
+        초기화
+        
+        Args:
+            date: 1970-01-01 기준 일수 배열
+            card: 카드번호 바이트 문자열 배열
+            first_in: 첫 출근 시간 배열 (자정 기준 초, 없으면 -1)
+            last_out: 마지막 퇴근 시간 배열 (자정 기준 초, 없으면 -1)
+            punch_count: 기록 수 배열
+        """
+        self.date = date
+        self.card = card
+        self.first_in = first_in
+        self.last_out = last_out
+        self.punch_count = punch_count
+    
+    
+    def __len__(self):
+        return len(self.date)
+    
+    
+    @classmethod
+    def empty(cls):
+        """빈 집계 결과"""
+        return cls(
+            np.zeros(0, dtype='int32'),
+            np.zeros(0, dtype='S1'),
+            np.zeros(0, dtype='int32'),
+            np.zeros(0, dtype='int32'),
+            np.zeros(0, dtype='int32')
+        )
+    
+    
+    @classmethod
+    def from_columns(cls, columns):
+        """
+        디코딩된 출퇴근 기록 컬럼을 집계
+        
+        Args:
+            columns: date, seconds, code, card 컬럼 딕셔너리
+            
+        Returns:
+            PunchAggregate: 집계 결과
+        """
+        seconds = columns['seconds']
+        code = columns['code']
+        
+        return cls._reduce(
+            columns['date'],
+            columns['card'],
+            np.where(code == 1, seconds, -1).astype('int32'),
+            np.where(code == 2, seconds, -1).astype('int32'),
+            np.ones(len(seconds), dtype='int32')
+        )
+    
+    
+    @classmethod
+    def concat(cls, aggregates):
+        """
+        여러 부분 집계를 하나로 병합
+        
+        Args:
+            aggregates: PunchAggregate 리스트
+            
+        Returns:
+            PunchAggregate: 병합된 집계 결과
+        """
+        aggregates = [aggregate for aggregate in aggregates if len(aggregate)]
+        
+        if not aggregates:
+            return cls.empty()
+        if len(aggregates) == 1:
+            return aggregates[0]
+        
+        return cls._reduce(*(
+            np.concatenate([getattr(aggregate, name) for aggregate in aggregates])
+            for name in ('date', 'card', 'first_in', 'last_out', 'punch_count')
+        ))
+    
+    
+    @classmethod
+    def concat_rows(cls, aggregates):
+        """
+        여러 집계 결과의 행을 축약 없이 순서대로 이어 붙임
+        
+        Args:
+            aggregates: PunchAggregate 리스트
+            
+        Returns:
+            PunchAggregate: 이어 붙인 집계 결과
+        """
+        return cls(*(
+            np.concatenate([getattr(aggregate, name) for aggregate in aggregates])
+            for name in ('date', 'card', 'first_in', 'last_out', 'punch_count')
+        ))
+    
+    
+    def merge(self, other):
+        """
+        다른 부분 집계와 병합
+        
+        Args:
+            other: PunchAggregate
+            
+        Returns:
+            PunchAggregate: 병합된 집계 결과
+        """
+        return PunchAggregate.concat([self, other])
+    
+    
+    @classmethod
+    def _reduce(cls, date, card, first_in, last_out, punch_count):
+        """
+        (날짜, 카드번호) 정수 키 해시 그룹별 최소 출근/최대 퇴근/기록 수 합계 계산 (선형 시간)
+        """
+        if len(date) == 0:
+            return cls.empty()
+        
+        no_check_in = np.iinfo('int32').max
+        card_codes, card_values = pd.factorize(card)
+        card_values = np.asarray(card_values, dtype=card.dtype)
+        keys = date.astype('int64') * len(card_values) + card_codes
+        group_ids, group_keys = pd.factorize(keys)
+        group_count = len(group_keys)
+        
+        # 출근은 가장 빠른 시간 (출근 기록 없음(-1)은 제외)
+        reduced_in = np.full(group_count, no_check_in, dtype='int32')
+        np.minimum.at(reduced_in, group_ids, np.where(first_in >= 0, first_in, no_check_in))
+        reduced_in[reduced_in == no_check_in] = -1
+        
+        # 퇴근은 가장 늦은 시간
+        reduced_out = np.full(group_count, -1, dtype='int32')
+        np.maximum.at(reduced_out, group_ids, last_out)
+        
+        reduced_count = np.zeros(group_count, dtype='int32')
+        np.add.at(reduced_count, group_ids, punch_count)
+        
+        return cls(
+            (group_keys // len(card_values)).astype('int32'),
+            card_values[group_keys % len(card_values)],
+            reduced_in,
+            reduced_out,
+            reduced_count
+        )
+    
+    
+    def select(self, other):
+        """
+        다른 집계 결과에 포함된 (날짜, 카드번호)만 선택
+        
+        Args:
+            other: PunchAggregate
+            
+        Returns:
+            PunchAggregate: 선택된 집계 결과
+        """
+        keys = pd.MultiIndex.from_arrays([self.date, self.card])
+        return self.take(keys.isin(pd.MultiIndex.from_arrays([other.date, other.card])))
+    
+    
+    def take(self, rows):
+        """
+        행 위치(또는 불리언 마스크)로 선택한 집계 결과
+        
+        Args:
+            rows: 행 위치 배열 또는 불리언 마스크
+            
+        Returns:
+            PunchAggregate: 선택된 집계 결과
+        """
+        return PunchAggregate(
+            self.date[rows],
+            self.card[rows],
+            self.first_in[rows],
+            self.last_out[rows],
+            self.punch_count[rows]
+        )
+    
+    
+    def sorted(self):
+        """
+        날짜, 카드번호 순으로 정렬된 집계 결과
+        
+        Returns:
+            PunchAggregate: 정렬된 집계 결과
+        """
+        return self.take(np.lexsort((self.card, self.date)))
+    
+    
+    def sort_keys(self, card_width=None):
+        """
+        (날짜, 카드번호) 순으로 비교되는 구조화 키 배열 (sorted() 순서와 같은 순서, 이진 탐색용)
+        
+        Args:
+            card_width: 카드번호 바이트 폭 (다른 키 배열과 비교할 때 맞춤, 기본: 현재 폭)
+            
+        Returns:
+            ndarray: date, card 필드의 구조화 배열
+        """
+        keys = np.empty(len(self), dtype=[('date', 'int32'), ('card', f'S{card_width or self.card.dtype.itemsize}')])
+        keys['date'] = self.date
+        keys['card'] = self.card
+        return keys
+    
+    
+    def to_frame(self, compact=False):
+        """
+        날짜, 카드번호 순으로 정렬한 데이터프레임으로 변환
+        
+        Args:
+            compact: True면 정수 날짜/시간 + 범주형 카드번호 (daily_records.compact_frame),
+                     False면 문자열 컬럼
+            
+        Returns:
+            DataFrame: date, check_in, check_out, card_number, punch_count 컬럼
+        """
+        ordered = self.sorted()
+        
+        if compact:
+            return compact_frame(ordered.date, ordered.first_in, ordered.last_out, ordered.card, ordered.punch_count)
+        
+        return pd.DataFrame({
+            'date': format_dates(ordered.date),
+            'check_in': format_seconds(ordered.first_in),
+            'check_out': format_seconds(ordered.last_out),
+            'card_number': ordered.card.astype(str).astype(object),
+            'punch_count': ordered.punch_count
+        })
+
+
+def concat_punch_columns(chunks):
+    """
+    청크별로 디코딩된 출퇴근 기록 컬럼을 하나로 연결
+    
+    Args:
+        chunks: decode_punch_chunk 결과 딕셔너리 리스트
+        
+    Returns:
+        dict: date, seconds, code, card 컬럼
+    """
+    chunks = list(chunks)
+    
+    if not chunks:
+        return {
+            'date': np.zeros(0, dtype='int32'),
+            'seconds': np.zeros(0, dtype='int32'),
+            'code': np.zeros(0, dtype='int8'),
+            'card': np.zeros(0, dtype='S1'),
+        }
+    
+    return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in ('date', 'seconds', 'code', 'card')}
+
+
+class ShiftRecords:
+    """
+    출퇴근 기록을 카드별 근무(shift) 단위로 짝지은 결과
+    
+    날짜 경계와 무관하게 (카드번호, 시각) 순으로 한 번 정렬한 뒤 배열 연산으로
+    출근 기록부터 최대 근무 시간 안의 기록을 한 근무로 묶는다 (자정을 넘는 야간 근무 포함).
+    출근 없이 남은 퇴근 기록은 출근 시각이 없는 근무로 남는다.
+    """
+    
+    def __init__(self, card, start, end, punch_count):
+        """
+        초기화
+        
+        Args:
+            card: 카드번호 바이트 문자열 배열
+            start: 근무 시작 시각 배열 (1970-01-01 기준 초, 없으면 -1)
+            end: 근무 종료 시각 배열 (1970-01-01 기준 초, 없으면 -1)
+            punch_count: 기록 수 배열
+        """
+        self.card = card
+        self.start = start
+        self.end = end
+        self.punch_count = punch_count
+    
+    
+    def __len__(self):
+        return len(self.card)
+    
+    
+    @classmethod
+    def from_columns(cls, columns, max_shift_hours=DEFAULT_MAX_SHIFT_HOURS):
+        """
+        디코딩된 출퇴근 기록 컬럼을 근무 단위로 짝지음 (정렬 O(n log n) + 배열 연산)
+        
+        Args:
+            columns: date, seconds, code, card 컬럼 딕셔너리
+            max_shift_hours: 최대 근무 시간 (시간, 24 미만)
+            
+        Returns:
+            ShiftRecords: 근무 기록
+        """
+        if not 0 < max_shift_hours < 24:
+            raise ValueError(f"최대 근무 시간은 0보다 크고 24시간 미만이어야 합니다: {max_shift_hours}")
+        
+        card_codes, card_values = pd.factorize(columns['card'])
+        card_values = np.asarray(card_values, dtype=columns['card'].dtype)
+        timestamps = columns['date'].astype('int64') * SECONDS_PER_DAY + columns['seconds']
+        code = columns['code']
+        
+        # 카드번호, 시각 순 정렬 (같은 시각이면 출근 기록 먼저)
+        order = np.lexsort((code, timestamps, card_codes))
+        card_codes = card_codes[order]
+        timestamps = timestamps[order]
+        code = code[order]
+        
+        new_shift = cls._shift_boundaries(card_codes, timestamps, code, int(max_shift_hours * 3600))
+        shift_ids = np.cumsum(new_shift) - 1
+        shift_count = int(shift_ids[-1]) + 1 if len(shift_ids) else 0
+        
+        # 시작은 근무의 첫 출근(기준 기록), 종료는 마지막 퇴근
+        start = np.full(shift_count, -1, dtype='int64')
+        first_in = new_shift & (code == 1)
+        start[shift_ids[first_in]] = timestamps[first_in]
+        
+        end = np.full(shift_count, -1, dtype='int64')
+        np.maximum.at(end, shift_ids, np.where(code == 2, timestamps, -1))
+        
+        return cls(
+            card_values[card_codes[new_shift]],
+            start,
+            end,
+            np.bincount(shift_ids, minlength=shift_count).astype('int32')
+        )
+    
+    
+    @staticmethod
+    def _shift_boundaries(card_codes, timestamps, codes, max_shift_seconds):
+        """
+        정렬된 기록에서 새 근무가 시작되는 위치 표시 (기록 단위 반복 없음)
+        
+        카드가 바뀌거나, 근무 기준 기록으로부터 최대 근무 시간을 넘거나,
+        출근 없이 시작된 근무 중에 출근 기록이 나오면 새 근무를 시작한다.
+        기록마다 '이 기록에서 근무가 시작되면 다음 근무가 시작되는 위치'를 이진 탐색으로 한 번에 구하고,
+        첫 기록부터 이어지는 시작 위치들을 포인터 배가(pointer doubling)로 표시한다
+        (배열 연산 O(n log(근무 수))).
+        
+        Args:
+            card_codes: 카드 코드 배열 (카드 코드, 시각 순 정렬)
+            timestamps: 시각 배열 (초)
+            codes: 기록 코드 배열 (1: 출근, 2: 퇴근)
+            max_shift_seconds: 최대 근무 시간 (초)
+            
+        Returns:
+            ndarray: 새 근무 시작 여부 (bool)
+        """
+        count = len(card_codes)
+        if not count:
+            return np.zeros(0, dtype=bool)
+        
+        # (카드, 시각) 결합 키: 카드 사이 간격이 최대 근무 시간보다 커서 탐색이 다음 카드로 넘어가면 카드 경계
+        base = int(timestamps.min())
+        span = int(timestamps.max()) - base + max_shift_seconds + 1
+        keys = card_codes.astype('int64') * span + (timestamps - base)
+        following = np.searchsorted(keys, keys + max_shift_seconds, side='right')
+        
+        # 출근 없이 시작된 근무는 다음 출근 기록에서 끝남 (카드 경계보다 뒤면 카드 경계가 먼저)
+        check_in_positions = np.where(codes == 1, np.arange(count), count)
+        next_check_in = np.append(np.minimum.accumulate(check_in_positions[::-1])[::-1][1:], count)
+        following = np.where(codes == 1, following, np.minimum(following, next_check_in))
+        
+        # 카드별 첫 기록에서 시작하는 사슬 (following은 항상 자기 위치보다 뒤, count는 끝 표시)
+        # 카드별 첫 기록은 항상 근무 시작이므로 반복 횟수는 카드별 근무 수의 log
+        jump = np.append(following, count)
+        on_chain = np.zeros(count + 1, dtype=bool)
+        on_chain[0] = True
+        on_chain[1:count] = card_codes[1:] != card_codes[:-1]
+        while True:
+            reached = jump[on_chain]
+            if on_chain[reached].all():
+                break
+            on_chain[reached] = True
+            jump = jump[jump]
+        
+        return on_chain[:count]
+    
+    
+    def to_frame(self, compact=False):
+        """
+        근무 시작일, 카드번호 순으로 정렬한 데이터프레임으로 변환
+        
+        date는 근무 시작일(출근 없으면 퇴근일)이며, check_in/check_out은 시작일/종료일 기준 시각이라
+        AttendanceCalculator.calculate_all에 그대로 넣으면 자정을 넘는 근무도 계산된다.
+        
+        Args:
+            compact: True면 정수 날짜/시간 + 범주형 카드번호, False면 문자열 컬럼
+            
+        Returns:
+            DataFrame: date, check_in, check_out, card_number, punch_count, start_at, end_at 컬럼
+        """
+        anchor = np.where(self.start >= 0, self.start, self.end)
+        days = anchor // SECONDS_PER_DAY
+        order = np.lexsort((self.start, self.card, days))
+        start = self.start[order]
+        end = self.end[order]
+        check_in = np.where(start >= 0, start % SECONDS_PER_DAY, -1)
+        check_out = np.where(end >= 0, end % SECONDS_PER_DAY, -1)
+        
+        if compact:
+            shifts = compact_frame(days[order], check_in, check_out, self.card[order], self.punch_count[order])
+            shifts['start_at'] = _to_datetimes(start)
+            shifts['end_at'] = _to_datetimes(end)
+            return shifts
+        
+        return pd.DataFrame({
+            'date': format_dates(days[order]),
+            'check_in': format_seconds(check_in),
+            'check_out': format_seconds(check_out),
+            'card_number': self.card[order].astype(str).astype(object),
+            'punch_count': self.punch_count[order],
+            'start_at': _to_datetimes(start),
+            'end_at': _to_datetimes(end)
+        })
+
+
+def _to_datetimes(seconds):
+    """1970-01-01 기준 초 배열을 datetime64 배열로 변환 (음수는 NaT)"""
+    values = np.maximum(seconds, 0).astype('datetime64[s]')
+    values[seconds < 0] = np.datetime64('NaT')
+    return values
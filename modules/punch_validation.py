@@ -0,0 +1,299 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+
+# 격리 사유 코드 (0은 통과)
+VALID = 0
+SHORT_LINE = 1
+BAD_HEADER = 2
+BAD_DATE = 3
+BAD_TIME = 4
+BAD_CODE = 5
+BAD_CARD = 6
+DUPLICATE = 7
+
+REASON_NAMES = {
+    SHORT_LINE: 'SHORT_LINE',
+    BAD_HEADER: 'BAD_HEADER',
+    BAD_DATE: 'BAD_DATE',
+    BAD_TIME: 'BAD_TIME',
+    BAD_CODE: 'BAD_CODE',
+    BAD_CARD: 'BAD_CARD',
+    DUPLICATE: 'DUPLICATE'
+}
+
+REASON_LABELS = {
+    SHORT_LINE: '최소 길이 미만',
+    BAD_HEADER: '날짜/시간/코드 영역에 숫자가 아닌 문자',
+    BAD_DATE: '존재하지 않는 날짜',
+    BAD_TIME: '범위를 벗어난 시간',
+    BAD_CODE: '출퇴근 코드가 1/2가 아님',
+    BAD_CARD: '카드번호에 숫자가 아닌 문자',
+    DUPLICATE: '중복 전송된 기록'
+}
+
+# 출퇴근 코드 (1=출근, 2=퇴근)
+PUNCH_CODES = (1, 2)
+
+_DAYS_IN_MONTH = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype='int32')
+_DIGIT_0 = ord('0')
+_DIGIT_9 = ord('9')
+
+# record_hashes의 레코드 해시 비트 (상위 16비트는 날짜)
+_HASH_MASK = np.uint64((1 << 48) - 1)
+
+
+def date_time_errors(year, month, day, hours, minutes, seconds):
+    """
+    존재하지 않는 날짜 / 범위를 벗어난 시간 검사 (행 단위 반복 없음)
+    
+    Args:
+        year, month, day, hours, minutes, seconds: 날짜/시간 필드 정수 배열
+        
+    Returns:
+        tuple: (날짜 오류 여부 배열, 시간 오류 여부 배열)
+    """
+    # 날짜: 월 1~12, 일 1~해당 월 일수 (윤년 2월 29일 포함)
+    valid_month = (month >= 1) & (month <= 12)
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    month_days = _DAYS_IN_MONTH[np.where(valid_month, month, 0)] + (leap & (month == 2))
+    bad_date = ~valid_month | (day < 1) | (day > month_days)
+    
+    bad_time = (hours > 23) | (minutes > 59) | (seconds > 59)
+    return bad_date, bad_time
+
+
+def field_reasons(year, month, day, hours, minutes, seconds, code, card):
+    """
+    디코딩된 레코드 배열의 범위/코드/카드 형식 검사 (행 단위 반복 없음)
+    
+    Args:
+        year, month, day, hours, minutes, seconds: 날짜/시간 필드 정수 배열
+        code: 출퇴근 코드 배열
+        card: 카드번호 바이트 문자열 배열 (고정폭, 짧은 값은 NUL 채움)
+        
+    Returns:
+        ndarray: 레코드별 사유 코드 (int8, 0은 통과, 여러 사유면 앞선 검사의 사유)
+    """
+    reasons = np.zeros(len(year), dtype='int8')
+    
+    bad_date, bad_time = date_time_errors(year, month, day, hours, minutes, seconds)
+    bad_code = ~np.isin(code, PUNCH_CODES)
+    
+    # 카드번호: 숫자로만 구성 (고정폭 배열의 NUL 채움은 허용)
+    width = card.dtype.itemsize
+    card_bytes = np.ascontiguousarray(card).view(np.uint8).reshape(len(card), width)
+    digits = (card_bytes >= _DIGIT_0) & (card_bytes <= _DIGIT_9)
+    padding = np.cumsum(card_bytes == 0, axis=1) > 0
+    bad_card = ~(digits | padding).all(axis=1) | (card_bytes[:, 0] == 0) | (digits & padding).any(axis=1)
+    
+    # 뒤 검사부터 채워 앞선 검사의 사유가 남도록 함
+    for mask, reason in ((bad_card, BAD_CARD), (bad_code, BAD_CODE), (bad_time, BAD_TIME), (bad_date, BAD_DATE)):
+        reasons[mask] = reason
+    
+    return reasons
+
+
+def record_hashes(columns):
+    """
+    레코드별 64비트 해시 (날짜, 시간, 코드, 카드번호가 모두 같으면 같은 값)
+    
+    상위 16비트는 날짜(1970-01-01 기준 일수), 하위 48비트는 레코드 해시이므로 정렬하면 날짜 순으로 모인다.
+    (월 중에 추가되는 기록의 해시는 정렬 배열 끝부분에 들어감)
+    
+    Args:
+        columns: decode_punch_chunk 결과 컬럼 (검증을 통과한 레코드)
+        
+    Returns:
+        ndarray: uint64 해시 배열
+    """
+    hashes = pd.util.hash_pandas_object(pd.DataFrame({
+        'date': columns['date'],
+        'seconds': columns['seconds'],
+        'code': columns['code'],
+        'card': columns['card'].astype(object)
+    }), index=False).to_numpy()
+    return (np.asarray(columns['date'], dtype='uint64') << np.uint64(48)) | (hashes & _HASH_MASK)
+
+
+def contains_sorted(sorted_values, values):
+    """
+    정렬 배열에 값이 있는지 이진 탐색으로 확인 (정렬 배열 전체를 읽지 않음)
+    
+    Args:
+        sorted_values: 정렬된 배열
+        values: 찾을 값 배열
+        
+    Returns:
+        ndarray: 값별 포함 여부
+    """
+    positions = np.searchsorted(sorted_values, values)
+    found = np.zeros(len(values), dtype=bool)
+    inside = positions < len(sorted_values)
+    found[inside] = sorted_values[positions[inside]] == values[inside]
+    return found
+
+
+def insert_sorted(sorted_values, values):
+    """
+    정렬 배열에 없는 값들을 정렬 순서를 유지하며 삽입 (전체 재정렬 없음)
+    
+    Args:
+        sorted_values: 정렬된 배열
+        values: 정렬 배열에 없는 서로 다른 값 배열
+        
+    Returns:
+        ndarray: 삽입된 정렬 배열
+    """
+    values = np.sort(values)
+    return np.insert(sorted_values, np.searchsorted(sorted_values, values), values)
+
+
+class PunchValidator:
+    """
+    출퇴근 로그 검증 단계 (decode_punch_chunk에 validator로 전달)
+    
+    청크마다 디코딩된 컬럼 전체에 날짜/시간 범위, 출퇴근 코드, 카드번호 형식 검사를 한 번에 적용하고,
+    레코드 해시로 청크 간 중복 전송 기록을 제거한다. 걸러진 줄은 줄 번호/사유 코드와 함께 모아
+    격리 파일로 저장하고, 실행 로그에는 사유별 건수만 남긴다.
+    """
+    
+    def __init__(self, deduplicate=True):
+        """
+        초기화
+        
+        Args:
+            deduplicate: 같은 기록이 다시 전송된 줄 제거 여부
+        """
+        self.deduplicate = deduplicate
+        self.lines = 0
+        self.accepted = 0
+        self.counts = {reason: 0 for reason in REASON_NAMES}
+        
+        # 청크별 격리 줄: (줄 번호 배열, 사유 코드 배열, 원본 줄을 이어 붙인 바이트, 줄 경계 배열)
+        self.quarantined = []
+        
+        # 지금까지 통과한 레코드 해시 (정렬 배열)
+        self._seen = np.empty(0, dtype='uint64')
+    
+    
+    def restore(self, lines, seen):
+        """
+        이전에 검증한 줄 수와 통과 레코드 해시에서 이어서 검증 (증분 처리, 조회 서비스)
+        
+        Args:
+            lines: 이미 검증한 줄 수 (격리 파일 줄 번호가 이어지도록)
+            seen: 이미 통과한 레코드 해시 정렬 배열 (seen 속성 값, 읽기 전용 memory map 가능)
+        """
+        self.lines = lines
+        self._seen = seen
+    
+    
+    @property
+    def seen(self):
+        """지금까지 통과한 레코드 해시 (정렬 배열, 중복 제거를 하지 않으면 빈 배열)"""
+        return self._seen
+    
+    
+    def apply(self, buf, line_starts, line_ends, line_reasons, rows, fields, columns):
+        """
+        청크 하나의 디코딩 결과 검증 (청크 순서대로 호출)
+        
+        Args:
+            buf: 청크 uint8 배열
+            line_starts: 줄 시작 위치 배열
+            line_ends: 줄 끝 위치 배열 (줄 끝 공백 제외)
+            line_reasons: 줄별 사유 코드 (디코딩 전에 걸러진 줄은 SHORT_LINE/BAD_HEADER)
+            rows: 디코딩된 레코드의 청크 내 줄 위치 배열
+            fields: (year, month, day, hours, minutes, seconds) 정수 배열
+            columns: decode_punch_chunk 결과 컬럼
+            
+        Returns:
+            dict: 검사를 통과한 레코드만 남긴 컬럼
+        """
+        record_reasons = field_reasons(*fields, columns['code'], columns['card'])
+        passed = record_reasons == VALID
+        
+        if self.deduplicate and passed.any():
+            hashes = record_hashes({name: column[passed] for name, column in columns.items()})
+            
+            # 청크 안에서는 첫 번째만, 이전 청크에 있던 기록은 모두 중복
+            first = np.zeros(len(hashes), dtype=bool)
+            first[np.unique(hashes, return_index=True)[1]] = True
+            duplicate = ~first | contains_sorted(self._seen, hashes)
+            
+            record_reasons[np.flatnonzero(passed)[duplicate]] = DUPLICATE
+            passed = record_reasons == VALID
+            self._seen = insert_sorted(self._seen, hashes[~duplicate])
+        
+        line_reasons[rows] = record_reasons
+        self._quarantine(buf, line_starts, line_ends, line_reasons)
+        
+        # 마지막 줄바꿈 뒤의 빈 구간은 줄 수에서 제외
+        self.lines += len(line_starts) - int(len(buf) > 0 and buf[-1] == ord('\n'))
+        self.accepted += int(passed.sum())
+        
+        return {name: column[passed] for name, column in columns.items()}
+    
+    
+    def _quarantine(self, buf, line_starts, line_ends, line_reasons):
+        """걸러진 줄의 원본 바이트를 한 번에 모아 보관하고 사유별 건수 누적 (줄 단위 복사 없음)"""
+        rows = np.flatnonzero(line_reasons != VALID)
+        if not len(rows):
+            return
+        
+        reasons = line_reasons[rows]
+        for reason, count in zip(*np.unique(reasons, return_counts=True)):
+            self.counts[int(reason)] += int(count)
+        
+        lengths = line_ends[rows] - line_starts[rows]
+        bounds = np.concatenate(([0], np.cumsum(lengths)))
+        positions = np.repeat(line_starts[rows] - bounds[:-1], lengths) + np.arange(bounds[-1])
+        
+        self.quarantined.append((self.lines + rows + 1, reasons, buf[positions].tobytes(), bounds))
+    
+    
+    @property
+    def rejected(self):
+        """걸러진 줄 수"""
+        return sum(len(line_numbers) for line_numbers, _, _, _ in self.quarantined)
+    
+    
+    def summary(self):
+        """
+        검증 결과 건수
+        
+        Returns:
+            dict: lines(전체 줄 수), accepted(통과 레코드 수), rejected(격리 줄 수),
+                  reasons({사유 코드 이름: 건수}, 0건 사유 제외)
+        """
+        return {
+            'lines': self.lines,
+            'accepted': self.accepted,
+            'rejected': self.rejected,
+            'reasons': {REASON_NAMES[reason]: count for reason, count in self.counts.items() if count}
+        }
+    
+    
+    def write_quarantine(self, quarantine_path, append=False):
+        """
+        격리된 줄을 파일로 저장 (줄 번호, 사유 코드, 원본 줄을 탭으로 구분)
+        
+        Args:
+            quarantine_path: 격리 파일 경로
+            append: True면 기존 격리 파일 끝에 덧붙임 (증분 처리)
+            
+        Returns:
+            int: 저장한 줄 수
+        """
+        append = append and os.path.exists(quarantine_path)
+        with open(quarantine_path, 'ab' if append else 'wb') as f:
+            if not append:
+                f.write(b'# line\treason\trecord\n')
+            for line_numbers, reasons, raw, bounds in self.quarantined:
+                for line_number, reason, start, end in zip(line_numbers, reasons, bounds[:-1], bounds[1:]):
+                    f.write(f'{line_number}\t{REASON_NAMES[reason]}\t'.encode('ascii') + raw[start:end] + b'\n')
+        
+        return self.rejected
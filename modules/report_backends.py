@@ -0,0 +1,116 @@
+import importlib.util
+from abc import ABC, abstractmethod
+
+
+# 리포트 출력 형식별 파일 확장자 ('xlsx'는 스타일 적용 엑셀, 나머지는 기계 처리용 단일 테이블)
+REPORT_FORMATS = {
+    'xlsx': '.xlsx',
+    'csv': '.csv',
+    'parquet': '.parquet',
+    'jsonl': '.jsonl'
+}
+
+# 스트리밍 기록 단위 (행)
+STREAM_ROWS = 50000
+
+
+def available_formats():
+    """
+    현재 환경에서 사용할 수 있는 출력 형식 (Parquet은 pyarrow가 설치된 경우만)
+    
+    Returns:
+        list: 출력 형식 이름 리스트
+    """
+    return [name for name in REPORT_FORMATS if name != 'parquet' or importlib.util.find_spec('pyarrow')]
+
+
+def create_backend(output_format):
+    """
+    출력 형식 이름으로 리포트 백엔드 생성
+    
+    openpyxl은 엑셀 백엔드를 만들 때만, pyarrow는 Parquet 파일을 기록할 때만 import한다.
+    
+    Args:
+        output_format: 'xlsx', 'csv', 'parquet', 'jsonl'
+        
+    Returns:
+        ReportBackend: 리포트 백엔드
+    """
+    if output_format not in REPORT_FORMATS:
+        raise ValueError(f"지원하지 않는 리포트 형식입니다: {output_format} (지원: {', '.join(REPORT_FORMATS)})")
+    if output_format not in available_formats():
+        raise ValueError(f"{output_format} 리포트를 만들려면 pyarrow가 필요합니다")
+    
+    if output_format == 'xlsx':
+        from modules.excel_backend import ExcelBackend
+        return ExcelBackend()
+    
+    return {'csv': CsvBackend, 'parquet': ParquetBackend, 'jsonl': JsonLinesBackend}[output_format]()
+
+
+class ReportBackend(ABC):
+    """
+    리포트 출력 백엔드 (ReportGenerator가 만든 레이아웃 DataFrame을 파일로 기록)
+    
+    레이아웃(컬럼 구성/이름)은 ReportGenerator가 모든 형식에 같게 만들고,
+    백엔드는 기록 방식만 담당한다.
+    """
+    
+    extension = None
+    
+    @abstractmethod
+    def write(self, data, output_path, sheet_by, drop_sheet_column=False):
+        """
+        리포트 기록
+        
+        Args:
+            data: 리포트 레이아웃 DataFrame
+            output_path: 출력 파일 경로
+            sheet_by: 엑셀에서 시트를 나눌 컬럼 (단일 테이블 형식은 컬럼으로 유지)
+            drop_sheet_column: 엑셀 시트에서 sheet_by 컬럼 제외 여부
+        """
+    
+    
+    @staticmethod
+    def _chunks(data):
+        """STREAM_ROWS 행 단위 파티션"""
+        for start in range(0, len(data), STREAM_ROWS):
+            yield data.iloc[start:start + STREAM_ROWS]
+
+
+class CsvBackend(ReportBackend):
+    """UTF-8 CSV (헤더 1줄 + 행 단위 스트리밍 기록)"""
+    
+    extension = REPORT_FORMATS['csv']
+    
+    def write(self, data, output_path, sheet_by, drop_sheet_column=False):
+        data.to_csv(output_path, index=False, encoding='utf-8', chunksize=STREAM_ROWS)
+
+
+class JsonLinesBackend(ReportBackend):
+    """JSON Lines (행마다 컬럼명을 키로 한 JSON 객체, 누락 값은 null)"""
+    
+    extension = REPORT_FORMATS['jsonl']
+    
+    def write(self, data, output_path, sheet_by, drop_sheet_column=False):
+        with open(output_path, 'w', encoding='utf-8') as f:
+            for chunk in self._chunks(data):
+                text = chunk.to_json(orient='records', lines=True, force_ascii=False)
+                f.write(text if text.endswith('\n') else text + '\n')
+
+
+class ParquetBackend(ReportBackend):
+    """Parquet (STREAM_ROWS 행마다 row group 하나, 범주형 컬럼은 사전 인코딩)"""
+    
+    extension = REPORT_FORMATS['parquet']
+    
+    def write(self, data, output_path, sheet_by, drop_sheet_column=False):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        schema = pa.Schema.from_pandas(data, preserve_index=False)
+        with pq.ParquetWriter(output_path, schema) as writer:
+            for chunk in self._chunks(data):
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            if not len(data):
+                writer.write_table(schema.empty_table())
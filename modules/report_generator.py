@@ -1,197 +1,298 @@
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
-from openpyxl.utils.dataframe import dataframe_to_rows
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from modules.daily_records import to_display
+from modules.employee_directory import EmployeeDirectory
+from modules.metrics import StageMetrics
+from modules.report_backends import REPORT_FORMATS, create_backend
+
+
+# 파일명에 사용할 수 없는 문자
+INVALID_FILENAME_PATTERN = r'[\\/:*?"<>|]'
+
+# 리포트 레이아웃: 일별 데이터 컬럼 → 출력 컬럼명 (모든 출력 형식이 공유)
+SUMMARY_COLUMNS = {
+    '부서명': '부서명',
+    '사원명': '성명',
+    'work_ot': '근무O/T',
+    'overtime': '연장',
+    'basic_pay': '기본급',
+    'approved_ot': '인정 OT',
+    'night_work': '야간적용',
+    'holiday_bonus': '휴일추가',
+    'meal_allowance': '식대',
+    'transport_allowance': '교통비'
+}
+
+DETAIL_COLUMNS = {
+    '사원명': '성명',
+    'date': '날짜',
+    'check_in': '출근',
+    'check_out': '퇴근',
+    'work_ot': '근무 OT',
+    'overtime': '연장',
+    'basic_pay': '기본급',
+    'approved_ot': '인정 OT',
+    'night_work': '야간적용',
+    'holiday_bonus': '휴일추가',
+    'meal_allowance': '식대',
+    'transport_allowance': '교통비'
+}
+
+# 리포트 종류별 파일명 (확장자는 출력 형식에 따름)
+REPORT_FILE_NAMES = {
+    'monthly_summary': '근태리포트_월간합산',
+    'daily_detail': '근태리포트_일별상세'
+}
 
 
 class ReportGenerator:
-    """엑셀 리포트 생성을 담당하는 클래스"""
+    """리포트 생성을 담당하는 클래스 (엑셀/CSV/Parquet/JSON Lines)"""
     
     @staticmethod
-    def create_monthly_summary_report(daily_data, employee_info, output_path):
+    def monthly_summary_frame(daily_data, employee_info):
         """
-        부서별 월 합산 리포트 생성
+        부서/사원별 월 합산 레이아웃
         
         Args:
             daily_data: 일별 근태 데이터 DataFrame
-            employee_info: 사원 정보 DataFrame
-            output_path: 출력 파일 경로
+            employee_info: 사원 정보 DataFrame 또는 EmployeeDirectory
+            
+        Returns:
+            DataFrame: SUMMARY_COLUMNS 출력 컬럼명의 부서/사원별 합계
         """
-        # 사원 정보의 문자열 컬럼 타입 확인 및 변환
-        employee_info = employee_info.copy()
-        employee_info['사원명'] = employee_info['사원명'].astype(str)
-        employee_info['부서명'] = employee_info['부서명'].astype(str)
-        
-        # 사원 정보와 병합
-        merged_data = daily_data.merge(
-            employee_info[['카드번호', '사원명', '부서명', '부서코드']],
-            on='카드번호',
-            how='left'
-        )
+        # 사원 정보 결합 (이미 결합된 일별 데이터는 그대로 사용)
+        merged_data = EmployeeDirectory.coerce(employee_info).enrich(daily_data)
         
         # 부서별로 그룹화하여 월 합산
-        summary = merged_data.groupby(['부서명', '사원명']).agg({
-            'work_ot': 'sum',
-            'overtime': 'sum',
-            'basic_pay': 'sum',
-            'approved_ot': 'sum',
-            'night_work': 'sum',
-            'holiday_bonus': 'sum',
-            'meal_allowance': 'sum',
-            'transport_allowance': 'sum'
+        keys = list(SUMMARY_COLUMNS)[:2]
+        summary = merged_data.groupby(keys, observed=True).agg({
+            column: 'sum' for column in list(SUMMARY_COLUMNS)[2:]
         }).reset_index()
         
-        # 컬럼명 변경
-        summary.columns = ['부서명', '성명', '근무O/T', '연장', '기본급', '인정 OT', 
-                          '야간적용', '휴일추가', '식대', '교통비']
+        return summary.rename(columns=SUMMARY_COLUMNS)
+    
+    
+    @staticmethod
+    def daily_detail_frame(daily_data, employee_info):
+        """
+        개인별 일별 상세 레이아웃
+        
+        Args:
+            daily_data: 일별 근태 데이터 DataFrame
+            employee_info: 사원 정보 DataFrame 또는 EmployeeDirectory
+            
+        Returns:
+            DataFrame: DETAIL_COLUMNS 출력 컬럼명의 사원/날짜순 일별 데이터 (날짜/시간은 문자열)
+        """
+        # 사원 정보 결합 (이미 결합된 일별 데이터는 그대로 사용)
+        merged_data = EmployeeDirectory.coerce(employee_info).enrich(daily_data)
         
-        # 엑셀 파일 생성
-        wb = Workbook()
+        # 정렬 후 날짜/시간을 출력용 문자열로 변환 (컴팩트 표현일 때만)
+        merged_data = to_display(merged_data.sort_values(['사원명', 'date']))
         
-        # 부서별로 시트 생성
-        departments = summary['부서명'].unique()
+        # 필요한 컬럼만 선택 및 순서 변경, 컬럼명 변경
+        return merged_data[list(DETAIL_COLUMNS)].rename(columns=DETAIL_COLUMNS)
+    
+    
+    @staticmethod
+    def create_monthly_summary_report(daily_data, employee_info, output_path, output_format='xlsx'):
+        """
+        부서별 월 합산 리포트 생성
         
-        for idx, dept in enumerate(departments):
-            # 부서명을 문자열로 변환하고 유효한 시트명 생성
-            dept_name = str(dept).strip()[:31]
-            
-            if idx == 0:
-                ws = wb.active
-                ws.title = dept_name
-            else:
-                ws = wb.create_sheet(title=dept_name)
-            
-            # 해당 부서 데이터 필터링
-            dept_data = summary[summary['부서명'] == dept].drop(columns=['부서명'])
-            
-            # 헤더 스타일 설정
-            header_font = Font(bold=True, size=11)
-            header_fill = PatternFill(start_color='D3D3D3', end_color='D3D3D3', fill_type='solid')
-            header_alignment = Alignment(horizontal='center', vertical='center')
-            border = Border(
-                left=Side(style='thin'),
-                right=Side(style='thin'),
-                top=Side(style='thin'),
-                bottom=Side(style='thin')
-            )
-            
-            # 데이터 작성
-            for r_idx, row in enumerate(dataframe_to_rows(dept_data, index=False, header=True), 1):
-                for c_idx, value in enumerate(row, 1):
-                    cell = ws.cell(row=r_idx, column=c_idx, value=value)
-                    cell.border = border
-                    cell.alignment = Alignment(horizontal='center', vertical='center')
-                    
-                    if r_idx == 1:  # 헤더
-                        cell.font = header_font
-                        cell.fill = header_fill
+        Args:
+            daily_data: 일별 근태 데이터 DataFrame
+            employee_info: 사원 정보 DataFrame 또는 EmployeeDirectory
+            output_path: 출력 파일 경로
+            output_format: 출력 형식 (xlsx는 부서별 시트, 나머지는 부서명 컬럼을 포함한 단일 테이블)
             
-            # 열 너비 자동 조정
-            for column in ws.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 50)
-                ws.column_dimensions[column_letter].width = adjusted_width
-        
-        wb.save(output_path)
+        Returns:
+            int: 리포트 행 수 (부서/사원별 합계 행)
+        """
+        summary = ReportGenerator.monthly_summary_frame(daily_data, employee_info)
+        create_backend(output_format).write(summary, output_path, sheet_by='부서명', drop_sheet_column=True)
         print(f"월간 합산 리포트 생성 완료: {output_path}")
+        return len(summary)
     
     
     @staticmethod
-    def create_daily_detail_report(daily_data, employee_info, output_path):
+    def create_daily_detail_report(daily_data, employee_info, output_path, output_format='xlsx'):
         """
         개인별 일별 상세 리포트 생성
         
         Args:
             daily_data: 일별 근태 데이터 DataFrame
-            employee_info: 사원 정보 DataFrame
+            employee_info: 사원 정보 DataFrame 또는 EmployeeDirectory
             output_path: 출력 파일 경로
+            output_format: 출력 형식 (xlsx는 사원별 시트, 나머지는 단일 테이블)
+            
+        Returns:
+            int: 리포트 행 수
         """
-        # 사원 정보의 문자열 컬럼 타입 확인 및 변환
-        employee_info = employee_info.copy()
-        employee_info['사원명'] = employee_info['사원명'].astype(str)
-        employee_info['부서명'] = employee_info['부서명'].astype(str)
-        
-        # 사원 정보와 병합
-        merged_data = daily_data.merge(
-            employee_info[['카드번호', '사원명', '부서명']],
-            on='카드번호',
-            how='left'
-        )
-        
-        # 정렬
-        merged_data = merged_data.sort_values(['사원명', 'date'])
-        
-        # 필요한 컬럼만 선택 및 순서 변경
-        report_data = merged_data[[
-            '사원명', 'date', 'check_in', 'check_out', 'work_ot', 'overtime',
-            'basic_pay', 'approved_ot', 'night_work', 'holiday_bonus',
-            'meal_allowance', 'transport_allowance'
-        ]].copy()
-        
-        # 컬럼명 변경
-        report_data.columns = ['성명', '날짜', '출근', '퇴근', '근무 OT', '연장', 
-                              '기본급', '인정 OT', '야간적용', '휴일추가', 
-                              '식대', '교통비']
-        
-        # 엑셀 파일 생성
-        wb = Workbook()
-        
-        # 사원별로 시트 생성
-        employees = report_data['성명'].unique()
-        
-        for idx, emp in enumerate(employees):
-            # 사원명을 문자열로 변환하고 유효한 시트명 생성
-            emp_name = str(emp).strip()[:31]
+        report_data = ReportGenerator.daily_detail_frame(daily_data, employee_info)
+        create_backend(output_format).write(report_data, output_path, sheet_by='성명')
+        print(f"일별 상세 리포트 생성 완료: {output_path}")
+        return len(report_data)
+    
+    
+    @staticmethod
+    def create_reports(daily_data, employee_info, output_dir, prefix, workers=2, shard_by_department=False,
+                       profile_dir=None, trace_memory=False, output_format='xlsx'):
+        """
+        월간 합산/일별 상세 리포트를 별도 프로세스에서 병렬 생성하고 매니페스트 기록
+        
+        Args:
+            daily_data: 일별 근태 데이터 DataFrame
+            employee_info: 사원 정보 DataFrame 또는 EmployeeDirectory
+            output_dir: 출력 디렉토리
+            prefix: 출력 파일명 접두어 (예: '2025_09')
+            workers: 작업 프로세스 수 (1 이하면 현재 프로세스에서 순차 생성)
+            shard_by_department: True면 일별 상세 리포트를 부서별 파일로 분할
+            profile_dir: 지정 시 리포트별 cProfile 결과 저장 디렉토리
+            trace_memory: 리포트별 최대 추적 메모리 측정 여부
+            output_format: 출력 형식 (REPORT_FORMATS: xlsx, csv, parquet, jsonl)
             
-            if idx == 0:
-                ws = wb.active
-                ws.title = emp_name
-            else:
-                ws = wb.create_sheet(title=emp_name)
+        Returns:
+            dict: 생성된 파일 목록 (파일별 실행 시간/메모리 측정값 포함) 매니페스트
+        """
+        # 지원하지 않거나 사용할 수 없는 형식은 작업 프로세스 시작 전에 확인
+        create_backend(output_format)
+        extension = REPORT_FORMATS[output_format]
+        
+        jobs = [{
+            'report': 'monthly_summary',
+            'department': None,
+            'path': os.path.join(output_dir, f"{prefix}_{REPORT_FILE_NAMES['monthly_summary']}{extension}"),
+            'data': daily_data
+        }]
+        
+        if shard_by_department:
+            # 부서별로 일별 데이터 분할 (사원 정보에 없으면 '미지정')
+            daily_data = EmployeeDirectory.coerce(employee_info).enrich(daily_data)
+            departments = daily_data['부서명'].astype(object).fillna('미지정')
+            file_depts = set()
             
-            # 해당 사원 데이터 필터링
-            emp_data = report_data[report_data['성명'] == emp]
+            for dept, dept_daily in daily_data.groupby(departments, sort=True):
+                file_dept = re.sub(INVALID_FILENAME_PATTERN, '_', str(dept).strip())
+                
+                # 다른 부서명이 같은 파일명이 되면 (예: 'A/B'와 'A_B', 대소문자만 다른 이름) 번호를 붙여 구분
+                base_name, suffix = file_dept, 2
+                while file_dept.casefold() in file_depts:
+                    file_dept = f'{base_name}_{suffix}'
+                    suffix += 1
+                file_depts.add(file_dept.casefold())
+                
+                jobs.append({
+                    'report': 'daily_detail',
+                    'department': str(dept),
+                    'path': os.path.join(output_dir, f"{prefix}_{REPORT_FILE_NAMES['daily_detail']}_{file_dept}{extension}"),
+                    'data': dept_daily
+                })
+        else:
+            jobs.append({
+                'report': 'daily_detail',
+                'department': None,
+                'path': os.path.join(output_dir, f"{prefix}_{REPORT_FILE_NAMES['daily_detail']}{extension}"),
+                'data': daily_data
+            })
+        
+        if workers <= 1:
+            for job in jobs:
+                job['metrics'] = _run_report_job(
+                    job['report'], job['data'], employee_info, job['path'], profile_dir, trace_memory, output_format
+                )
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(
+                        _run_report_job, job['report'], job['data'], employee_info, job['path'],
+                        profile_dir, trace_memory, output_format
+                    )
+                    for job in jobs
+                ]
+                for job, future in zip(jobs, futures):
+                    job['metrics'] = future.result()
+        
+        manifest = {
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'workers': workers,
+            'format': output_format,
+            'files': [
+                {
+                    'report': job['report'],
+                    'department': job['department'],
+                    'path': job['path'],
+                    'rows': job['metrics']['rows'],
+                    'metrics': job['metrics']
+                }
+                for job in jobs
+            ]
+        }
+        
+        manifest_path = os.path.join(output_dir, f'{prefix}_manifest.json')
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        
+        return manifest
+    
+    
+    @staticmethod
+    def create_reports_from_store(store, ruleset_id, period, employee_info, output_dir, **options):
+        """
+        결과 저장소에 저장된 한 달치 일별 근태로 리포트 생성 (원본 로그 재계산 없음)
+        
+        Args:
+            store: ResultStore
+            ruleset_id: 규칙 버전 (CompiledRules.ruleset_id)
+            period: 월 (예: '2025_09', 출력 파일명 접두어로도 사용)
+            employee_info: 사원 정보 DataFrame 또는 EmployeeDirectory
+            output_dir: 출력 디렉토리
+            **options: create_reports 옵션 (workers, shard_by_department, output_format 등)
             
-            # 헤더 스타일 설정
-            header_font = Font(bold=True, size=11)
-            header_fill = PatternFill(start_color='D3D3D3', end_color='D3D3D3', fill_type='solid')
-            header_alignment = Alignment(horizontal='center', vertical='center')
-            border = Border(
-                left=Side(style='thin'),
-                right=Side(style='thin'),
-                top=Side(style='thin'),
-                bottom=Side(style='thin')
+        Returns:
+            dict: 생성된 파일 목록 매니페스트
+        """
+        daily_data = store.query(ruleset_id, period=period)
+        if daily_data.empty:
+            raise ValueError(f"결과 저장소에 {period} 결과가 없습니다 (규칙 버전 {ruleset_id[:12]})")
+        
+        employee_directory = EmployeeDirectory.coerce(employee_info)
+        daily_data = employee_directory.enrich(daily_data)
+        
+        return ReportGenerator.create_reports(daily_data, employee_directory, output_dir, period, **options)
+
+
+def _run_report_job(report, daily_data, employee_info, output_path, profile_dir=None, trace_memory=False,
+                    output_format='xlsx'):
+    """
+    작업 프로세스에서 리포트 한 개 생성 (실행 시간/메모리 측정)
+    
+    Args:
+        report: 'monthly_summary' 또는 'daily_detail'
+        daily_data: 일별 근태 데이터 DataFrame
+        employee_info: 사원 정보 DataFrame 또는 EmployeeDirectory
+        output_path: 출력 파일 경로
+        profile_dir: 지정 시 cProfile 결과 저장 디렉토리
+        trace_memory: 최대 추적 메모리 측정 여부
+        output_format: 출력 형식
+        
+    Returns:
+        dict: StageMetrics 측정 기록
+    """
+    metrics = StageMetrics(profile_dir=profile_dir, trace_memory=trace_memory)
+    stage_name = f"report_{os.path.splitext(os.path.basename(output_path))[0]}"
+    
+    with metrics.stage(stage_name) as stage:
+        if report == 'monthly_summary':
+            stage['rows'] = ReportGenerator.create_monthly_summary_report(
+                daily_data, employee_info, output_path, output_format
             )
-            
-            # 데이터 작성
-            for r_idx, row in enumerate(dataframe_to_rows(emp_data, index=False, header=True), 1):
-                for c_idx, value in enumerate(row, 1):
-                    cell = ws.cell(row=r_idx, column=c_idx, value=value)
-                    cell.border = border
-                    cell.alignment = Alignment(horizontal='center', vertical='center')
-                    
-                    if r_idx == 1:  # 헤더
-                        cell.font = header_font
-                        cell.fill = header_fill
-            
-            # 열 너비 자동 조정
-            for column in ws.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 50)
-                ws.column_dimensions[column_letter].width = adjusted_width
-        
-        wb.save(output_path)
-        print(f"일별 상세 리포트 생성 완료: {output_path}")
+        else:
+            stage['rows'] = ReportGenerator.create_daily_detail_report(
+                daily_data, employee_info, output_path, output_format
+            )
+    
+    return metrics.records[0]
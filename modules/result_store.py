@@ -0,0 +1,227 @@
+import sqlite3
+from contextlib import closing
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+from modules.daily_records import COMPACT_KEY_DTYPES, COMPACT_METRIC_DTYPES, card_categorical, is_compact
+from modules.employee_directory import card_keys
+
+
+# 저장 컬럼과 SQLite 타입 (일별 데이터에 없는 컬럼은 NULL로 저장)
+STORE_COLUMNS = {
+    'card_number': 'TEXT NOT NULL',
+    'card_key': 'INTEGER NOT NULL',
+    'date': 'INTEGER NOT NULL',
+    'department': 'TEXT',
+    'check_in': 'INTEGER',
+    'check_out': 'INTEGER',
+    'punch_count': 'INTEGER',
+    'work_ot': 'REAL',
+    'late_early': 'REAL',
+    'approved_ot': 'REAL',
+    'night_work': 'REAL',
+    'holiday_bonus': 'REAL',
+    'meal_allowance': 'INTEGER',
+    'transport_allowance': 'INTEGER',
+    'overtime': 'REAL',
+    'basic_pay': 'INTEGER',
+    'overtime_match': 'TEXT',
+    'approved_hours': 'REAL',
+    'leave_type': 'TEXT'
+}
+
+_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS daily_records (
+        ruleset_id TEXT NOT NULL,
+        period TEXT NOT NULL,
+        {columns}
+    )
+    """.format(columns=',\n        '.join(f'{name} {kind}' for name, kind in STORE_COLUMNS.items())),
+    """
+    CREATE TABLE IF NOT EXISTS stored_periods (
+        ruleset_id TEXT NOT NULL,
+        period TEXT NOT NULL,
+        rows INTEGER NOT NULL,
+        stored_at TEXT NOT NULL,
+        PRIMARY KEY (ruleset_id, period)
+    )
+    """,
+    'CREATE INDEX IF NOT EXISTS idx_daily_card ON daily_records (ruleset_id, card_key, date)',
+    'CREATE INDEX IF NOT EXISTS idx_daily_date ON daily_records (ruleset_id, date)',
+    'CREATE INDEX IF NOT EXISTS idx_daily_department ON daily_records (ruleset_id, department, date)',
+    'CREATE INDEX IF NOT EXISTS idx_daily_period ON daily_records (ruleset_id, period)'
+]
+
+# 여러 프로세스가 동시에 기록할 때 잠금 대기 시간 (초)
+_LOCK_TIMEOUT = 30
+
+
+def _to_day(value):
+    """날짜(문자열/date/정수 일수)를 1970-01-01 기준 일수로 변환"""
+    if value is None or isinstance(value, (int, np.integer)):
+        return value
+    if isinstance(value, (date, datetime)):
+        value = value.isoformat()[:10]
+    return int(np.datetime64(str(value), 'D').astype('int64'))
+
+
+class ResultStore:
+    """
+    계산된 일별 근태 결과를 보관하는 SQLite 저장소
+    
+    (규칙 버전, 월) 단위로 저장/교체하며, 카드 키·날짜·부서 색인으로
+    원본 로그를 다시 계산하지 않고 기간/사원/부서별 조회를 한다.
+    규칙 버전은 CompiledRules.ruleset_id이므로 규칙이 바뀌면 이전 결과는 조회되지 않는다.
+    """
+    
+    def __init__(self, db_path):
+        """
+        초기화 (테이블/색인이 없으면 생성)
+        
+        Args:
+            db_path: SQLite 파일 경로
+        """
+        self.db_path = db_path
+        
+        with closing(self._connect()) as conn, conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+    
+    
+    def _connect(self):
+        """SQLite 연결 (다른 프로세스가 기록 중이면 잠금 대기)"""
+        return sqlite3.connect(self.db_path, timeout=_LOCK_TIMEOUT)
+    
+    
+    def save(self, daily_df, ruleset_id, period):
+        """
+        한 달치 일별 근태 결과 저장 (같은 규칙 버전/월의 기존 결과는 교체)
+        
+        Args:
+            daily_df: 컴팩트 표현의 일별 근태 DataFrame (finalize_daily_records 결과,
+                      사원 정보가 결합되어 있으면 부서명도 저장)
+            ruleset_id: 규칙 버전 (CompiledRules.ruleset_id)
+            period: 월 (예: '2025_09')
+            
+        Returns:
+            int: 저장한 행 수
+        """
+        if not is_compact(daily_df):
+            raise ValueError("결과 저장소에는 컴팩트 표현(compact=True)의 일별 데이터만 저장할 수 있습니다")
+        
+        values = {}
+        for name in STORE_COLUMNS:
+            if name == 'card_number':
+                column = daily_df['card_number'].astype(str)
+            elif name == 'card_key':
+                column = pd.Series(card_keys(daily_df['card_number']), index=daily_df.index)
+            elif name == 'department':
+                column = daily_df['부서명'] if '부서명' in daily_df.columns else None
+            else:
+                column = daily_df[name] if name in daily_df.columns else None
+            
+            if column is None:
+                values[name] = [None] * len(daily_df)
+            else:
+                column = column.astype(object)
+                values[name] = column.where(column.notna(), None).tolist()
+        
+        rows = [(ruleset_id, period) + row for row in zip(*values.values())]
+        columns = ', '.join(['ruleset_id', 'period'] + list(STORE_COLUMNS))
+        placeholders = ', '.join('?' * (len(STORE_COLUMNS) + 2))
+        
+        with closing(self._connect()) as conn, conn:
+            conn.execute('DELETE FROM daily_records WHERE ruleset_id = ? AND period = ?', (ruleset_id, period))
+            conn.executemany(f'INSERT INTO daily_records ({columns}) VALUES ({placeholders})', rows)
+            conn.execute(
+                'INSERT OR REPLACE INTO stored_periods VALUES (?, ?, ?, ?)',
+                (ruleset_id, period, len(rows), datetime.now().isoformat(timespec='seconds'))
+            )
+        
+        return len(rows)
+    
+    
+    def periods(self, ruleset_id):
+        """
+        규칙 버전별 저장된 월 목록
+        
+        Args:
+            ruleset_id: 규칙 버전
+            
+        Returns:
+            list: (월, 행 수, 저장 시각) 튜플 리스트 (월 순)
+        """
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                'SELECT period, rows, stored_at FROM stored_periods WHERE ruleset_id = ? ORDER BY period',
+                (ruleset_id,)
+            ).fetchall()
+    
+    
+    def query(self, ruleset_id, period=None, card=None, start=None, end=None, department=None):
+        """
+        조건에 맞는 일별 근태 결과 조회 (색인 사용)
+        
+        Args:
+            ruleset_id: 규칙 버전
+            period: 월 (예: '2025_09', 선택)
+            card: 카드번호 (문자열/정수, '0001'과 1은 같은 카드, 선택)
+            start: 시작일 (포함, 'YYYY-MM-DD'/date/일수, 선택)
+            end: 종료일 (포함, 선택)
+            department: 부서명 (선택)
+            
+        Returns:
+            DataFrame: 컴팩트 표현의 일별 근태 데이터 (날짜, 카드번호 순, 부서명은 department 컬럼)
+        """
+        conditions = ['ruleset_id = ?']
+        params = [ruleset_id]
+        
+        if period is not None:
+            conditions.append('period = ?')
+            params.append(period)
+        if card is not None:
+            conditions.append('card_key = ?')
+            params.append(int(card_keys([card])[0]))
+        if start is not None:
+            conditions.append('date >= ?')
+            params.append(_to_day(start))
+        if end is not None:
+            conditions.append('date <= ?')
+            params.append(_to_day(end))
+        if department is not None:
+            conditions.append('department = ?')
+            params.append(department)
+        
+        sql = (
+            f"SELECT {', '.join(STORE_COLUMNS)} FROM daily_records "
+            f"WHERE {' AND '.join(conditions)} ORDER BY date, card_number"
+        )
+        
+        with closing(self._connect()) as conn:
+            daily_df = pd.read_sql_query(sql, conn, params=params)
+        
+        return self._restore_dtypes(daily_df)
+    
+    
+    @staticmethod
+    def _restore_dtypes(daily_df):
+        """조회 결과를 calculate_all 컴팩트 결과와 같은 타입으로 변환"""
+        daily_df = daily_df.drop(columns=['card_key'])
+        daily_df['card_number'] = card_categorical(daily_df['card_number'].to_numpy(dtype=object))
+        daily_df['department'] = pd.Categorical(daily_df['department'])
+        
+        dtypes = dict(COMPACT_KEY_DTYPES, **COMPACT_METRIC_DTYPES)
+        dtypes['basic_pay'] = 'int64'
+        dtypes['overtime'] = 'float32'
+        daily_df = daily_df.astype({name: kind for name, kind in dtypes.items() if name in daily_df.columns})
+        
+        # 연장/휴가 정보 없이 저장된 결과는 해당 컬럼 제거
+        for name in ('approved_hours', 'leave_type'):
+            if daily_df[name].isna().all():
+                daily_df = daily_df.drop(columns=[name])
+        daily_df['overtime_match'] = daily_df['overtime_match'].fillna('')
+        
+        return daily_df
@@ -0,0 +1,245 @@
+import json
+import os
+import re
+from datetime import datetime
+
+
+# HH:MM (00:00~23:59)
+TIME_PATTERN = re.compile(r'^([01]\d|2[0-3]):[0-5]\d$')
+
+# 휴일 파일 항목 ({YYYY-MM-DD: 이름} 객체)
+HOLIDAY_SECTIONS = ('holidays', 'company_holidays', 'workdays')
+
+# 규칙 항목별 필드 종류 ('time': HH:MM, 'number': 0 이상 숫자, 'periods': 기간 리스트)
+RULES_SCHEMA = {
+    'work_hours': {
+        'standard_start': 'time',
+        'standard_end': 'time',
+        'standard_hours': 'number'
+    },
+    'overtime_exclusion_periods': 'periods',
+    'night_work_period': {
+        'start': 'time',
+        'end': 'time',
+        'exclusion_periods': 'periods'
+    },
+    'meal_allowance': {
+        'weekday_periods': 'periods',
+        'weekend_periods': 'periods',
+        'amount_per_period': 'number'
+    },
+    'transport_allowance': {
+        'weekday_cutoff_time': 'time',
+        'weekday_amount': 'number',
+        'weekend_amount': 'number'
+    },
+    'holiday_bonus': {
+        'min_approved_ot_hours': 'number'
+    }
+}
+
+
+def _check_field(value, kind, path, errors):
+    """필드 하나를 검사하여 오류 메시지를 errors에 추가"""
+    if isinstance(kind, dict):
+        if not isinstance(value, dict):
+            errors.append(f"{path}: 객체여야 합니다")
+            return
+        for key, child_kind in kind.items():
+            if key not in value:
+                errors.append(f"{path}.{key}: 항목이 없습니다")
+            else:
+                _check_field(value[key], child_kind, f"{path}.{key}", errors)
+    
+    elif kind == 'time':
+        if not isinstance(value, str) or not TIME_PATTERN.match(value):
+            errors.append(f"{path}: HH:MM 형식이어야 합니다 ({value!r})")
+    
+    elif kind == 'number':
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+            errors.append(f"{path}: 0 이상의 숫자여야 합니다 ({value!r})")
+    
+    elif kind == 'periods':
+        if not isinstance(value, list):
+            errors.append(f"{path}: 기간 리스트여야 합니다")
+            return
+        for index, period in enumerate(value):
+            _check_field(period, {'start': 'time', 'end': 'time'}, f"{path}[{index}]", errors)
+
+
+def validate_rules(rules):
+    """
+    규칙 딕셔너리 스키마 검사 (표준 라이브러리만 사용)
+    
+    Args:
+        rules: 규칙 딕셔너리
+        
+    Returns:
+        list: 오류 메시지 리스트 (문제 없으면 빈 리스트)
+    """
+    errors = []
+    
+    if not isinstance(rules, dict):
+        return ["규칙 파일 최상위는 객체여야 합니다"]
+    
+    for key, kind in RULES_SCHEMA.items():
+        if key not in rules:
+            errors.append(f"{key}: 항목이 없습니다")
+        else:
+            _check_field(rules[key], kind, key, errors)
+    
+    return errors
+
+
+def validate_rules_file(rules_path):
+    """
+    규칙 JSON 파일을 읽어 스키마 검사
+    
+    Args:
+        rules_path: 규칙 JSON 파일 경로
+        
+    Returns:
+        list: 오류 메시지 리스트 (문제 없으면 빈 리스트)
+    """
+    try:
+        with open(rules_path, 'r', encoding='utf-8') as f:
+            rules = json.load(f)
+    except json.JSONDecodeError as e:
+        return [f"JSON 형식 오류: {e}"]
+    
+    return validate_rules(rules)
+
+
+def read_ruleset_registry(registry_path):
+    """
+    위치/부서코드별 규칙 파일 목록(rulesets.json) 읽기 (표준 라이브러리만 사용)
+    
+    형식: {"default": "rules.json", "locations": {"아산": "rules_asan.json"}, "departments": {"D3": "..."}}
+    규칙 파일 경로는 목록 파일 기준 상대 경로이며, 부서코드 지정이 위치 지정보다 우선한다.
+    
+    Args:
+        registry_path: 규칙 목록 JSON 파일 경로
+        
+    Returns:
+        dict: default(규칙 파일 경로), locations/departments({키: 규칙 파일 경로}) 항목
+    """
+    with open(registry_path, 'r', encoding='utf-8') as f:
+        registry = json.load(f)
+    
+    if not isinstance(registry, dict) or not isinstance(registry.get('default'), str):
+        raise ValueError(f"{registry_path}: default 규칙 파일 경로가 필요합니다")
+    
+    base_dir = os.path.dirname(os.path.abspath(registry_path))
+    
+    def resolve(path):
+        return os.path.normpath(os.path.join(base_dir, path))
+    
+    spec = {'default': resolve(registry['default'])}
+    for section in ('locations', 'departments'):
+        entries = registry.get(section, {})
+        if not isinstance(entries, dict) or not all(isinstance(path, str) for path in entries.values()):
+            raise ValueError(f"{registry_path}: {section}는 {{키: 규칙 파일 경로}} 객체여야 합니다")
+        spec[section] = {str(key): resolve(path) for key, path in entries.items()}
+    
+    return spec
+
+
+def validate_registry_file(registry_path):
+    """
+    규칙 목록 파일과 목록의 모든 규칙 파일 스키마 검사
+    
+    Args:
+        registry_path: 규칙 목록 JSON 파일 경로
+        
+    Returns:
+        list: 오류 메시지 리스트 (문제 없으면 빈 리스트)
+    """
+    try:
+        spec = read_ruleset_registry(registry_path)
+    except (json.JSONDecodeError, ValueError) as e:
+        return [str(e)]
+    
+    rules_paths = {spec['default']}
+    for section in ('locations', 'departments'):
+        rules_paths.update(spec[section].values())
+    
+    errors = []
+    for rules_path in sorted(rules_paths):
+        if not os.path.exists(rules_path):
+            errors.append(f"{registry_path}: 규칙 파일을 찾을 수 없습니다: {rules_path}")
+        else:
+            errors.extend(f"{rules_path}: {error}" for error in validate_rules_file(rules_path))
+    
+    return errors
+
+
+def holiday_years(config):
+    """
+    휴일 파일이 휴일을 지정한 연도 (years 항목, 없으면 지정된 날짜들의 연도)
+    
+    Args:
+        config: 휴일 파일 내용 딕셔너리
+        
+    Returns:
+        list: 정렬된 연도 리스트
+    """
+    if 'years' in config:
+        return sorted(config['years'])
+    return sorted({int(date_str[:4]) for section in HOLIDAY_SECTIONS for date_str in config.get(section, {})})
+
+
+def validate_holidays_file(holidays_path, years=None):
+    """
+    휴일 파일(holidays.json) 형식 검사 (표준 라이브러리만 사용)
+    
+    Args:
+        holidays_path: 휴일 JSON 파일 경로
+        years: 처리할 출퇴근 기록의 연도 (지정 시 휴일 파일이 지정한 연도에 모두 포함되는지 검사)
+        
+    Returns:
+        list: 오류 메시지 리스트 (문제 없으면 빈 리스트)
+    """
+    try:
+        with open(holidays_path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+    except json.JSONDecodeError as e:
+        return [f"{holidays_path}: JSON 형식 오류: {e}"]
+    
+    if not isinstance(config, dict):
+        return [f"{holidays_path}: 최상위는 객체여야 합니다"]
+    
+    errors = []
+    covered = config.get('years', [])
+    if not isinstance(covered, list) or not all(type(year) is int and 1900 <= year <= 9999 for year in covered):
+        return [f"{holidays_path}: years는 휴일을 지정한 연도(정수) 리스트여야 합니다"]
+    
+    for section in HOLIDAY_SECTIONS:
+        entries = config.get(section, {})
+        if not isinstance(entries, dict):
+            errors.append(f"{holidays_path}: {section}는 {{YYYY-MM-DD: 이름}} 객체여야 합니다")
+            continue
+        for date_str in entries:
+            try:
+                datetime.strptime(date_str, '%Y-%m-%d')
+            except ValueError:
+                errors.append(f"{holidays_path}: {section}.{date_str}: 날짜 형식이 YYYY-MM-DD가 아닙니다")
+                continue
+            if 'years' in config and int(date_str[:4]) not in covered:
+                errors.append(f"{holidays_path}: {section}.{date_str}: years에 없는 연도입니다")
+    if errors:
+        return errors
+    
+    # 같은 날이 휴일이면서 근무일로 지정된 경우
+    holidays = set(config.get('holidays', {})) | set(config.get('company_holidays', {}))
+    for date_str in sorted(holidays & set(config.get('workdays', {}))):
+        errors.append(f"{holidays_path}: {date_str}: 휴일과 근무일에 함께 지정되어 있습니다")
+    
+    # 처리 기간에 휴일이 지정되지 않은 연도가 있으면 공휴일이 평일로 계산됨
+    uncovered = sorted(set(years or []) - set(holiday_years(config)))
+    if uncovered:
+        errors.append(
+            f"{holidays_path}: {', '.join(map(str, uncovered))}년 휴일이 지정되어 있지 않습니다 "
+            f"(지정 연도: {', '.join(map(str, holiday_years(config))) or '없음'})"
+        )
+    
+    return errors
@@ -0,0 +1,217 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from modules.business_calendar import BusinessCalendar
+from modules.calculator import AttendanceCalculator
+from modules.compiled_rules import load_compiled_rules
+from modules.employee_directory import card_keys
+from modules.rules_schema import read_ruleset_registry
+
+
+def registry_ruleset_id(spec):
+    """
+    규칙 목록 전체의 버전 (위치/부서코드 지정과 각 규칙 파일 해시의 해시)
+    
+    Args:
+        spec: read_ruleset_registry 결과
+        
+    Returns:
+        str: 해시 문자열
+    """
+    versioned = {
+        'default': load_compiled_rules(spec['default']).ruleset_id,
+        'locations': {key: load_compiled_rules(path).ruleset_id for key, path in spec['locations'].items()},
+        'departments': {key: load_compiled_rules(path).ruleset_id for key, path in spec['departments'].items()}
+    }
+    return hashlib.sha256(json.dumps(versioned, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def assignment_digest(keys, rulesets):
+    """
+    사원별 규칙 지정의 해시 (사원 정보에서 위치/부서코드가 바뀌면 달라짐)
+    
+    Args:
+        keys: 사원 카드 키 배열
+        rulesets: keys와 같은 순서의 규칙 번호 배열
+        
+    Returns:
+        str: 카드 키 순으로 정렬한 (카드 키, 규칙 번호) 쌍의 해시
+    """
+    keys = np.asarray(keys, dtype='int64')
+    order = np.argsort(keys, kind='stable')
+    digest = hashlib.sha256(keys[order].tobytes())
+    digest.update(np.asarray(rulesets, dtype='int64')[order].tobytes())
+    return digest.hexdigest()
+
+
+def load_calendar(holidays_file=None):
+    """
+    휴일 파일이 있으면 BusinessCalendar.load, 없으면 요일만 사용하는 달력
+    
+    Args:
+        holidays_file: 휴일 JSON 파일 경로 (선택)
+        
+    Returns:
+        BusinessCalendar: 달력
+    """
+    if holidays_file and os.path.exists(holidays_file):
+        return BusinessCalendar.load(holidays_file)
+    return BusinessCalendar()
+
+
+def current_ruleset_id(rules_file, registry_file=None, holidays_file=None, employee_directory=None):
+    """
+    계산에 사용되는 규칙 버전 (규칙 목록 파일이 있으면 목록 전체와 사원별 규칙 지정의 버전, 휴일 파일 버전 포함)
+    
+    Args:
+        rules_file: 기본 규칙 JSON 파일 경로
+        registry_file: 위치별 규칙 목록 파일 경로 (선택)
+        holidays_file: 휴일 JSON 파일 경로 (선택)
+        employee_directory: EmployeeDirectory (규칙 목록 사용 시 필요)
+        
+    Returns:
+        str: 규칙 버전 (create_calculator로 만든 계산기의 ruleset_id와 같음)
+    """
+    return create_calculator(rules_file, registry_file, employee_directory, holidays_file=holidays_file).ruleset_id
+
+
+def create_calculator(rules_file, registry_file=None, employee_directory=None, holidays_file=None):
+    """
+    규칙 목록 파일이 있으면 위치별 RulesetRegistry, 없으면 단일 AttendanceCalculator 생성
+    
+    Args:
+        rules_file: 기본 규칙 JSON 파일 경로
+        registry_file: 위치별 규칙 목록 파일 경로 (선택)
+        employee_directory: EmployeeDirectory (규칙 목록 사용 시 필요)
+        holidays_file: 공휴일/회사 휴무일 JSON 파일 경로 (선택, 없으면 요일만으로 구분)
+        
+    Returns:
+        RulesetRegistry 또는 AttendanceCalculator
+    """
+    calendar = load_calendar(holidays_file)
+    
+    if registry_file and os.path.exists(registry_file):
+        if employee_directory is None:
+            raise ValueError("위치별 규칙을 사용하려면 사원 정보가 필요합니다")
+        return RulesetRegistry(registry_file, employee_directory, calendar=calendar)
+    return AttendanceCalculator(rules_file, calendar=calendar)
+
+
+class RulesetRegistry:
+    """
+    위치(및 부서코드)별 규칙으로 근태를 계산하는 AttendanceCalculator 묶음
+    
+    규칙 파일마다 AttendanceCalculator를 하나씩 두고, 사원별 규칙 번호를 미리 배열로 만들어
+    일별 데이터를 규칙별로 나눈 뒤 규칙마다 calculate_all을 한 번씩 호출한다 (행 단위 규칙 조회 없음).
+    AttendanceCalculator와 같은 calculate_all / reload_rules / ruleset_id를 제공한다.
+    """
+    
+    def __init__(self, registry_path, employee_directory, calendar=None):
+        """
+        초기화
+        
+        Args:
+            registry_path: 규칙 목록 JSON 파일 경로 (config/rulesets.json)
+            employee_directory: EmployeeDirectory (카드번호 → 위치/부서코드)
+            calendar: 모든 규칙이 공유하는 BusinessCalendar (선택)
+        """
+        self.registry_path = registry_path
+        self.directory = employee_directory
+        self.calendar = calendar if calendar is not None else BusinessCalendar()
+        self._load()
+    
+    
+    def _load(self):
+        """규칙 목록을 읽어 규칙 파일별 계산기와 사원별 규칙 번호 배열 생성"""
+        spec = read_ruleset_registry(self.registry_path)
+        
+        # 같은 규칙 파일을 가리키는 위치/부서는 계산기 하나를 공유
+        paths = [spec['default']]
+        for section in ('locations', 'departments'):
+            paths.extend(path for path in spec[section].values() if path not in paths)
+        
+        self.calculators = [
+            AttendanceCalculator(path, calendar=self.calendar) for path in paths
+        ]
+        
+        # 사원 디렉토리 행별 규칙 번호 (부서코드 지정 > 위치 지정 > 기본), 끝에 미등록 카드용 기본값
+        frame = self.directory.frame
+        by_location = self._category_table(frame['location'], spec['locations'], paths, fallback=0)
+        by_department = self._category_table(frame['부서코드'], spec['departments'], paths, fallback=-1)
+        employee_rulesets = np.where(by_department >= 0, by_department, by_location)
+        self._employee_rulesets = np.append(employee_rulesets, 0)
+        
+        # 사원이 다른 위치/부서로 옮기면 이전 결과(체크포인트, 결과 저장소)를 쓰지 않도록 지정 해시 포함
+        versions = f'{registry_ruleset_id(spec)}:{assignment_digest(frame.index.to_numpy(), employee_rulesets)}'
+        self.ruleset_id = self.calendar.versioned_id(hashlib.sha256(versions.encode('utf-8')).hexdigest())
+    
+    
+    @staticmethod
+    def _category_table(column, mapping, paths, fallback):
+        """범주형 컬럼 행별로 지정된 규칙 번호 배열 (범주마다 한 번만 조회)"""
+        table = np.array([paths.index(mapping[str(category)]) if str(category) in mapping else fallback
+                          for category in column.cat.categories] + [fallback], dtype='int64')
+        return table[column.cat.codes.to_numpy()]
+    
+    
+    def assign(self, attendance_df):
+        """
+        일별 데이터 행별 규칙 번호
+        
+        Args:
+            attendance_df: card_number 컬럼을 가진 DataFrame
+            
+        Returns:
+            ndarray: self.calculators 위치 배열
+        """
+        positions = self.directory.frame.index.get_indexer(card_keys(attendance_df['card_number']))
+        return self._employee_rulesets[positions]
+    
+    
+    def calculate_all(self, attendance_df):
+        """
+        규칙별로 나눈 일별 데이터를 규칙마다 한 번에 계산하고 원래 행 순서로 합침
+        
+        Args:
+            attendance_df: AttendanceCalculator.calculate_all 입력 DataFrame
+            
+        Returns:
+            DataFrame: AttendanceCalculator.calculate_all 결과와 같은 형식
+        """
+        groups = self.assign(attendance_df)
+        used = np.unique(groups)
+        
+        if len(used) <= 1:
+            calculator = self.calculators[used[0] if len(used) else 0]
+            return calculator.calculate_all(attendance_df)
+        
+        order = np.argsort(groups, kind='stable')
+        bounds = np.searchsorted(groups[order], used)
+        parts = [
+            self.calculators[ruleset].calculate_all(attendance_df.iloc[rows])
+            for ruleset, rows in zip(used, np.split(order, bounds[1:]))
+        ]
+        
+        # 규칙별 결과를 원래 행 순서로 되돌림
+        return pd.concat(parts).iloc[np.argsort(order, kind='stable')]
+    
+    
+    def reload_rules(self, calendar=None):
+        """
+        규칙 목록과 규칙 파일을 다시 읽음
+        
+        Args:
+            calendar: 새로 읽은 BusinessCalendar (선택, 지정하면 달력도 교체)
+            
+        Returns:
+            bool: 규칙 버전(휴일 파일 포함)이 바뀌었으면 True
+        """
+        previous = self.ruleset_id
+        if calendar is not None:
+            self.calendar = calendar
+        self._load()
+        return self.ruleset_id != previous
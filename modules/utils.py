@@ -1,8 +1,16 @@
 import logging
 import os
+import re
 from datetime import datetime
 
 
+# 파일명의 년월 (예: '2025년 9월')
+PERIOD_PATTERN = r'(\d{4})년\s*(\d{1,2})월'
+
+# report_prefix 결과의 년월 (예: '2025_09', '2025_09_아산')
+PREFIX_PATTERN = r'^(\d{4})_(\d{2})(?:_|$)'
+
+
 def setup_logger(log_dir='logs'):
     """
     로거 설정
@@ -105,13 +113,52 @@ def get_month_from_filename(filename):
     Returns:
         tuple: (년, 월)
     """
-    import re
-    
     # 년도와 월 추출
-    match = re.search(r'(\d{4})년\s*(\d{1,2})월', filename)
+    match = re.search(PERIOD_PATTERN, filename)
     if match:
         year = int(match.group(1))
         month = int(match.group(2))
         return year, month
     
     return None, None
+
+
+def report_prefix(log_path):
+    """
+    출퇴근 로그 파일명에서 리포트 파일명 접두어(YYYY_MM[_사업장]) 생성
+    
+    파일명에 년월 외의 부분(사업장 등)이 있으면 뒤에 붙여 같은 달의 여러 로그가
+    같은 출력 파일명이 되지 않게 한다.
+    
+    Args:
+        log_path: 출퇴근 로그 파일 경로 (예: 'data/2025년 9월.txt', 'data/아산_2025년 9월.txt')
+        
+    Returns:
+        str: 'YYYY_MM' 또는 'YYYY_MM_아산' (파일명에 년월이 없으면 현재 년월)
+    """
+    name = os.path.splitext(os.path.basename(log_path))[0]
+    match = re.search(PERIOD_PATTERN, name)
+    
+    if match is None:
+        return datetime.now().strftime('%Y_%m')
+    
+    prefix = f'{int(match.group(1))}_{int(match.group(2)):02d}'
+    site = re.sub(r'\W+', '_', f'{name[:match.start()]} {name[match.end():]}').strip('_')
+    
+    return f'{prefix}_{site}' if site else prefix
+
+
+def prefix_year_month(prefix):
+    """
+    report_prefix 결과(결과 저장소의 기간)에서 년월 추출
+    
+    Args:
+        prefix: 'YYYY_MM' 또는 'YYYY_MM_사업장'
+        
+    Returns:
+        tuple: (년, 월), 형식이 다르면 None
+    """
+    match = re.match(PREFIX_PATTERN, prefix)
+    if match is None:
+        return None
+    return int(match.group(1)), int(match.group(2))
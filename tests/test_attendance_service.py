@@ -0,0 +1,44 @@
+import asyncio
+import os
+import sys
+import unittest
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.attendance_service import AttendanceService
+from modules.calculator import AttendanceCalculator
+from modules.employee_directory import EmployeeDirectory
+
+
+RULES_FILE = os.path.join(os.path.dirname(__file__), '..', 'config', 'rules.json')
+
+
+class ConcurrentResendTest(unittest.IsolatedAsyncioTestCase):
+    """동시에 들어온 요청 뒤에 같은 기록을 다시 보내면 중복으로 걸러지는지 확인"""
+    
+    def setUp(self):
+        employee_df = pd.DataFrame({'카드번호': ['0001', '0002'], '사원명': ['직원1', '직원2'], '부서명': ['A', 'B']})
+        self.service = AttendanceService(AttendanceCalculator(RULES_FILE), EmployeeDirectory(employee_df))
+    
+    
+    async def test_resend_after_concurrent_requests(self):
+        first = b'20250901080000100000001\n'
+        second = b'20250901080000100000002\n'
+        
+        results = await asyncio.gather(self.service.add_punches(first), self.service.add_punches(second))
+        self.assertEqual([result['accepted'] for result in results], [1, 1])
+        
+        for _ in range(2):
+            result = await self.service.add_punches(first)
+            self.assertEqual(result['accepted'], 0)
+            self.assertEqual(result['reasons'], {'DUPLICATE': 1})
+        
+        rows = self.service.query(card='0001')
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['punch_count'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()